@@ -0,0 +1,80 @@
+"""
+Application settings (overridable through environment variables)
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+# NDJSON 스트리밍 수집: micro-batch 크기 및 라인 길이 제한
+INGEST_STREAM_BATCH_SIZE = _env_int("INGEST_STREAM_BATCH_SIZE", 1000)
+INGEST_STREAM_MAX_LINE_BYTES = _env_int("INGEST_STREAM_MAX_LINE_BYTES", 64 * 1024)
+INGEST_STREAM_MAX_REPORTED_ERRORS = _env_int("INGEST_STREAM_MAX_REPORTED_ERRORS", 100)
+
+# Write-behind 수집 버퍼: 단건 POST를 모아 group commit
+# 큐가 비는 즉시 커밋 (FLUSH_INTERVAL_MS는 유휴 writer가 종료 여부를 확인하는 주기)
+INGEST_BUFFER_ENABLED = _env_bool("INGEST_BUFFER_ENABLED", True)
+INGEST_BUFFER_MAX_SIZE = _env_int("INGEST_BUFFER_MAX_SIZE", 100000)
+INGEST_BUFFER_FLUSH_SIZE = _env_int("INGEST_BUFFER_FLUSH_SIZE", 10000)
+INGEST_BUFFER_FLUSH_INTERVAL_MS = _env_int("INGEST_BUFFER_FLUSH_INTERVAL_MS", 200)
+# group commit이 일시적 DB 오류(잠금 등)로 실패하면 backoff(시도마다 2배) 후 재시도
+INGEST_BUFFER_FLUSH_RETRIES = _env_int("INGEST_BUFFER_FLUSH_RETRIES", 5)
+INGEST_BUFFER_RETRY_BACKOFF_MS = _env_int("INGEST_BUFFER_RETRY_BACKOFF_MS", 100)
+
+# logcollector rolled DB 가져오기
+LOGCOLLECTOR_DB_DIR = os.getenv(
+    "LOGCOLLECTOR_DB_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "logcollector")
+)
+LOGCOLLECTOR_WATCH_ENABLED = _env_bool("LOGCOLLECTOR_WATCH_ENABLED", False)
+LOGCOLLECTOR_WATCH_INTERVAL_SEC = _env_int("LOGCOLLECTOR_WATCH_INTERVAL_SEC", 30)
+
+# 학습/통계 데이터 로딩: 한 번에 가져오는 행 수
+TRAINING_LOAD_CHUNK_SIZE = _env_int("TRAINING_LOAD_CHUNK_SIZE", 50000)
+
+# 모델 캐시: 로드된 predictor를 (model id, mtime) 기준으로 재사용
+MODEL_CACHE_MAX_MB = _env_int("MODEL_CACHE_MAX_MB", 512)
+# 시작 시 미리 로드할 모델 ID 또는 이름 (쉼표 구분)
+MODEL_CACHE_PRELOAD = [ref for ref in os.getenv("MODEL_CACHE_PRELOAD", "").split(",") if ref.strip()]
+
+# 저장된 로그 범위 분석: 한 번에 점수를 매기는 로그 수
+RANGE_SCAN_CHUNK_SIZE = _env_int("RANGE_SCAN_CHUNK_SIZE", 50000)
+
+# 백그라운드 작업 큐 (학습/범위 분석): 동시에 실행할 작업 수
+JOB_QUEUE_ENABLED = _env_bool("JOB_QUEUE_ENABLED", True)
+JOB_WORKERS = _env_int("JOB_WORKERS", 1)
+
+# ML 병렬화: 학습/점수 계산 스레드 수(n_jobs), 대용량 분석 배치의 프로세스 샤딩
+_DEFAULT_ML_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+ML_N_JOBS = _env_int("ML_N_JOBS", _DEFAULT_ML_WORKERS)
+SCORING_PROCESSES = _env_int("SCORING_PROCESSES", _DEFAULT_ML_WORKERS)
+SCORING_SHARD_MIN_ROWS = _env_int("SCORING_SHARD_MIN_ROWS", 200000)
+
+# 롤업 버킷별 heavy hitter 요약(Space-Saving): 버킷당 유지하는 카운터 수
+HEAVY_HITTER_CAPACITY = _env_int("HEAVY_HITTER_CAPACITY", 64)
+
+# 분위수 요약(KLL): 정확도 파라미터 k (순위 오차 약 1.7/k, 요약당 최대 약 3k개 값)
+QUANTILE_SKETCH_K = _env_int("QUANTILE_SKETCH_K", 200)
+
+# 요약 갱신 지연: 반영 대기 행이 이 수에 이르거나 마지막 반영 후 이 시간이 지나면
+# 수집 트랜잭션에서 한 번에 반영 (대기 중인 행은 조회 시 원본에서 합산하므로 결과는 같음)
+ROLLUP_SKETCH_FLUSH_ROWS = _env_int("ROLLUP_SKETCH_FLUSH_ROWS", 1000)
+ROLLUP_SKETCH_FLUSH_INTERVAL_MS = _env_int("ROLLUP_SKETCH_FLUSH_INTERVAL_MS", 5000)
+
+# 대량 내보내기(CSV/NDJSON/Parquet): 서버 측 커서로 한 번에 가져와 인코딩하는 행 수
+EXPORT_CHUNK_SIZE = _env_int("EXPORT_CHUNK_SIZE", 10000)
+
+# Parquet cold tier: 이 일수보다 오래된(닫힌) 날짜의 traffic_logs를 날짜별 Parquet 파일로 이동
+COLD_TIER_DIR = os.getenv(
+    "COLD_TIER_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cold")
+)
+COLD_TIER_AFTER_DAYS = _env_int("COLD_TIER_AFTER_DAYS", 30)
+# row group 크기: 작을수록 timestamp 통계로 건너뛰는 범위가 세밀해짐
+COLD_TIER_ROW_GROUP_SIZE = _env_int("COLD_TIER_ROW_GROUP_SIZE", 65536)
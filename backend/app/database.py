@@ -1,7 +1,12 @@
-from sqlalchemy import create_engine
+import sqlite3
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.ml.utils import ip_to_numeric, protocol_to_numeric
+
 SQLALCHEMY_DATABASE_URL = "sqlite:///./app.db"
 
 engine = create_engine(
@@ -12,6 +17,30 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+@event.listens_for(Engine, "connect")
+def register_sqlite_functions(dbapi_connection, connection_record):
+    """
+    Expose IP/protocol encoders to SQL (used by INSERT ... SELECT and backfills)
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("ip_to_numeric", 1, ip_to_numeric, deterministic=True)
+        dbapi_connection.create_function(
+            "protocol_to_numeric", 1, protocol_to_numeric, deterministic=True
+        )
+
+
+@event.listens_for(Engine, "connect")
+def enable_wal(dbapi_connection, connection_record):
+    """
+    Use write-ahead logging so long reads (streaming exports, range scans)
+    do not block writers and writers do not block readers
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+
 def get_db():
     db = SessionLocal()
     try:
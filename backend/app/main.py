@@ -1,16 +1,51 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import engine, Base
-from app.routers import examples, traffic_logs, ml_models, alerts, ml_analysis
+from app import config
+from app.database import engine, Base, SessionLocal
+from app.migrations import run_migrations
+from app.routers import examples, traffic_logs, ml_models, alerts, ml_analysis, log_imports, jobs
 
 # Import models to ensure they are registered with Base
-from app.models import traffic_log, ml_model, alert
+from app.models import traffic_log, traffic_rollup, ml_model, alert, import_watermark, job, cold_partition
+from app.ml.model_cache import model_cache
+from app.ml.parallel import sharded_scorer
+from app.services.ingest_buffer import ingest_buffer
+from app.services.job_queue import job_queue
+from app.services.log_import import log_import_watcher
+from app.services.pagination import NEXT_CURSOR_HEADER
 
 # 데이터베이스 테이블 생성
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.INGEST_BUFFER_ENABLED:
+        ingest_buffer.start()
+    if config.LOGCOLLECTOR_WATCH_ENABLED:
+        log_import_watcher.start()
+    if config.MODEL_CACHE_PRELOAD:
+        model_cache.preload(SessionLocal, config.MODEL_CACHE_PRELOAD)
+    if config.JOB_QUEUE_ENABLED:
+        job_queue.start()
+    yield
+    # 실행 중인 작업은 기다리지 않음 (재시작 시 실패로 기록)
+    job_queue.stop(timeout=5)
+    sharded_scorer.shutdown()
+    log_import_watcher.stop()
+    # 종료 시 버퍼에 남은 로그를 모두 flush
+    ingest_buffer.stop()
 
-app = FastAPI(title="Module 5 API - Firewall Traffic Analysis", version="1.0.0")
+
+app = FastAPI(
+    title="Module 5 API - Firewall Traffic Analysis",
+    version="1.0.0",
+    lifespan=lifespan
+)
 
 # CORS 설정
 app.add_middleware(
@@ -19,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # 라우터 등록
@@ -27,6 +63,8 @@ app.include_router(traffic_logs.router)
 app.include_router(ml_models.router)
 app.include_router(alerts.router)
 app.include_router(ml_analysis.router)
+app.include_router(log_imports.router)
+app.include_router(jobs.router)
 
 
 @app.get("/api/health")
@@ -0,0 +1,255 @@
+"""
+Lightweight schema migrations for existing SQLite databases
+
+Base.metadata.create_all only creates missing tables, so columns and
+indexes added to existing tables are applied here at startup. Every step is
+idempotent.
+"""
+import functools
+import os
+from datetime import datetime
+
+from sqlalchemy import func, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.ml.utils import PROTOCOL_NAMES
+from app.models.alert import Alert
+from app.models.ml_model import MLModel
+from app.models.traffic_log import TrafficLog
+from app.models.traffic_rollup import (
+    TrafficRollupMinute, TrafficRollupHour, TrafficRollupDay, TrafficRollupSketch, TrafficRollupSketchWatermark
+)
+
+BACKFILL_BATCH_SIZE = 50000
+
+
+def _add_missing_columns(engine: Engine, table: str, columns: dict) -> None:
+    existing = {column["name"] for column in inspect(engine).get_columns(table)}
+    with engine.begin() as conn:
+        for name, ddl_type in columns.items():
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl_type}")
+
+
+def migrate_traffic_log_numeric_columns(engine: Engine) -> None:
+    """
+    Add integer-encoded IP/protocol columns, backfill them and move the
+    timestamp-composite IP indexes onto the integer columns
+
+    The single-column string IP indexes stay (non-IPv4 filter values are
+    looked up on the string columns); databases that dropped them in an
+    earlier version of this step get them back.
+
+    Args:
+        engine: Database engine
+    """
+    _add_missing_columns(engine, "traffic_logs", {
+        "src_ip_numeric": "INTEGER",
+        "dst_ip_numeric": "INTEGER",
+        "protocol_numeric": "SMALLINT"
+    })
+
+    # 배치 단위로 backfill (긴 쓰기 잠금 방지)
+    backfill_sql = text("""
+        UPDATE traffic_logs
+        SET src_ip_numeric = ip_to_numeric(src_ip),
+            dst_ip_numeric = ip_to_numeric(dst_ip),
+            protocol_numeric = protocol_to_numeric(protocol)
+        WHERE id IN (
+            SELECT id FROM traffic_logs
+            WHERE src_ip_numeric IS NULL OR dst_ip_numeric IS NULL OR protocol_numeric IS NULL
+            LIMIT :batch_size
+        )
+    """)
+    while True:
+        with engine.begin() as conn:
+            updated = conn.execute(backfill_sql, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount
+        if updated < BACKFILL_BATCH_SIZE:
+            break
+
+    for index in TrafficLog.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        for name in ("idx_timestamp_src_ip", "idx_timestamp_dst_ip"):
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+
+def migrate_ml_model_version_columns(engine: Engine) -> None:
+    """
+    Add version / parent_model_id columns used by incremental refresh
+
+    Args:
+        engine: Database engine
+    """
+    _add_missing_columns(engine, "ml_models", {
+        "version": "INTEGER NOT NULL DEFAULT 1",
+        "parent_model_id": "INTEGER REFERENCES ml_models(id)"
+    })
+
+
+def migrate_ml_model_metadata_columns(engine: Engine) -> None:
+    """
+    Add artifact metadata columns and backfill them from existing model files
+
+    Rows whose file is missing, unreadable or a legacy pickle (which has no
+    header to read without unpickling the model) are left empty.
+
+    Args:
+        engine: Database engine
+    """
+    from app.ml.artifact import ModelArtifact
+
+    _add_missing_columns(engine, "ml_models", {
+        "algorithm": "VARCHAR",
+        "params": "JSON",
+        "trained_at": "DATETIME",
+        "training_samples": "INTEGER",
+        "training_sample": "JSON",
+        "artifact_size": "INTEGER",
+        "feature_schema_version": "INTEGER",
+        "training_duration_ms": "FLOAT"
+    })
+
+    with Session(engine) as db:
+        models = db.query(MLModel).filter(
+            MLModel.algorithm.is_(None), MLModel.model_path.isnot(None)
+        ).all()
+        for ml_model in models:
+            try:
+                info = ModelArtifact.read_info(ml_model.model_path)
+                size = os.path.getsize(ml_model.model_path)
+            except Exception:
+                continue
+            ml_model.algorithm = info["algorithm"]
+            ml_model.params = info["params"]
+            ml_model.trained_at = datetime.fromisoformat(info["trained_at"]) if info["trained_at"] else None
+            ml_model.training_samples = info["training_samples"]
+            ml_model.training_sample = info["training_sample"]
+            ml_model.artifact_size = size
+            # 이전 모델은 스키마 버전이 없으므로 1로 간주
+            ml_model.feature_schema_version = info["feature_schema_version"] or 1
+            ml_model.training_duration_ms = info["training_duration_ms"]
+        db.commit()
+
+
+def migrate_rollup_protocol_key(engine: Engine) -> None:
+    """
+    Re-key the rollup tables from protocol_numeric to the stored protocol string
+
+    Existing buckets are converted by protocol number, so in them unmapped
+    protocols stay UNKNOWN and differently cased names stay merged; buckets
+    written afterwards keep every stored protocol apart.
+
+    Args:
+        engine: Database engine
+    """
+    protocol_name = "CASE protocol_numeric {} ELSE 'UNKNOWN' END".format(
+        " ".join(f"WHEN {code} THEN '{name}'" for code, name in PROTOCOL_NAMES.items())
+    )
+    for model in (TrafficRollupMinute, TrafficRollupHour, TrafficRollupDay):
+        table = model.__tablename__
+        if "protocol" in {column["name"] for column in inspect(engine).get_columns(table)}:
+            continue
+
+        # SQLite는 기본 키를 바꿀 수 없으므로 새 테이블로 복사
+        values = ", ".join(
+            column.name for column in model.__table__.columns if column.name not in ("bucket_start", "protocol")
+        )
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"ALTER TABLE {table} RENAME TO {table}_old")
+            model.__table__.create(bind=conn)
+            conn.exec_driver_sql(
+                f"INSERT INTO {table} (bucket_start, protocol, {values}) "
+                f"SELECT bucket_start, {protocol_name}, {values} FROM {table}_old"
+            )
+            conn.exec_driver_sql(f"DROP TABLE {table}_old")
+
+
+def migrate_traffic_rollups(engine: Engine) -> None:
+    """
+    Build the rollup tables from existing traffic_logs the first time they exist
+
+    Bucket aggregates and each sketch are backfilled independently (sketches
+    were added later). Sketches are backfilled up to the sketch watermark,
+    which starts at the current maximum id (earlier versions merged every
+    insert right away). Runs in one transaction so an interrupted
+    backfill leaves the tables empty and is retried on the next start.
+
+    Args:
+        engine: Database engine
+    """
+    from app.services.rollup import RollupService, SKETCH_NAMES
+
+    with Session(engine) as db:
+        max_id = db.query(func.max(TrafficLog.id)).scalar() or 0
+        watermark = db.get(TrafficRollupSketchWatermark, 1)
+        if watermark is None:
+            watermark = TrafficRollupSketchWatermark(id=1, last_log_id=max_id)
+            db.add(watermark)
+
+        # (단계, 마지막 id): 요약은 watermark까지만 채움 (이후 행은 flush_sketches가 반영)
+        steps = []
+        if all(
+            db.query(model).first() is None
+            for model in (TrafficRollupMinute, TrafficRollupHour, TrafficRollupDay)
+        ):
+            steps.append((RollupService.apply_aggregates, max_id))
+        missing_sketches = [
+            name for name in SKETCH_NAMES
+            if db.query(TrafficRollupSketch).filter(TrafficRollupSketch.name == name).first() is None
+        ]
+        if missing_sketches:
+            steps.append((
+                functools.partial(RollupService.apply_sketches, names=missing_sketches), watermark.last_log_id
+            ))
+
+        for step, last_id in steps:
+            for first_id in range(1, last_id + 1, BACKFILL_BATCH_SIZE):
+                step(db, first_id, min(first_id + BACKFILL_BATCH_SIZE - 1, last_id))
+        db.commit()
+
+
+def migrate_pagination_indexes(engine: Engine) -> None:
+    """
+    Replace the single-column IP indexes with (ip, timestamp) indexes so
+    IP-filtered log pages are read in order without a sort
+
+    Args:
+        engine: Database engine
+    """
+    for index in TrafficLog.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        for name in ("ix_traffic_logs_src_ip_numeric", "ix_traffic_logs_dst_ip_numeric"):
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+
+def migrate_alert_indexes(engine: Engine) -> None:
+    """
+    Add the (traffic_log_id, ml_model_id) index range scans use to skip
+    logs that already have an alert for the model
+
+    Args:
+        engine: Database engine
+    """
+    for index in Alert.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Apply all pending migrations
+
+    Args:
+        engine: Database engine
+    """
+    migrate_traffic_log_numeric_columns(engine)
+    migrate_ml_model_version_columns(engine)
+    migrate_ml_model_metadata_columns(engine)
+    migrate_rollup_protocol_key(engine)
+    migrate_traffic_rollups(engine)
+    migrate_pagination_indexes(engine)
+    migrate_alert_indexes(engine)
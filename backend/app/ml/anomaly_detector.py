@@ -1,9 +1,20 @@
 """
 Anomaly Detection using Isolation Forest
 """
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+from joblib import effective_n_jobs
 from sklearn.ensemble import IsolationForest
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional
+
+from app import config
+
+# Number of training-score quantiles stored for calibration
+CALIBRATION_POINTS = 1001
+
+# Below this many rows, scoring stays on one thread (thread start-up dominates)
+PARALLEL_SCORING_MIN_ROWS = 10000
 
 
 class AnomalyDetector:
@@ -11,12 +22,14 @@ class AnomalyDetector:
     Isolation Forest based anomaly detector
     """
 
-    def __init__(self, params: Dict[str, Any] = None):
+    def __init__(self, params: Dict[str, Any] = None, n_jobs: Optional[int] = None):
         """
         Initialize anomaly detector
 
         Args:
             params: Model parameters
+            n_jobs: Threads for fitting and scoring (defaults to ML_N_JOBS);
+                a runtime setting, never stored in params
         """
         self.params = params or {
             "contamination": 0.1,
@@ -24,7 +37,11 @@ class AnomalyDetector:
             "max_samples": "auto",
             "random_state": 42
         }
-        self.model = IsolationForest(**self.params)
+        # 이전 모델은 params에 n_jobs를 저장했음
+        self.params = {key: value for key, value in self.params.items() if key != "n_jobs"}
+        self.n_jobs = n_jobs or config.ML_N_JOBS
+        self.model = IsolationForest(**self.params, n_jobs=self.n_jobs)
+        self.calibration: Optional[np.ndarray] = None
 
     def train(self, X: np.ndarray) -> None:
         """
@@ -34,6 +51,36 @@ class AnomalyDetector:
             X: Training data (scaled features)
         """
         self.model.fit(X)
+        self.fit_calibration(X)
+
+    def fit_calibration(self, X: np.ndarray) -> None:
+        """
+        Fit score calibration from the training score distribution
+
+        Stores CALIBRATION_POINTS quantiles of the training decision scores so
+        anomaly scores become a per-row lookup independent of the batch.
+
+        Args:
+            X: Training data (scaled features)
+        """
+        decision_scores = self.get_decision_scores(X)
+        self.calibration = np.quantile(decision_scores, np.linspace(0, 1, CALIBRATION_POINTS))
+
+    def calibrate(self, decision_scores: np.ndarray) -> np.ndarray:
+        """
+        Convert decision scores to calibrated anomaly scores
+
+        The score is the fraction of training samples that look more normal
+        than the row, so it only depends on the row and the trained model.
+
+        Args:
+            decision_scores: Raw decision function scores
+
+        Returns:
+            Anomaly scores in 0-1 range (higher = more anomalous)
+        """
+        levels = np.linspace(0, 1, len(self.calibration))
+        return 1.0 - np.interp(decision_scores, self.calibration, levels)
 
     def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -45,15 +92,30 @@ class AnomalyDetector:
         Returns:
             Tuple of (predictions, anomaly scores)
             - predictions: 1 for normal, -1 for anomaly
-            - anomaly_scores: Higher score means more anomalous (0-1 range)
+            - anomaly_scores: Higher score means more anomalous (0-1 range,
+              calibrated against the training score distribution)
         """
-        predictions = self.model.predict(X)
-
         # Get decision function scores (negative means anomaly)
-        decision_scores = self.model.decision_function(X)
+        return self.predict_from_scores(self.get_decision_scores(X))
+
+    def predict_from_scores(self, decision_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Turn raw decision scores into predictions and anomaly scores
+
+        Args:
+            decision_scores: Raw decision function scores (e.g. from shards)
+
+        Returns:
+            Tuple of (predictions, anomaly scores) as in predict
+        """
+        # IsolationForest.predict와 동일한 판정 (forest를 한 번만 평가)
+        predictions = np.where(decision_scores < 0, -1, 1)
 
         # Convert to 0-1 range (higher = more anomalous)
-        # Normalize using min-max scaling
+        if getattr(self, "calibration", None) is not None:
+            return predictions, self.calibrate(decision_scores)
+
+        # 보정 정보가 없는 이전 모델: 배치 내 min-max 정규화
         min_score = decision_scores.min()
         max_score = decision_scores.max()
 
@@ -76,7 +138,6 @@ class AnomalyDetector:
     def get_feature_importance(self, X: np.ndarray, sample_idx: int) -> np.ndarray:
         """
         Get feature importance for a specific sample
-        Uses path length approximation from decision function
 
         Args:
             X: Input data
@@ -85,26 +146,39 @@ class AnomalyDetector:
         Returns:
             Array of feature importance scores (higher = more influential)
         """
-        # Get decision path for the sample
-        sample = X[sample_idx:sample_idx+1]
+        return self.get_feature_importances(X, [sample_idx])[0]
+
+    def get_feature_importances(self, X: np.ndarray, sample_indices: Any) -> np.ndarray:
+        """
+        Get feature importance for several samples with one forest evaluation
+
+        Each feature of each sample is set to the mean (0 in scaled space);
+        importance is the absolute change in decision score. All originals
+        and perturbed variants are stacked into one matrix and scored in a
+        single decision_function call.
 
-        # Compute feature contribution by analyzing tree paths
-        # This is an approximation based on feature variance
-        feature_variance = np.zeros(X.shape[1])
+        Args:
+            X: Input data
+            sample_indices: Indices of samples to explain
 
-        for i in range(X.shape[1]):
-            # Create perturbation: set feature i to mean value
-            X_perturbed = sample.copy()
-            X_perturbed[0, i] = 0  # Mean in scaled space
+        Returns:
+            Array of shape (len(sample_indices), n_features)
+        """
+        samples = X[np.asarray(sample_indices, dtype=np.intp)]
+        n_samples, n_features = samples.shape
+        if n_samples == 0:
+            return np.zeros((0, n_features))
 
-            # Measure score change
-            original_score = self.model.decision_function(sample)[0]
-            perturbed_score = self.model.decision_function(X_perturbed)[0]
+        # (n_samples, n_features + 1, n_features): 0번은 원본, i+1번은 feature i를 0으로 치환
+        variants = np.repeat(samples[:, np.newaxis, :], n_features + 1, axis=1)
+        features = np.arange(n_features)
+        variants[:, features + 1, features] = 0
 
-            # Importance is the absolute change in score
-            feature_variance[i] = abs(original_score - perturbed_score)
+        scores = self.get_decision_scores(
+            variants.reshape(-1, n_features)
+        ).reshape(n_samples, n_features + 1)
 
-        return feature_variance
+        return np.abs(scores[:, :1] - scores[:, 1:])
 
     def get_decision_scores(self, X: np.ndarray) -> np.ndarray:
         """
@@ -116,4 +190,10 @@ class AnomalyDetector:
         Returns:
             Array of decision scores (negative means anomaly)
         """
-        return self.model.decision_function(X)
+        # sklearn은 점수 계산을 순차 실행하므로 행을 나눠 스레드로 병렬 처리
+        # (트리 탐색은 GIL을 해제하고, 행별 점수는 서로 독립)
+        n_jobs = min(effective_n_jobs(getattr(self, "n_jobs", None) or config.ML_N_JOBS), len(X))
+        if n_jobs <= 1 or len(X) < PARALLEL_SCORING_MIN_ROWS:
+            return self.model.decision_function(X)
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return np.concatenate(list(executor.map(self.model.decision_function, np.array_split(X, n_jobs))))
@@ -0,0 +1,565 @@
+"""
+Memory-mappable Model Artifact Format
+
+An artifact is a single file: a magic string, a small JSON header and a block
+of 64-byte aligned NumPy arrays (forest node arrays, scaler parameters and the
+score calibration). Loading maps the file read-only and scores directly on the
+mapped arrays, so load time does not grow with the forest and uvicorn workers
+serving the same model share its pages through the OS page cache. Metadata is
+answered from the header alone. Pickled (joblib) .pkl artifacts still load.
+
+Small batches are scored on the stored arrays. Large batches are scored by the
+sklearn forest rebuilt from them (its compiled tree walk is faster there),
+built once per loaded artifact. Rebuilding sklearn estimators (also used by
+merge and incremental refresh) restores private IsolationForest/Tree state, so
+it is only allowed under the scikit-learn version that wrote the artifact;
+under any other version every batch is scored on the arrays.
+"""
+import json
+import os
+import threading
+from datetime import date
+from typing import Dict, Any, Optional, Tuple
+
+import joblib
+import numpy as np
+import sklearn
+from joblib import Parallel, delayed
+from sklearn.ensemble import IsolationForest
+from sklearn.ensemble._iforest import _average_path_length
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import ExtraTreeRegressor
+from sklearn.tree._tree import Tree
+
+from app.ml.anomaly_detector import AnomalyDetector
+from app.ml.preprocessor import TrafficLogPreprocessor
+from app.ml.sketches import KLLSketch
+
+MAGIC = b"TLMODEL\x00"
+FORMAT_VERSION = 1
+ARRAY_ALIGNMENT = 64
+
+# Metadata keys answered from the header (get_model_info)
+INFO_KEYS = (
+    "algorithm", "params", "trained_at", "training_samples", "training_sample",
+    "feature_schema_version", "training_duration_ms"
+)
+
+# Rows x trees evaluated per traversal block (bounds temporary memory)
+SCORING_BLOCK_ELEMENTS = 1 << 20
+
+# From this many rows, score with the rebuilt sklearn forest instead of the
+# vectorized walk (measured crossover at 100 trees is about 2-3k rows)
+SKLEARN_SCORING_MIN_ROWS = 4096
+
+
+class FlatForest:
+    """
+    IsolationForest scorer working on flat (memory-mapped) node arrays
+
+    All trees are stored back to back. Child indexes are global (left/right
+    interleaved), leaves point to themselves and split features index the
+    full feature vector, so every tree is walked at once with one vectorized
+    step per depth level. Batches of SKLEARN_SCORING_MIN_ROWS or more go to
+    an sklearn forest rebuilt on first use and kept on the instance.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], header: Dict[str, Any]):
+        """
+        Initialize flat forest
+
+        Args:
+            arrays: Node and per-tree arrays (see FlatForest.encode)
+            header: Forest scalars (see FlatForest.encode)
+        """
+        self.arrays = arrays
+        self.header = header
+        self.offset_ = header["offset"]
+        self.n_estimators = len(arrays["node_offsets"]) - 1
+
+        self._sklearn_forest: Optional[IsolationForest] = None
+        self._sklearn_lock = threading.Lock()
+
+    @staticmethod
+    def encode(forest: IsolationForest) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Flatten a fitted IsolationForest
+
+        Args:
+            forest: Fitted IsolationForest
+
+        Returns:
+            Tuple of (arrays, header scalars)
+        """
+        counts = [tree.tree_.node_count for tree in forest.estimators_]
+        node_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        children, feature, threshold, leaf_depth, nodes, values = [], [], [], [], [], []
+        for i, (tree, features) in enumerate(zip(forest.estimators_, forest.estimators_features_)):
+            state = tree.tree_.__getstate__()
+            tree_nodes = state["nodes"]
+            start = node_offsets[i]
+            index = np.arange(tree_nodes.shape[0], dtype=np.int64) + start
+            is_leaf = tree_nodes["left_child"] < 0
+
+            # 리프는 자기 자신을 가리키게 해서 깊이 단계마다 모든 트리를 한 번에 진행
+            children.append(np.stack([
+                np.where(is_leaf, index, tree_nodes["left_child"] + start),
+                np.where(is_leaf, index, tree_nodes["right_child"] + start)
+            ], axis=1).reshape(-1))
+            feature.append(np.where(is_leaf, 0, np.asarray(features)[np.maximum(tree_nodes["feature"], 0)]))
+            threshold.append(np.where(is_leaf, 0.0, tree_nodes["threshold"]))
+            leaf_depth.append(
+                forest._decision_path_lengths[i] + forest._average_path_length_per_tree[i] - 1.0
+            )
+            nodes.append(tree_nodes)
+            values.append(state["values"].reshape(-1))
+
+        features = [np.asarray(f, dtype=np.int64) for f in forest.estimators_features_]
+        template = forest.estimators_[0]
+        arrays = {
+            "children": np.concatenate(children).astype(np.int64),
+            "feature": np.concatenate(feature).astype(np.int64),
+            "threshold": np.concatenate(threshold).astype(np.float64),
+            "leaf_depth": np.concatenate(leaf_depth).astype(np.float64),
+            "node_offsets": node_offsets,
+            "tree_depths": np.array([tree.tree_.max_depth for tree in forest.estimators_], dtype=np.int64),
+            "tree_max_depth_params": np.array(
+                [-1 if tree.max_depth is None else tree.max_depth for tree in forest.estimators_],
+                dtype=np.int64
+            ),
+            "tree_random_states": np.array([tree.random_state for tree in forest.estimators_], dtype=np.int64),
+            "features": np.concatenate(features),
+            "feature_offsets": np.concatenate([[0], np.cumsum([len(f) for f in features])]).astype(np.int64),
+            "seeds": np.asarray(forest._seeds, dtype=np.int64),
+            # sklearn Tree 복원용 원본 노드 (병합/증분 갱신 시에만 사용)
+            "nodes": np.concatenate(nodes),
+            "values": np.concatenate(values).astype(np.float64)
+        }
+        header = {
+            # to_isolation_forest는 이 버전의 내부 상태 형식에 의존
+            "sklearn_version": sklearn.__version__,
+            "offset": float(forest.offset_),
+            "contamination": forest.contamination,
+            "n_features_in": int(forest.n_features_in_),
+            "max_samples": int(forest._max_samples),
+            "max_features": int(forest._max_features),
+            "n_samples": int(getattr(forest, "_n_samples", forest._max_samples)),
+            "max_depth": int(arrays["tree_depths"].max()) if len(counts) else 0,
+            "average_path_length": float(_average_path_length([forest._max_samples])[0]),
+            "tree_max_features": int(template.max_features_),
+            "tree_params": {
+                key: value for key, value in template.get_params().items()
+                if key not in ("max_depth", "random_state")
+            }
+        }
+        return arrays, header
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """
+        Opposite of the anomaly score (same as IsolationForest.score_samples)
+
+        Args:
+            X: Scaled feature matrix
+
+        Returns:
+            Array of scores (lower = more abnormal)
+        """
+        # sklearn 트리는 float32 입력을 float64 임계값과 비교
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.header["n_features_in"]:
+            raise ValueError(
+                f"X has {X.shape[-1]} features, but the model expects {self.header['n_features_in']}"
+            )
+
+        # 큰 배치는 sklearn의 컴파일된 트리 탐색이 더 빠름 (같은 노드라 점수도 동일)
+        if len(X) >= SKLEARN_SCORING_MIN_ROWS:
+            forest = self._rebuilt_forest()
+            if forest is not None:
+                return forest.score_samples(X)
+
+        block_rows = max(1, SCORING_BLOCK_ELEMENTS // max(self.n_estimators, 1))
+        # parallel_config(threading) 안에서 호출되면 블록을 스레드로 나눠 계산
+        depths = Parallel()(
+            delayed(self._path_lengths)(X[start:start + block_rows])
+            for start in range(0, len(X), block_rows)
+        )
+        depths = np.concatenate(depths) if depths else np.zeros(0)
+
+        denominator = self.n_estimators * self.header["average_path_length"]
+        if denominator == 0:
+            return -np.ones_like(depths)
+        return -(2 ** (-depths / denominator))
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """
+        Decision scores (same as IsolationForest.decision_function)
+
+        Args:
+            X: Scaled feature matrix
+
+        Returns:
+            Array of decision scores (negative means anomaly)
+        """
+        return self.score_samples(X) - self.offset_
+
+    def to_isolation_forest(self, params: Dict[str, Any]) -> IsolationForest:
+        """
+        Rebuild a fitted sklearn IsolationForest (for merging and refresh)
+
+        Args:
+            params: Detector parameters
+
+        Returns:
+            Fitted IsolationForest equivalent to this forest
+
+        Raises:
+            ValueError: If the artifact was written by another scikit-learn version
+        """
+        arrays, header = self.arrays, self.header
+        written_by = header.get("sklearn_version")
+        if written_by != sklearn.__version__:
+            raise ValueError(
+                f"Model artifact was written with scikit-learn {written_by or 'unknown'} and cannot be "
+                f"rebuilt for merging or refresh under {sklearn.__version__}; retrain the model"
+            )
+        forest = IsolationForest(**params)
+        forest.n_estimators = self.n_estimators
+        forest.contamination = header["contamination"]
+        forest.n_features_in_ = header["n_features_in"]
+        forest.max_samples_ = forest._max_samples = header["max_samples"]
+        forest._max_features = header["max_features"]
+        forest._n_samples = header["n_samples"]
+        forest._sample_weight = None
+        forest.estimator_ = ExtraTreeRegressor(**header["tree_params"], random_state=forest.random_state)
+        forest.offset_ = header["offset"]
+
+        estimators, estimators_features, path_lengths, node_depths = [], [], [], []
+        node_offsets, feature_offsets = arrays["node_offsets"], arrays["feature_offsets"]
+        for i in range(self.n_estimators):
+            start, end = node_offsets[i], node_offsets[i + 1]
+            features = np.array(arrays["features"][feature_offsets[i]:feature_offsets[i + 1]])
+            max_depth = int(arrays["tree_max_depth_params"][i])
+
+            tree = ExtraTreeRegressor(
+                **header["tree_params"],
+                max_depth=None if max_depth < 0 else max_depth,
+                random_state=int(arrays["tree_random_states"][i])
+            )
+            tree.n_features_in_ = len(features)
+            tree.n_outputs_ = 1
+            tree.max_features_ = header["tree_max_features"]
+            tree.tree_ = Tree(len(features), np.array([1], dtype=np.intp), 1)
+            tree.tree_.__setstate__({
+                "max_depth": int(arrays["tree_depths"][i]),
+                "node_count": int(end - start),
+                "nodes": np.array(arrays["nodes"][start:end]),
+                "values": np.array(arrays["values"][start:end]).reshape(-1, 1, 1)
+            })
+            estimators.append(tree)
+            estimators_features.append(features)
+
+            # 경로 길이 보조 배열은 IsolationForest.fit과 같은 방식으로 노드 정보에서 다시 계산
+            node_depths.append(tree.tree_.compute_node_depths())
+            path_lengths.append(_average_path_length(tree.tree_.n_node_samples))
+
+        forest.estimators_ = estimators
+        forest.estimators_features_ = estimators_features
+        forest._seeds = np.array(arrays["seeds"])
+        forest._average_path_length_per_tree = tuple(path_lengths)
+        forest._decision_path_lengths = tuple(node_depths)
+        return forest
+
+    def _rebuilt_forest(self) -> Optional[IsolationForest]:
+        # 한 번만 재구성해 인스턴스에 보관 (모델 캐시가 FlatForest와 함께 유지)
+        if self._sklearn_forest is None and self.header.get("sklearn_version") == sklearn.__version__:
+            with self._sklearn_lock:
+                if self._sklearn_forest is None:
+                    self._sklearn_forest = self.to_isolation_forest({})
+        return self._sklearn_forest
+
+    def _path_lengths(self, X: np.ndarray) -> np.ndarray:
+        arrays = self.arrays
+        children, feature, threshold = arrays["children"], arrays["feature"], arrays["threshold"]
+        n_rows, n_features = X.shape
+
+        # (행, 트리) 쌍을 1차원으로 펼쳐 단계마다 gather 몇 번으로 한 층씩 내려감
+        values = X.reshape(-1)
+        nodes = np.tile(arrays["node_offsets"][:-1], n_rows)
+        row_starts = np.repeat(np.arange(n_rows, dtype=np.int64) * n_features, self.n_estimators)
+        for _ in range(self.header["max_depth"]):
+            go_right = values[row_starts + feature[nodes]] > threshold[nodes]
+            nodes = children[2 * nodes + go_right]
+
+        # sklearn과 같은 순서(트리별 누적)로 합산
+        leaf_depth = arrays["leaf_depth"][nodes.reshape(n_rows, self.n_estimators)]
+        depths = np.zeros(n_rows)
+        for i in range(self.n_estimators):
+            depths += leaf_depth[:, i]
+        return depths
+
+
+class ModelArtifact:
+    """
+    Reads and writes model artifacts
+    """
+
+    @staticmethod
+    def save(path: str, model_data: Dict[str, Any]) -> None:
+        """
+        Write a model artifact in the flat format
+
+        Args:
+            path: Destination file path
+            model_data: Model data dictionary (detector, preprocessor,
+                metadata keys and an optional incremental window)
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        header = {
+            "format_version": FORMAT_VERSION,
+            "metadata": {
+                key: value for key, value in model_data.items()
+                if key not in ("detector", "preprocessor", "window")
+            },
+            "model": ModelArtifact._encode_model(
+                model_data["detector"], model_data["preprocessor"], "", arrays
+            )
+        }
+
+        window = model_data.get("window")
+        if window:
+            header["window"] = {
+                **{key: value for key, value in window.items() if key != "parts"},
+                "parts": [
+                    {
+                        "day": part["day"].isoformat(),
+                        "algorithm": part["algorithm"],
+                        "training_samples": part["training_samples"],
+                        "model": ModelArtifact._encode_model(
+                            part["detector"], part["preprocessor"], f"parts.{i}.", arrays
+                        )
+                    }
+                    for i, part in enumerate(window["parts"])
+                ]
+            }
+
+        ModelArtifact._write(path, header, arrays)
+
+    @staticmethod
+    def load(path: str, materialize: bool = False) -> Dict[str, Any]:
+        """
+        Load a model artifact
+
+        Args:
+            path: Model file path (flat artifact or legacy joblib pickle)
+            materialize: Rebuild sklearn forests and the incremental window
+                (needed to merge or refresh); otherwise the detector scores
+                on the memory-mapped arrays
+
+        Returns:
+            Model data dictionary in the shape ModelTrainer saves
+        """
+        if not ModelArtifact.is_flat(path):
+            return joblib.load(path)
+
+        header, arrays = ModelArtifact._read(path)
+        detector, preprocessor = ModelArtifact._decode_model(header["model"], arrays, materialize)
+        model_data = {**header["metadata"], "detector": detector, "preprocessor": preprocessor}
+
+        window = header.get("window")
+        if window and materialize:
+            parts = []
+            for part in window["parts"]:
+                part_detector, part_preprocessor = ModelArtifact._decode_model(part["model"], arrays, True)
+                parts.append({
+                    "day": date.fromisoformat(part["day"]),
+                    "algorithm": part["algorithm"],
+                    "training_samples": part["training_samples"],
+                    "detector": part_detector,
+                    "preprocessor": part_preprocessor
+                })
+            model_data["window"] = {**window, "parts": parts}
+        return model_data
+
+    @staticmethod
+    def read_info(path: str) -> Dict[str, Any]:
+        """
+        Read model metadata without loading the model
+
+        Args:
+            path: Model file path
+
+        Returns:
+            Dictionary with the INFO_KEYS metadata
+
+        Raises:
+            ValueError: If the file is a legacy pickle (no header; reading it
+                means unpickling the whole model)
+        """
+        if not ModelArtifact.is_flat(path):
+            raise ValueError(f"Legacy pickle artifact has no metadata header: {path}")
+        metadata = ModelArtifact._read_header(path)[0]["metadata"]
+        return {key: metadata.get(key) for key in INFO_KEYS}
+
+    @staticmethod
+    def is_flat(path: str) -> bool:
+        """
+        Whether a file uses the flat artifact format
+
+        Args:
+            path: Model file path
+
+        Returns:
+            True for flat artifacts, False for joblib pickles
+        """
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+
+    @staticmethod
+    def _encode_model(
+        detector: AnomalyDetector,
+        preprocessor: TrafficLogPreprocessor,
+        prefix: str,
+        arrays: Dict[str, np.ndarray]
+    ) -> Dict[str, Any]:
+        forest = detector.model
+        if isinstance(forest, FlatForest):
+            forest_arrays, forest_header = forest.arrays, forest.header
+        else:
+            forest_arrays, forest_header = FlatForest.encode(forest)
+        arrays.update({f"{prefix}forest.{name}": array for name, array in forest_arrays.items()})
+
+        calibration = getattr(detector, "calibration", None)
+        if calibration is not None:
+            arrays[f"{prefix}calibration"] = np.asarray(calibration, dtype=np.float64)
+
+        scaler = preprocessor.scaler
+        sketches = getattr(preprocessor, "feature_sketches", None)
+        for name in ("mean_", "var_", "scale_", "n_samples_seen_"):
+            arrays[f"{prefix}scaler.{name}"] = np.atleast_1d(np.asarray(getattr(scaler, name)))
+
+        return {
+            "prefix": prefix,
+            "params": detector.params,
+            "calibrated": calibration is not None,
+            "forest": forest_header,
+            "scaler": {
+                "params": scaler.get_params(),
+                "n_features_in": int(scaler.n_features_in_),
+                "feature_names_in": (
+                    [str(name) for name in scaler.feature_names_in_]
+                    if hasattr(scaler, "feature_names_in_") else None
+                )
+            },
+            "feature_columns": preprocessor.feature_columns,
+            "training_stats": preprocessor.training_stats,
+            "feature_sketches": (
+                {column: sketch.to_dict() for column, sketch in sketches.items()} if sketches else None
+            )
+        }
+
+    @staticmethod
+    def _decode_model(
+        model: Dict[str, Any],
+        arrays: Dict[str, np.ndarray],
+        materialize: bool
+    ) -> Tuple[AnomalyDetector, TrafficLogPreprocessor]:
+        prefix = model["prefix"]
+        forest_prefix = f"{prefix}forest."
+        forest = FlatForest(
+            {name[len(forest_prefix):]: array for name, array in arrays.items() if name.startswith(forest_prefix)},
+            model["forest"]
+        )
+
+        detector = AnomalyDetector(model["params"])
+        detector.model = forest.to_isolation_forest(model["params"]) if materialize else forest
+        detector.calibration = arrays[f"{prefix}calibration"] if model["calibrated"] else None
+
+        preprocessor = TrafficLogPreprocessor()
+        preprocessor.feature_columns = model["feature_columns"]
+        preprocessor.training_stats = model["training_stats"]
+        sketches = model.get("feature_sketches")
+        preprocessor.feature_sketches = (
+            {column: KLLSketch.from_dict(sketch) for column, sketch in sketches.items()} if sketches else None
+        )
+
+        scaler = StandardScaler(**model["scaler"]["params"])
+        scaler.mean_ = np.array(arrays[f"{prefix}scaler.mean_"])
+        scaler.var_ = np.array(arrays[f"{prefix}scaler.var_"])
+        scaler.scale_ = np.array(arrays[f"{prefix}scaler.scale_"])
+        n_samples_seen = np.array(arrays[f"{prefix}scaler.n_samples_seen_"])
+        scaler.n_samples_seen_ = int(n_samples_seen[0]) if n_samples_seen.size == 1 else n_samples_seen
+        scaler.n_features_in_ = model["scaler"]["n_features_in"]
+        if model["scaler"]["feature_names_in"] is not None:
+            scaler.feature_names_in_ = np.array(model["scaler"]["feature_names_in"], dtype=object)
+        preprocessor.scaler = scaler
+
+        return detector, preprocessor
+
+    @staticmethod
+    def _write(path: str, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        layout, offset = {}, 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            arrays[name] = array
+            layout[name] = {
+                "dtype": np.lib.format.dtype_to_descr(array.dtype),
+                "shape": list(array.shape),
+                "offset": offset
+            }
+            offset = _align(offset + array.nbytes)
+        header = {**header, "arrays": layout}
+
+        header_bytes = json.dumps(header, default=_json_default).encode("utf-8")
+        data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+        # 매핑 중인 파일을 덮어쓰지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header_bytes).to_bytes(8, "little"))
+            f.write(header_bytes)
+            f.write(b"\x00" * (data_start - f.tell()))
+            for name, array in arrays.items():
+                f.write(b"\x00" * (data_start + layout[name]["offset"] - f.tell()))
+                f.write(array.tobytes())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_header(path: str) -> Tuple[Dict[str, Any], int]:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a model artifact: {path}")
+            header_length = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_length))
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact format version: {header.get('format_version')}")
+        return header, _align(len(MAGIC) + 8 + header_length)
+
+    @staticmethod
+    def _read(path: str) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        header, data_start = ModelArtifact._read_header(path)
+        mapped = np.memmap(path, dtype=np.uint8, mode="r")
+
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.lib.format.descr_to_dtype(spec["dtype"])
+            start = data_start + spec["offset"]
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            arrays[name] = mapped[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+        return header, arrays
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+
+def _json_default(value: Any) -> Any:
+    # 메타데이터에 섞인 NumPy 스칼라/배열과 날짜를 JSON 값으로 변환
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,173 @@
+"""
+Incremental (sliding-window) Training Logic
+
+A windowed model keeps one small sub-model per day (sub-forest + scaler
+moments + training_stats) next to the combined detector. A refresh fits only
+the newest day, drops days that fall out of the window and recombines the
+parts with ModelMerger, so its cost grows with the new day's data instead of
+the window size.
+"""
+import math
+import os
+import time
+from typing import Dict, Any, Callable, List, Optional
+from datetime import date
+
+from app.ml.anomaly_detector import AnomalyDetector
+from app.ml.artifact import ModelArtifact
+from app.ml.merger import ModelMerger
+from app.ml.preprocessor import TrafficLogPreprocessor, LogInput
+from app.ml.utils import validate_params
+
+
+class IncrementalTrainer:
+    """
+    Handles per-day training and window refresh
+    """
+
+    def __init__(self):
+        self.model_path = None
+
+    def train(
+        self,
+        day_logs: Dict[date, LogInput],
+        algorithm: str,
+        params: Dict[str, Any],
+        model_name: str,
+        progress: Optional[Callable[[float, str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Train a windowed model with one sub-forest per day
+
+        Args:
+            day_logs: Training data per day (days without data are skipped)
+            algorithm: Algorithm name (e.g., "isolation_forest")
+            params: Model parameters (n_estimators is the total for the window)
+            model_name: Name for the model
+            progress: Optional callback(fraction, stage), called before each
+                day's fit and before the artifact is written; an exception
+                raised by it (e.g. job cancellation) leaves no artifact behind
+
+        Returns:
+            Training result dictionary
+        """
+        if algorithm != "isolation_forest":
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
+        if not day_logs:
+            raise ValueError("No training data provided")
+
+        start = time.perf_counter()
+        validated_params = validate_params(algorithm, params)
+        window_days = (max(day_logs) - min(day_logs)).days + 1
+        trees_per_day = max(1, math.ceil(validated_params["n_estimators"] / window_days))
+
+        progress = progress or (lambda fraction, stage: None)
+        parts = []
+        for i, (day, logs) in enumerate(sorted(day_logs.items())):
+            # 일별 학습 사이마다 취소 여부 확인
+            progress(0.3 + 0.5 * i / len(day_logs), f"training {day.isoformat()}")
+            parts.append(self.fit_day(day, logs, validated_params, trees_per_day))
+
+        progress(0.8, "saving")
+        return self._save(parts, validated_params, window_days, trees_per_day, model_name, start)
+
+    def refresh(
+        self,
+        model_path: str,
+        day: date,
+        logs: LogInput,
+        model_name: str
+    ) -> Dict[str, Any]:
+        """
+        Add a new day to a windowed model and drop days outside the window
+
+        Args:
+            model_path: Path of the windowed model to refresh
+            day: Day of the new data
+            logs: Training data for that day
+            model_name: Name for the refreshed model
+
+        Returns:
+            Training result dictionary (includes the window's day range)
+
+        Raises:
+            ValueError: If the model was not trained incrementally
+        """
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        start = time.perf_counter()
+        window = ModelArtifact.load(model_path, materialize=True).get("window")
+        if not window:
+            raise ValueError("Model was not trained incrementally (no per-day window)")
+
+        part = self.fit_day(day, logs, window["params"], window["trees_per_day"])
+        first_day = date.fromordinal(day.toordinal() - window["window_days"] + 1)
+        parts = [p for p in window["parts"] if first_day <= p["day"] < day] + [part]
+
+        return self._save(
+            parts, window["params"], window["window_days"], window["trees_per_day"], model_name, start
+        )
+
+    @staticmethod
+    def fit_day(
+        day: date,
+        logs: LogInput,
+        params: Dict[str, Any],
+        trees_per_day: int
+    ) -> Dict[str, Any]:
+        """
+        Fit the sub-model for one day
+
+        Args:
+            day: Day of the data
+            logs: Training data for that day
+            params: Validated model parameters
+            trees_per_day: Trees in the day's sub-forest
+
+        Returns:
+            Part dictionary in the same shape as a model artifact
+        """
+        preprocessor = TrafficLogPreprocessor()
+        X_scaled, _ = preprocessor.fit_transform(logs)
+        if len(X_scaled) == 0:
+            raise ValueError(f"No training data for {day.isoformat()}")
+
+        detector = AnomalyDetector({**params, "n_estimators": trees_per_day})
+        detector.train(X_scaled)
+
+        return {
+            "day": day,
+            "algorithm": "isolation_forest",
+            "detector": detector,
+            "preprocessor": preprocessor,
+            "training_samples": len(X_scaled)
+        }
+
+    def _save(
+        self,
+        parts: List[Dict[str, Any]],
+        params: Dict[str, Any],
+        window_days: int,
+        trees_per_day: int,
+        model_name: str,
+        start: float
+    ) -> Dict[str, Any]:
+        merger = ModelMerger()
+        preprocessor, detector, training_samples = merger.combine(parts)
+        detector.params = {**params, "n_estimators": len(detector.model.estimators_)}
+
+        days = [part["day"] for part in parts]
+        result = merger.save(model_name, preprocessor, detector, training_samples, {
+            "window": {
+                "window_days": window_days,
+                "trees_per_day": trees_per_day,
+                "params": params,
+                "parts": parts
+            },
+            "training_duration_ms": round((time.perf_counter() - start) * 1000, 3)
+        })
+        self.model_path = merger.model_path
+
+        result["window_start"] = min(days)
+        result["window_end"] = max(days)
+        return result
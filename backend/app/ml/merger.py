@@ -0,0 +1,309 @@
+"""
+Model Merging Logic
+
+Combines trained artifacts without touching raw logs: the IsolationForest
+trees are pooled, the StandardScaler and training_stats are combined by
+sample-weighted moments (quartiles by merging the per-feature KLL sketches)
+and the score calibration is rebuilt from the source calibrations. Each
+tree's split thresholds are rewritten from its source model's scaled space
+into the merged scaled space (an affine map per feature), so pooled trees
+see the same inputs they were trained on.
+"""
+import os
+import copy
+import time
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+
+from app import config
+from app.ml.anomaly_detector import AnomalyDetector, CALIBRATION_POINTS
+from app.ml.artifact import ModelArtifact
+from app.ml.preprocessor import TrafficLogPreprocessor, FEATURE_SCHEMA_VERSION
+from app.ml.sketches import KLLSketch
+from app.ml.utils import generate_model_filename, get_model_directory
+
+
+class ModelMerger:
+    """
+    Handles merging of saved model artifacts
+    """
+
+    def __init__(self):
+        self.model_path = None
+
+    def merge(self, model_paths: List[str], model_name: str) -> Dict[str, Any]:
+        """
+        Merge saved models into a new artifact
+
+        Args:
+            model_paths: Paths of the model files to merge
+            model_name: Name for the merged model
+
+        Returns:
+            Merge result dictionary (same shape as ModelTrainer.train)
+
+        Raises:
+            ValueError: If the models cannot be merged
+        """
+        if len(model_paths) < 2:
+            raise ValueError("At least two models are required to merge")
+
+        start = time.perf_counter()
+        artifacts = []
+        for path in model_paths:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Model file not found: {path}")
+            artifacts.append(ModelArtifact.load(path, materialize=True))
+
+        preprocessor, detector, training_samples = self.combine(artifacts)
+
+        return self.save(model_name, preprocessor, detector, training_samples, {
+            "merged_from": [os.path.basename(path) for path in model_paths],
+            "training_duration_ms": round((time.perf_counter() - start) * 1000, 3)
+        })
+
+    def combine(
+        self,
+        artifacts: List[Dict[str, Any]]
+    ) -> Tuple[TrafficLogPreprocessor, AnomalyDetector, int]:
+        """
+        Combine loaded artifacts into one preprocessor and detector
+
+        Args:
+            artifacts: Model data dictionaries (as saved by ModelTrainer)
+
+        Returns:
+            Tuple of (preprocessor, detector, total training samples)
+
+        Raises:
+            ValueError: If the artifacts cannot be merged
+        """
+        algorithms = {artifact["algorithm"] for artifact in artifacts}
+        if algorithms != {"isolation_forest"}:
+            raise ValueError(f"Only isolation_forest models can be merged: {sorted(algorithms)}")
+
+        preprocessors = [artifact["preprocessor"] for artifact in artifacts]
+        if any(p.feature_columns != preprocessors[0].feature_columns for p in preprocessors):
+            raise ValueError("Models use different feature columns")
+
+        counts = np.array(
+            [artifact.get("training_samples") or p.scaler.n_samples_seen_
+             for artifact, p in zip(artifacts, preprocessors)],
+            dtype=np.float64
+        )
+
+        preprocessor = self._merge_preprocessors(preprocessors, counts)
+        detector = self._merge_detectors(
+            [artifact["detector"] for artifact in artifacts], preprocessors, preprocessor, counts
+        )
+        return preprocessor, detector, int(counts.sum())
+
+    def save(
+        self,
+        model_name: str,
+        preprocessor: TrafficLogPreprocessor,
+        detector: AnomalyDetector,
+        training_samples: int,
+        extra: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Save a combined model as a new artifact
+
+        Args:
+            model_name: Name for the model
+            preprocessor: Combined preprocessor
+            detector: Combined detector
+            training_samples: Total training samples
+            extra: Additional artifact keys (e.g. training_duration_ms)
+
+        Returns:
+            Result dictionary (same shape as ModelTrainer.train)
+        """
+        model_dir = get_model_directory()
+        filename = generate_model_filename(model_name, "isolation_forest")
+        self.model_path = os.path.join(model_dir, filename)
+
+        model_data = {
+            "detector": detector,
+            "preprocessor": preprocessor,
+            "algorithm": "isolation_forest",
+            "params": detector.params,
+            "trained_at": datetime.utcnow().isoformat(),
+            "training_samples": training_samples,
+            "feature_schema_version": FEATURE_SCHEMA_VERSION,
+            **(extra or {})
+        }
+
+        ModelArtifact.save(self.model_path, model_data)
+
+        return {
+            "model_path": self.model_path,
+            "algorithm": "isolation_forest",
+            "params": detector.params,
+            "trained_at": model_data["trained_at"],
+            "training_samples": training_samples,
+            "feature_schema_version": FEATURE_SCHEMA_VERSION,
+            "training_duration_ms": model_data.get("training_duration_ms"),
+            "status": "success"
+        }
+
+    @staticmethod
+    def _merge_preprocessors(
+        preprocessors: List[TrafficLogPreprocessor],
+        counts: np.ndarray
+    ) -> TrafficLogPreprocessor:
+        merged = copy.deepcopy(preprocessors[0])
+        weights = counts / counts.sum()
+
+        # 가중 적률로 StandardScaler 통계 결합 (분산은 sklearn과 같은 모분산)
+        # E[x²] - mean²은 IP처럼 평균이 큰 특성에서 자릿수가 소거되므로 평균과의 편차로 계산
+        means = np.array([p.scaler.mean_ for p in preprocessors])
+        variances = np.array([p.scaler.var_ for p in preprocessors])
+        mean = weights @ means
+        var = weights @ (variances + (means - mean) ** 2)
+
+        scaler = merged.scaler
+        scaler.mean_ = mean
+        scaler.var_ = var
+        scaler.scale_ = np.where(var > 0, np.sqrt(var), 1.0)
+        scaler.n_samples_seen_ = int(counts.sum())
+
+        sketches = [getattr(p, "feature_sketches", None) for p in preprocessors]
+        merged.feature_sketches = None
+        if all(sketches):
+            merged.feature_sketches = {
+                column: KLLSketch.merge_all(config.QUANTILE_SKETCH_K, [s[column] for s in sketches])
+                for column in sketches[0]
+            }
+
+        merged.training_stats = ModelMerger._merge_training_stats(
+            [p.get_training_stats() for p in preprocessors], counts, merged.feature_sketches
+        )
+        return merged
+
+    @staticmethod
+    def _merge_training_stats(
+        stats_list: List[Dict[str, Dict[str, float]]],
+        counts: np.ndarray,
+        sketches: Optional[Dict[str, KLLSketch]] = None
+    ) -> Optional[Dict[str, Dict[str, float]]]:
+        if not all(stats_list):
+            return None
+
+        total = counts.sum()
+        weights = counts / total
+        merged = {}
+        for column in stats_list[0]:
+            stats = [s[column] for s in stats_list]
+            means = np.array([s["mean"] for s in stats])
+            stds = np.array([s["std"] for s in stats])
+            mean = float(weights @ means)
+
+            # 표본표준편차(ddof=1) 결합: 그룹 내 제곱합 + 그룹 간 제곱합
+            sum_squares = ((counts - 1) * stds ** 2).sum() + (counts * (means - mean) ** 2).sum()
+            std = float(np.sqrt(sum_squares / (total - 1))) if total > 1 else 0.0
+
+            if sketches and column in sketches:
+                quartiles = TrafficLogPreprocessor.sketch_quartiles(sketches[column])
+            else:
+                # 분위수 요약이 없는 이전 모델: 사분위수를 가중 평균으로 근사
+                quartiles = {
+                    "q1": float(weights @ np.array([s["q1"] for s in stats])),
+                    "q3": float(weights @ np.array([s["q3"] for s in stats]))
+                }
+
+            merged[column] = {
+                "mean": mean,
+                "std": std,
+                "min": min(s["min"] for s in stats),
+                "max": max(s["max"] for s in stats),
+                **quartiles
+            }
+        return merged
+
+    @staticmethod
+    def _merge_detectors(
+        detectors: List[AnomalyDetector],
+        preprocessors: List[TrafficLogPreprocessor],
+        merged_preprocessor: TrafficLogPreprocessor,
+        counts: np.ndarray
+    ) -> AnomalyDetector:
+        forests = [detector.model for detector in detectors]
+        merged_scaler = merged_preprocessor.scaler
+
+        estimators, estimators_features, seeds = [], [], []
+        path_lengths, node_depths = [], []
+        for forest, preprocessor in zip(forests, preprocessors):
+            # x_src = (x_merged * s_merged + m_merged - m_src) / s_src
+            scale = merged_scaler.scale_ / preprocessor.scaler.scale_
+            shift = (merged_scaler.mean_ - preprocessor.scaler.mean_) / preprocessor.scaler.scale_
+
+            for tree, features in zip(forest.estimators_, forest.estimators_features_):
+                tree = copy.deepcopy(tree)
+                nodes = tree.tree_
+                split = nodes.feature >= 0
+                columns = np.asarray(features)[nodes.feature[split]]
+                thresholds = nodes.threshold
+                thresholds[split] = (thresholds[split] - shift[columns]) / scale[columns]
+                estimators.append(tree)
+            estimators_features.extend(forest.estimators_features_)
+            seeds.extend(forest._seeds)
+            path_lengths.extend(forest._average_path_length_per_tree)
+            node_depths.extend(forest._decision_path_lengths)
+
+        forest = copy.deepcopy(forests[0])
+        forest.estimators_ = estimators
+        forest.estimators_features_ = estimators_features
+        forest._seeds = np.asarray(seeds)
+        forest._average_path_length_per_tree = tuple(path_lengths)
+        forest._decision_path_lengths = tuple(node_depths)
+        forest.n_estimators = len(estimators)
+
+        # 경로 길이 정규화 기준: 트리 수 가중 평균 subsample 크기 (보통 모두 256)
+        tree_counts = np.array([len(f.estimators_) for f in forests])
+        max_samples = int(round(np.average([f._max_samples for f in forests], weights=tree_counts)))
+        forest.max_samples_ = max_samples
+        forest._max_samples = max_samples
+
+        params = dict(detectors[0].params)
+        params["n_estimators"] = len(estimators)
+        contaminations = [detector.params.get("contamination", 0.1) for detector in detectors]
+        if all(isinstance(c, (int, float)) for c in contaminations):
+            contamination = float(np.average(contaminations, weights=counts))
+        else:
+            contamination = "auto"
+        params["contamination"] = contamination
+        forest.contamination = contamination
+
+        detector = AnomalyDetector(params)
+        detector.model = forest
+        forest.offset_, detector.calibration = ModelMerger._merge_calibration(
+            detectors, counts, contamination
+        )
+        return detector
+
+    @staticmethod
+    def _merge_calibration(
+        detectors: List[AnomalyDetector],
+        counts: np.ndarray,
+        contamination: Any
+    ):
+        offsets = np.array([detector.model.offset_ for detector in detectors])
+        calibrations = [getattr(detector, "calibration", None) for detector in detectors]
+        if any(c is None for c in calibrations):
+            return float(np.average(offsets, weights=counts)), None
+
+        # 원 점수(score_samples) 분포의 혼합 CDF를 학습 샘플 수로 가중해 구한 뒤 분위수를 다시 뽑음
+        levels = np.linspace(0, 1, CALIBRATION_POINTS)
+        raw_quantiles = [c + offset for c, offset in zip(calibrations, offsets)]
+        grid = np.unique(np.concatenate(raw_quantiles))
+        weights = counts / counts.sum()
+        cdf = sum(w * np.interp(grid, q, np.linspace(0, 1, len(q))) for w, q in zip(weights, raw_quantiles))
+        merged_raw = np.interp(levels, cdf, grid)
+
+        if contamination == "auto":
+            offset = -0.5
+        else:
+            offset = float(np.interp(contamination, cdf, grid))
+        return offset, merged_raw - offset
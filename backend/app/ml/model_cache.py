@@ -0,0 +1,191 @@
+"""
+Process-wide cache of loaded ModelPredictor instances
+
+Loading a model maps its artifact (or unpickles a legacy .pkl) and builds
+the preprocessor and detector, so predictors are kept in memory keyed by
+(model id, file mtime). A rewritten
+model file gets a new mtime and is reloaded on the next lookup.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import config
+from app.ml.predictor import ModelPredictor
+from app.models.ml_model import MLModel
+
+
+class ModelCache:
+    """
+    LRU cache of ModelPredictor instances bounded by total model size
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize model cache
+
+        Args:
+            max_bytes: Maximum total size of cached models; the model file
+                size is used as the in-memory size estimate
+        """
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[int, tuple[float, int, ModelPredictor]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[int, threading.Lock] = {}
+
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._evictions = 0
+
+    def get(self, model_id: int, model_path: str) -> ModelPredictor:
+        """
+        Get the predictor for a model, loading it on a miss
+
+        Args:
+            model_id: Model ID
+            model_path: Path to saved model file
+
+        Returns:
+            Loaded ModelPredictor
+
+        Raises:
+            FileNotFoundError: If the model file does not exist
+        """
+        if not os.path.exists(model_path):
+            self.invalidate(model_id)
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        mtime = os.path.getmtime(model_path)
+
+        predictor = self._lookup(model_id, mtime)
+        if predictor is not None:
+            return predictor
+
+        # 같은 모델을 동시에 여러 번 로드하지 않도록 모델별 잠금
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_id, threading.Lock())
+        with load_lock:
+            predictor = self._lookup(model_id, mtime, count=False)
+            if predictor is not None:
+                return predictor
+
+            predictor = ModelPredictor(model_path)
+            self._store(model_id, mtime, os.path.getsize(model_path), predictor)
+            return predictor
+
+    def invalidate(self, model_id: int) -> None:
+        """
+        Drop a model from the cache
+
+        Args:
+            model_id: Model ID
+        """
+        with self._lock:
+            entry = self._entries.pop(model_id, None)
+            if entry is not None:
+                self._size_bytes -= entry[1]
+
+    def clear(self) -> None:
+        """
+        Drop every cached model
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def preload(self, session_factory: sessionmaker, models: Iterable[str]) -> Dict[str, Any]:
+        """
+        Load models into the cache ahead of the first request
+
+        Args:
+            session_factory: Factory for a database session
+            models: Model IDs or names (a name selects its latest model)
+
+        Returns:
+            Dictionary with loaded model IDs and per-entry errors
+        """
+        loaded, errors = [], {}
+        db = session_factory()
+        try:
+            for ref in models:
+                ml_model = self._resolve(db, ref)
+                if ml_model is None or not ml_model.model_path:
+                    errors[ref] = "Model not found"
+                    continue
+                try:
+                    self.get(ml_model.id, ml_model.model_path)
+                    loaded.append(ml_model.id)
+                except Exception as e:
+                    errors[ref] = str(e)
+        finally:
+            db.close()
+        return {"loaded": loaded, "errors": errors}
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get cache metrics
+
+        Returns:
+            Hit/miss counters, size and cached model IDs
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "model_ids": list(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "loads": self._loads,
+                "evictions": self._evictions
+            }
+
+    def _lookup(self, model_id: int, mtime: float, count: bool = True) -> Optional[ModelPredictor]:
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(model_id)
+                if count:
+                    self._hits += 1
+                return entry[2]
+            if count:
+                self._misses += 1
+            return None
+
+    def _store(self, model_id: int, mtime: float, size: int, predictor: ModelPredictor) -> None:
+        with self._lock:
+            self._loads += 1
+            old = self._entries.pop(model_id, None)
+            if old is not None:
+                self._size_bytes -= old[1]
+
+            # 한도를 넘는 단일 모델은 캐시하지 않음
+            if size > self.max_bytes:
+                return
+
+            while self._entries and self._size_bytes + size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self._evictions += 1
+
+            self._entries[model_id] = (mtime, size, predictor)
+            self._size_bytes += size
+
+    @staticmethod
+    def _resolve(db: Session, ref: str) -> Optional[MLModel]:
+        ref = ref.strip()
+        if ref.isdigit():
+            return db.query(MLModel).filter(MLModel.id == int(ref)).first()
+        return db.query(MLModel).filter(
+            MLModel.name == ref
+        ).order_by(MLModel.created_at.desc()).first()
+
+
+model_cache = ModelCache(max_bytes=config.MODEL_CACHE_MAX_MB * 1024 * 1024)
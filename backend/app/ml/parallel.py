@@ -0,0 +1,143 @@
+"""
+Process-pool scoring for very large analyze batches
+
+Rows are split into shards and scored by worker processes. Workers load a
+model once from its file (keyed by path and mtime) and keep it, so only the
+row shards are sent over the pipe — the forest is never re-pickled per call.
+Flat artifacts are memory-mapped, so workers share the forest's pages.
+"""
+import os
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from app import config
+from app.ml.artifact import ModelArtifact
+
+# Models kept per worker process
+WORKER_CACHE_SIZE = 4
+
+_worker_models: "OrderedDict[tuple[str, float], Any]" = OrderedDict()
+
+
+def _score_shard(model_path: str, mtime: float, X: np.ndarray) -> np.ndarray:
+    key = (model_path, mtime)
+    detector = _worker_models.get(key)
+    if detector is None:
+        detector = ModelArtifact.load(model_path)["detector"]
+        # 워커 안에서는 단일 스레드 (프로세스 수가 곧 병렬도)
+        detector.n_jobs = 1
+        _worker_models[key] = detector
+        while len(_worker_models) > WORKER_CACHE_SIZE:
+            _worker_models.popitem(last=False)
+    else:
+        _worker_models.move_to_end(key)
+    return detector.get_decision_scores(X)
+
+
+class ShardedScorer:
+    """
+    Scores row shards of one model in a pool of worker processes
+    """
+
+    def __init__(self, processes: int, min_rows: int):
+        """
+        Initialize sharded scorer
+
+        Args:
+            processes: Number of worker processes
+            min_rows: Batches smaller than this are scored in-process
+        """
+        self.processes = processes
+        self.min_rows = min_rows
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._sharded_batches = 0
+        self._sharded_rows = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 1
+
+    def should_shard(self, rows: int) -> bool:
+        """
+        Whether a batch is large enough to be worth sharding
+
+        Args:
+            rows: Number of rows in the batch
+
+        Returns:
+            True if the batch should go to the process pool
+        """
+        return self.enabled and rows >= self.min_rows
+
+    def decision_function(self, model_path: str, X: np.ndarray) -> np.ndarray:
+        """
+        Compute raw decision scores by scoring shards in parallel
+
+        Args:
+            model_path: Path of the model file (loaded once per worker)
+            X: Scaled feature matrix
+
+        Returns:
+            Decision scores in row order
+        """
+        mtime = os.path.getmtime(model_path)
+        shards = np.array_split(X, self.processes)
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_score_shard, model_path, mtime, shard)
+            for shard in shards if len(shard)
+        ]
+        scores = np.concatenate([future.result() for future in futures])
+
+        with self._lock:
+            self._sharded_batches += 1
+            self._sharded_rows += len(X)
+        return scores
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get pool metrics
+
+        Returns:
+            Pool size and sharded batch counters
+        """
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "min_rows": self.min_rows,
+                "started": self._executor is not None,
+                "sharded_batches": self._sharded_batches,
+                "sharded_rows": self._sharded_rows
+            }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # 서버 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+
+sharded_scorer = ShardedScorer(
+    processes=config.SCORING_PROCESSES,
+    min_rows=config.SCORING_SHARD_MIN_ROWS
+)
@@ -2,9 +2,12 @@
 Model Prediction Logic
 """
 import os
-import joblib
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.ml.artifact import ModelArtifact, INFO_KEYS
+from app.ml.parallel import sharded_scorer
+from app.ml.preprocessor import LogInput
 
 
 class ModelPredictor:
@@ -22,8 +25,9 @@ class ModelPredictor:
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model file not found: {model_path}")
 
-        # Load model data
-        self.model_data = joblib.load(model_path)
+        # Load model data (flat artifacts are memory-mapped, .pkl is unpickled)
+        self.model_path = model_path
+        self.model_data = ModelArtifact.load(model_path)
         self.detector = self.model_data["detector"]
         self.preprocessor = self.model_data["preprocessor"]
         self.algorithm = self.model_data["algorithm"]
@@ -42,16 +46,23 @@ class ModelPredictor:
         if len(logs) == 0:
             return []
 
-        # Preprocess data
-        X_scaled, X_features = self.preprocessor.transform(logs)
-
-        # Predict
-        predictions, anomaly_scores = self.detector.predict(X_scaled)
+        # Preprocess data and predict
+        predictions, anomaly_scores, X_scaled, X_features = self._score(logs)
 
         # Get training statistics for explanation
         training_stats = self.preprocessor.get_training_stats()
         feature_names = self.preprocessor.get_feature_names()
 
+        # Feature attribution for all anomalies in one batch
+        anomaly_indices = np.flatnonzero(predictions == -1) if training_stats else []
+        importances = {}
+        if len(anomaly_indices):
+            try:
+                batch = self.detector.get_feature_importances(X_scaled, anomaly_indices)
+                importances = dict(zip(anomaly_indices.tolist(), batch))
+            except Exception:
+                importances = {}
+
         # Build results
         results = []
         for i, log in enumerate(logs):
@@ -70,8 +81,7 @@ class ModelPredictor:
                     scaled_values=X_scaled[i],
                     feature_names=feature_names,
                     training_stats=training_stats,
-                    sample_idx=i,
-                    X_scaled=X_scaled
+                    feature_importance=importances.get(i)
                 )
 
             result = {
@@ -85,6 +95,30 @@ class ModelPredictor:
 
         return results
 
+    def score(self, logs: LogInput) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score logs without building per-row results or explanations
+
+        Args:
+            logs: List of log dictionaries or dict of column arrays
+
+        Returns:
+            Tuple of (predictions, anomaly scores) as in AnomalyDetector.predict
+        """
+        predictions, anomaly_scores, _, _ = self._score(logs)
+        return predictions, anomaly_scores
+
+    def _score(self, logs: LogInput) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Any]:
+        X_scaled, X_features = self.preprocessor.transform(logs)
+
+        # 대용량 배치는 프로세스 풀에서 행 샤드 단위로 점수 계산
+        if sharded_scorer.should_shard(len(X_scaled)):
+            decision_scores = sharded_scorer.decision_function(self.model_path, X_scaled)
+            predictions, anomaly_scores = self.detector.predict_from_scores(decision_scores)
+        else:
+            predictions, anomaly_scores = self.detector.predict(X_scaled)
+        return predictions, anomaly_scores, X_scaled, X_features
+
     def _generate_explanation(
         self,
         log: Dict[str, Any],
@@ -92,8 +126,7 @@ class ModelPredictor:
         scaled_values: np.ndarray,
         feature_names: List[str],
         training_stats: Dict[str, Dict[str, float]],
-        sample_idx: int,
-        X_scaled: np.ndarray
+        feature_importance: Optional[np.ndarray] = None
     ) -> str:
         """
         Generate human-readable explanation for anomaly detection
@@ -104,20 +137,18 @@ class ModelPredictor:
             scaled_values: Scaled feature values
             feature_names: List of feature names
             training_stats: Training statistics for each feature
-            sample_idx: Sample index
-            X_scaled: All scaled samples
+            feature_importance: Per-feature importance for this sample
+                (from get_feature_importances)
 
         Returns:
             Korean explanation string
         """
         reasons = []
 
-        # Get feature importance for this sample
-        try:
-            feature_importance = self.detector.get_feature_importance(X_scaled, sample_idx)
+        if feature_importance is not None:
             # Get top 3 most important features
             top_indices = np.argsort(feature_importance)[-3:][::-1]
-        except:
+        else:
             # Fallback: check all features
             top_indices = range(len(feature_names))
 
@@ -203,9 +234,4 @@ class ModelPredictor:
         Returns:
             Model metadata
         """
-        return {
-            "algorithm": self.algorithm,
-            "params": self.params,
-            "trained_at": self.model_data.get("trained_at"),
-            "training_samples": self.model_data.get("training_samples")
-        }
+        return {key: self.model_data.get(key) for key in INFO_KEYS}
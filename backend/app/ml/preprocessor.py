@@ -3,10 +3,18 @@ Data Preprocessor for ML Models
 """
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union, Mapping
 from sklearn.preprocessing import StandardScaler
 
-from app.ml.utils import ip_to_numeric, protocol_to_numeric
+from app import config
+from app.ml.sketches import KLLSketch
+from app.ml.utils import ips_to_numeric, protocols_to_numeric
+
+# Bump when feature_columns or their encoding changes
+FEATURE_SCHEMA_VERSION = 1
+
+# 로그 입력 형식: dict 리스트, 컬럼별 배열, DataFrame, 또는 특성 순서의 2D ndarray
+LogInput = Union[List[Dict[str, Any]], Mapping[str, Any], pd.DataFrame, np.ndarray]
 
 
 class TrafficLogPreprocessor:
@@ -27,40 +35,58 @@ class TrafficLogPreprocessor:
         ]
         # Store training statistics for explanation
         self.training_stats = None
+        # 특성별 KLL 분위수 요약 (모델 병합 시 사분위수를 다시 계산하는 데 사용)
+        self.feature_sketches: Optional[Dict[str, KLLSketch]] = None
 
-    def extract_features(self, logs: List[Dict[str, Any]]) -> pd.DataFrame:
+    def extract_features(self, logs: LogInput) -> pd.DataFrame:
         """
-        Extract features from raw log data
+        Extract features from raw log data (vectorized, no per-row parsing)
 
         Args:
-            logs: List of log dictionaries
+            logs: List of log dictionaries, dict of column arrays, DataFrame,
+                or 2D ndarray already in feature_columns order
 
         Returns:
             DataFrame with extracted features
         """
-        df = pd.DataFrame(logs)
+        if isinstance(logs, np.ndarray):
+            return pd.DataFrame(logs, columns=self.feature_columns).fillna(0)
+
+        # dict 리스트만 DataFrame으로 변환하고, 컬럼 입력은 그대로 사용
+        columns = logs if isinstance(logs, (pd.DataFrame, Mapping)) else pd.DataFrame(logs)
+        encoded = {}
 
+        def needs_encoding(column: str) -> bool:
+            return column not in columns or pd.isna(np.asarray(columns[column])).any()
+
+        # DB에서 읽은 로그는 정수 인코딩 컬럼을 이미 포함하므로 문자열 파싱 생략
         # Convert IP addresses to numeric
-        df["src_ip_numeric"] = df["src_ip"].apply(ip_to_numeric)
-        df["dst_ip_numeric"] = df["dst_ip"].apply(ip_to_numeric)
+        if needs_encoding("src_ip_numeric"):
+            encoded["src_ip_numeric"] = ips_to_numeric(np.asarray(columns["src_ip"], dtype=object))
+        if needs_encoding("dst_ip_numeric"):
+            encoded["dst_ip_numeric"] = ips_to_numeric(np.asarray(columns["dst_ip"], dtype=object))
 
         # Convert protocol to numeric
-        df["protocol_numeric"] = df["protocol"].apply(protocol_to_numeric)
+        if needs_encoding("protocol_numeric"):
+            encoded["protocol_numeric"] = protocols_to_numeric(np.asarray(columns["protocol"], dtype=object))
 
         # Select feature columns
-        feature_df = df[self.feature_columns].copy()
+        feature_df = pd.DataFrame({
+            col: encoded[col] if col in encoded else np.asarray(columns[col])
+            for col in self.feature_columns
+        })
 
         # Handle missing values
         feature_df = feature_df.fillna(0)
 
         return feature_df
 
-    def fit_transform(self, logs: List[Dict[str, Any]]) -> Tuple[np.ndarray, pd.DataFrame]:
+    def fit_transform(self, logs: LogInput) -> Tuple[np.ndarray, pd.DataFrame]:
         """
         Fit scaler and transform data for training
 
         Args:
-            logs: List of log dictionaries
+            logs: Log data (see extract_features)
 
         Returns:
             Tuple of (scaled features, original feature dataframe)
@@ -69,26 +95,44 @@ class TrafficLogPreprocessor:
         scaled_features = self.scaler.fit_transform(feature_df)
 
         # Store training statistics for explanation generation
+        # (quartiles come from mergeable sketches instead of sorting each column)
+        self.feature_sketches = {
+            col: KLLSketch.from_values(config.QUANTILE_SKETCH_K, feature_df[col].to_numpy())
+            for col in self.feature_columns
+        }
         self.training_stats = {
             col: {
                 "mean": float(feature_df[col].mean()),
                 "std": float(feature_df[col].std()),
                 "min": float(feature_df[col].min()),
                 "max": float(feature_df[col].max()),
-                "q1": float(feature_df[col].quantile(0.25)),
-                "q3": float(feature_df[col].quantile(0.75))
+                **self.sketch_quartiles(self.feature_sketches[col])
             }
             for col in self.feature_columns
         }
 
         return scaled_features, feature_df
 
-    def transform(self, logs: List[Dict[str, Any]]) -> Tuple[np.ndarray, pd.DataFrame]:
+    @staticmethod
+    def sketch_quartiles(sketch: KLLSketch) -> Dict[str, float]:
+        """
+        Quartile entries of training_stats from a quantile sketch
+
+        Args:
+            sketch: Sketch of one feature column
+
+        Returns:
+            Dictionary with q1 and q3
+        """
+        q1, q3 = sketch.quantiles([0.25, 0.75])
+        return {"q1": q1, "q3": q3}
+
+    def transform(self, logs: LogInput) -> Tuple[np.ndarray, pd.DataFrame]:
         """
         Transform data using fitted scaler (for prediction)
 
         Args:
-            logs: List of log dictionaries
+            logs: Log data (see extract_features)
 
         Returns:
             Tuple of (scaled features, original feature dataframe)
@@ -98,46 +142,64 @@ class TrafficLogPreprocessor:
 
         return scaled_features, feature_df
 
-    def compute_statistics(self, logs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def compute_statistics(self, logs: LogInput) -> Dict[str, Any]:
         """
         Compute statistical features from logs
 
         Args:
-            logs: List of log dictionaries
+            logs: List of log dictionaries or dict of column arrays; top
+                IPs and the protocol distribution are only computed when the
+                string src_ip/dst_ip/protocol columns are present (the
+                *_numeric encodings lose IPv6 addresses, hostnames and
+                unmapped or lowercase protocols)
 
         Returns:
             Dictionary of statistical metrics
         """
-        df = pd.DataFrame(logs)
+        columns = logs if isinstance(logs, (pd.DataFrame, Mapping)) else pd.DataFrame(logs)
 
-        if len(df) == 0:
+        if "packets" not in columns or len(columns["packets"]) == 0:
             return {}
 
+        packets = pd.Series(columns["packets"])
+        bytes_ = pd.Series(columns["bytes"])
+
         stats = {
-            "total_logs": len(df),
-            "packets": {
-                "mean": float(df["packets"].mean()),
-                "std": float(df["packets"].std()),
-                "min": int(df["packets"].min()),
-                "max": int(df["packets"].max()),
-                "median": float(df["packets"].median()),
-                "threshold_upper": float(df["packets"].mean() + 2 * df["packets"].std())
-            },
-            "bytes": {
-                "mean": float(df["bytes"].mean()),
-                "std": float(df["bytes"].std()),
-                "min": int(df["bytes"].min()),
-                "max": int(df["bytes"].max()),
-                "median": float(df["bytes"].median()),
-                "threshold_upper": float(df["bytes"].mean() + 2 * df["bytes"].std())
-            },
-            "top_src_ips": df["src_ip"].value_counts().head(10).to_dict(),
-            "top_dst_ips": df["dst_ip"].value_counts().head(10).to_dict(),
-            "protocol_distribution": df["protocol"].value_counts().to_dict()
+            "total_logs": len(packets),
+            "packets": self._describe(packets),
+            "bytes": self._describe(bytes_),
+            "top_src_ips": self._top_ips(columns, "src_ip"),
+            "top_dst_ips": self._top_ips(columns, "dst_ip"),
+            "protocol_distribution": self._protocol_distribution(columns)
         }
 
         return stats
 
+    @staticmethod
+    def _describe(series: pd.Series) -> Dict[str, Any]:
+        mean = float(series.mean())
+        std = float(series.std())
+        return {
+            "mean": mean,
+            "std": std,
+            "min": int(series.min()),
+            "max": int(series.max()),
+            "median": float(series.median()),
+            "threshold_upper": float(mean + 2 * std)
+        }
+
+    @staticmethod
+    def _top_ips(columns: Any, column: str, limit: int = 10) -> Dict[str, int]:
+        if column not in columns:
+            return {}
+        return pd.Series(columns[column]).value_counts().head(limit).to_dict()
+
+    @staticmethod
+    def _protocol_distribution(columns: Any) -> Dict[str, int]:
+        if "protocol" not in columns:
+            return {}
+        return pd.Series(columns["protocol"]).value_counts().to_dict()
+
     def get_feature_names(self) -> List[str]:
         """
         Get feature column names
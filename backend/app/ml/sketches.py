@@ -0,0 +1,374 @@
+"""
+Mergeable streaming summaries for rollup buckets and model statistics
+
+SpaceSaving keeps at most ``capacity`` (item, count, error) counters. Counts
+never underestimate: the true frequency of a kept item lies in
+[count - error, count], and an item that is not kept occurred at most
+``floor`` times. Summaries merge by adding counters (a missing item is
+charged the other summary's floor) and keeping the largest ``capacity``,
+which preserves both guarantees, so minute summaries combine into hour, day
+and arbitrary range summaries.
+
+KLLSketch is a KLL quantile sketch: a stack of compactors where an item on
+level h stands for 2^h values. A full level is sorted and every other item
+is promoted, so memory stays around 3k values and the rank error is about
+1.7/k of the count regardless of how many sketches were merged. While
+nothing has been compacted the sketch holds every value and quantiles are
+exact.
+"""
+import heapq
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter summary
+    """
+
+    def __init__(self, capacity: int, counters: Optional[Dict[str, List[int]]] = None, total: int = 0):
+        """
+        Args:
+            capacity: Maximum number of counters kept
+            counters: Existing counters (item -> [count, error])
+            total: Number of occurrences summarized
+        """
+        self.capacity = capacity
+        self.counters = counters if counters is not None else {}
+        self.total = total
+
+    @classmethod
+    def from_counts(cls, capacity: int, counts: Mapping[Any, int]) -> "SpaceSaving":
+        """
+        Build a summary from exact item counts
+
+        Args:
+            capacity: Maximum number of counters kept
+            counts: Exact occurrences per item (items are stored as strings)
+
+        Returns:
+            SpaceSaving summary
+        """
+        summary = cls(capacity, {str(item): [int(count), 0] for item, count in counts.items()})
+        summary.total = sum(count for count, _ in summary.counters.values())
+        summary._truncate()
+        return summary
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        """
+        Restore a summary serialized with to_dict
+
+        Args:
+            data: Serialized summary
+
+        Returns:
+            SpaceSaving summary
+        """
+        return cls(data["capacity"], {item: list(counter) for item, counter in data["counters"].items()}, data["total"])
+
+    @classmethod
+    def merge_all(cls, capacity: int, summaries: List["SpaceSaving"]) -> "SpaceSaving":
+        """
+        Merge many summaries in one pass
+
+        Equivalent to pairwise merge without truncating in between, so the
+        bounds are at least as tight and each counter is touched once.
+
+        Args:
+            capacity: Maximum number of counters kept
+            summaries: Summaries to merge
+
+        Returns:
+            New SpaceSaving summary
+        """
+        # 요약 i에 없는 항목은 floor_i로 계산: 전체 floor 합 + (있는 요약에서 count - floor)
+        floors = [summary.floor for summary in summaries]
+        base = sum(floors)
+        merged: Dict[str, List[int]] = {}
+        for summary, floor in zip(summaries, floors):
+            for item, (count, error) in summary.counters.items():
+                counter = merged.get(item)
+                if counter is None:
+                    counter = merged[item] = [base, base]
+                counter[0] += count - floor
+                counter[1] += error - floor
+
+        result = cls(capacity, merged, sum(summary.total for summary in summaries))
+        result._truncate()
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the summary (JSON compatible)
+
+        Returns:
+            Dictionary with capacity, total and counters
+        """
+        return {"capacity": self.capacity, "total": self.total, "counters": self.counters}
+
+    @property
+    def floor(self) -> int:
+        """
+        Upper bound on the count of any item that is not kept
+        """
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counters.values())
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Merge another summary into this one (in place)
+
+        Args:
+            other: Summary to merge
+
+        Returns:
+            self
+        """
+        floor, other_floor = self.floor, other.floor
+        merged = {}
+        for item in self.counters.keys() | other.counters.keys():
+            count, error = self.counters.get(item, (floor, floor))
+            other_count, other_error = other.counters.get(item, (other_floor, other_floor))
+            merged[item] = [count + other_count, error + other_error]
+
+        self.counters = merged
+        self.total += other.total
+        self.capacity = max(self.capacity, other.capacity)
+        self._truncate()
+        return self
+
+    def top(self, k: int) -> List[Tuple[str, int, int]]:
+        """
+        Most frequent items
+
+        Args:
+            k: Number of items
+
+        Returns:
+            List of (item, count upper bound, error), most frequent first
+        """
+        ranked = sorted(self.counters.items(), key=lambda entry: (-entry[1][0], entry[0]))
+        return [(item, count, error) for item, (count, error) in ranked[:k]]
+
+    def _truncate(self) -> None:
+        if len(self.counters) <= self.capacity:
+            return
+        # 동률은 항목 값으로 정렬해 결과를 결정적으로 유지
+        ranked = heapq.nsmallest(self.capacity, self.counters.items(), key=lambda entry: (-entry[1][0], entry[0]))
+        self.counters = dict(ranked)
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over numeric values
+    """
+
+    # 위 단계로 갈수록 compactor 용량이 2/3씩 커짐 (최상위 = k)
+    CAPACITY_RATIO = 2 / 3
+    MIN_CAPACITY = 2
+
+    # 압축 시 남길 홀/짝 위치를 고르는 결정적 해시 (Knuth 곱셈 해시)
+    COIN_MULTIPLIER = 2654435761
+
+    def __init__(self, k: int):
+        """
+        Args:
+            k: Accuracy parameter (capacity of the top compactor)
+        """
+        self.k = k
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+
+    @classmethod
+    def from_values(cls, k: int, values: Any) -> "KLLSketch":
+        """
+        Build a sketch from an array of values
+
+        Args:
+            k: Accuracy parameter
+            values: Numeric values
+
+        Returns:
+            KLLSketch
+        """
+        sketch = cls(k)
+        sketch.update(values)
+        return sketch
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KLLSketch":
+        """
+        Restore a sketch serialized with to_dict
+
+        Args:
+            data: Serialized sketch
+
+        Returns:
+            KLLSketch
+        """
+        sketch = cls(data["k"])
+        sketch.count = data["count"]
+        sketch.min, sketch.max = data["min"], data["max"]
+        sketch.compactors = [np.asarray(items, dtype=np.float64) for items in data["compactors"]]
+        return sketch
+
+    @classmethod
+    def merge_all(cls, k: int, sketches: Sequence["KLLSketch"]) -> "KLLSketch":
+        """
+        Merge many sketches, compacting once at the end
+
+        Args:
+            k: Accuracy parameter of the result
+            sketches: Sketches to merge
+
+        Returns:
+            New KLLSketch
+        """
+        merged = cls(max([k] + [sketch.k for sketch in sketches]))
+        height = max([1] + [len(sketch.compactors) for sketch in sketches])
+        levels: List[List[np.ndarray]] = [[] for _ in range(height)]
+        for sketch in sketches:
+            if not sketch.count:
+                continue
+            merged.count += sketch.count
+            merged.min = sketch.min if merged.min is None else min(merged.min, sketch.min)
+            merged.max = sketch.max if merged.max is None else max(merged.max, sketch.max)
+            for level, items in enumerate(sketch.compactors):
+                levels[level].append(items)
+
+        merged.compactors = [np.concatenate(items) if items else np.empty(0) for items in levels]
+        merged._compress()
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the sketch (JSON compatible, integral values stored as int)
+
+        Returns:
+            Dictionary with k, count, min, max and compactors
+        """
+        def encode(items: np.ndarray) -> List[Any]:
+            if np.all(np.mod(items, 1) == 0):
+                return items.astype(np.int64).tolist()
+            return items.tolist()
+
+        return {
+            "k": self.k,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "compactors": [encode(items) for items in self.compactors]
+        }
+
+    def update(self, values: Any) -> "KLLSketch":
+        """
+        Add a batch of values (e.g. one training chunk)
+
+        Args:
+            values: Numeric values
+
+        Returns:
+            self
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return self
+
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        # 큰 배치는 k개씩 나눠 넣어야 아래 단계가 비지 않고 정확도가 유지됨
+        for start in range(0, len(values), self.k):
+            chunk = values[start:start + self.k]
+            self.count += len(chunk)
+            self.compactors[0] = np.concatenate([self.compactors[0], chunk])
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Merge another sketch into this one (in place)
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            self
+        """
+        merged = KLLSketch.merge_all(self.k, [self, other])
+        self.__dict__.update(merged.__dict__)
+        return self
+
+    @property
+    def exact(self) -> bool:
+        """
+        True while every value is still held (no compaction yet)
+        """
+        return len(self.compactors) == 1
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """
+        Estimate quantiles
+
+        Exact sketches use linear interpolation like numpy/pandas; compacted
+        ones interpolate the weighted empirical CDF.
+
+        Args:
+            qs: Quantile levels in [0, 1]
+
+        Returns:
+            List of quantile values (None for an empty sketch)
+        """
+        if not self.count:
+            return [None for _ in qs]
+        if self.exact:
+            return [float(value) for value in np.quantile(self.compactors[0], qs)]
+
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self.compactors)
+        ])
+        order = np.argsort(items, kind="stable")
+        items, weights = items[order], weights[order]
+        positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+        # 양 끝은 실제 최소/최대값으로 고정
+        positions = np.concatenate([[0.0], positions, [1.0]])
+        items = np.concatenate([[self.min], items, [self.max]])
+        return [float(value) for value in np.interp(qs, positions, items)]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate one quantile
+
+        Args:
+            q: Quantile level in [0, 1]
+
+        Returns:
+            Quantile value (None for an empty sketch)
+        """
+        return self.quantiles([q])[0]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(self.MIN_CAPACITY, int(np.ceil(self.k * self.CAPACITY_RATIO ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+
+                # 정렬 후 한 칸씩 건너 위 단계로 올림 (홀수 개면 하나는 이 단계에 남김)
+                items = np.sort(items)
+                keep = len(items) % 2
+                offset = ((self.count + level) * self.COIN_MULTIPLIER >> 16) & 1
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], items[keep + offset::2]])
+                self.compactors[level] = items[:keep]
+            level += 1
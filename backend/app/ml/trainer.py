@@ -2,12 +2,13 @@
 Model Training Logic
 """
 import os
-import joblib
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, Callable, Optional
 from datetime import datetime
 
 from app.ml.anomaly_detector import AnomalyDetector
-from app.ml.preprocessor import TrafficLogPreprocessor
+from app.ml.artifact import ModelArtifact
+from app.ml.preprocessor import TrafficLogPreprocessor, LogInput, FEATURE_SCHEMA_VERSION
 from app.ml.utils import generate_model_filename, get_model_directory, validate_params
 
 
@@ -23,24 +24,32 @@ class ModelTrainer:
 
     def train(
         self,
-        logs: List[Dict[str, Any]],
+        logs: LogInput,
         algorithm: str,
         params: Dict[str, Any],
-        model_name: str
+        model_name: str,
+        extra: Optional[Dict[str, Any]] = None,
+        progress: Optional[Callable[[float, str], None]] = None,
+        n_jobs: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Train anomaly detection model
 
         Args:
-            logs: Training data (list of log dictionaries)
+            logs: Training data (list of log dictionaries or dict of column arrays)
             algorithm: Algorithm name (e.g., "isolation_forest")
             params: Model parameters
             model_name: Name for the model
+            extra: Additional artifact keys (e.g. training_sample)
+            progress: Optional callback(fraction, stage), called after the
+                fit and before the artifact is written; an exception raised
+                by it (e.g. job cancellation) leaves no artifact behind
+            n_jobs: Threads for fitting and scoring (defaults to ML_N_JOBS)
 
         Returns:
             Training result dictionary
         """
-        if len(logs) == 0:
+        if self._count_rows(logs) == 0:
             raise ValueError("No training data provided")
 
         # Validate and get parameters
@@ -48,15 +57,20 @@ class ModelTrainer:
 
         # Initialize detector
         if algorithm == "isolation_forest":
-            self.detector = AnomalyDetector(validated_params)
+            self.detector = AnomalyDetector(validated_params, n_jobs=n_jobs)
         else:
             raise ValueError(f"Unsupported algorithm: {algorithm}")
 
         # Preprocess data
+        start = time.perf_counter()
         X_scaled, X_features = self.preprocessor.fit_transform(logs)
 
         # Train model
         self.detector.train(X_scaled)
+        training_duration_ms = round((time.perf_counter() - start) * 1000, 3)
+
+        if progress:
+            progress(0.8, "saving")
 
         # Save model
         model_dir = get_model_directory()
@@ -70,16 +84,22 @@ class ModelTrainer:
             "algorithm": algorithm,
             "params": validated_params,
             "trained_at": datetime.utcnow().isoformat(),
-            "training_samples": len(logs)
+            "training_samples": len(X_scaled),
+            "feature_schema_version": FEATURE_SCHEMA_VERSION,
+            "training_duration_ms": training_duration_ms,
+            **(extra or {})
         }
 
-        joblib.dump(model_data, self.model_path)
+        ModelArtifact.save(self.model_path, model_data)
 
         return {
             "model_path": self.model_path,
             "algorithm": algorithm,
             "params": validated_params,
-            "training_samples": len(logs),
+            "trained_at": model_data["trained_at"],
+            "training_samples": len(X_scaled),
+            "feature_schema_version": FEATURE_SCHEMA_VERSION,
+            "training_duration_ms": training_duration_ms,
             "status": "success"
         }
 
@@ -91,3 +111,10 @@ class ModelTrainer:
             Model file path
         """
         return self.model_path
+
+    @staticmethod
+    def _count_rows(logs: LogInput) -> int:
+        # 컬럼 딕셔너리는 첫 컬럼 길이, 그 외(리스트/DataFrame/ndarray)는 len()
+        if isinstance(logs, dict):
+            return len(next(iter(logs.values()))) if logs else 0
+        return len(logs)
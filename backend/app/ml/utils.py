@@ -3,8 +3,34 @@ ML Utility Functions
 """
 import os
 import hashlib
+import uuid
+import ipaddress
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Longest dotted-quad string ("255.255.255.255")
+MAX_IPV4_LENGTH = 15
+
+# Rows parsed per block in ips_to_numeric (bounds the character matrix size)
+IP_PARSE_CHUNK_SIZE = 1 << 20
+
+# Deduplicate before parsing when the leading sample is at most 80% unique
+IP_DEDUP_SAMPLE_SIZE = 10000
+IP_DEDUP_MAX_UNIQUE_RATIO = 0.8
+
+# IANA protocol numbers (unknown protocols map to 0)
+PROTOCOL_MAP = {
+    "TCP": 6,
+    "UDP": 17,
+    "ICMP": 1,
+    "IGMP": 2,
+    "ESP": 50,
+    "AH": 51
+}
+PROTOCOL_NAMES = {code: name for name, code in PROTOCOL_MAP.items()}
 
 
 def generate_model_filename(name: str, algorithm: str) -> str:
@@ -19,8 +45,9 @@ def generate_model_filename(name: str, algorithm: str) -> str:
         Unique filename
     """
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    hash_str = hashlib.md5(f"{name}{timestamp}".encode()).hexdigest()[:8]
-    return f"{algorithm}_{name}_{timestamp}_{hash_str}.pkl"
+    # 같은 이름으로 1초 안에 여러 번 저장해도(증분 갱신 등) 파일명이 겹치지 않도록 난수 포함
+    hash_str = hashlib.md5(f"{name}{timestamp}{uuid.uuid4()}".encode()).hexdigest()[:8]
+    return f"{algorithm}_{name}_{timestamp}_{hash_str}.model"
 
 
 def get_model_directory() -> str:
@@ -65,6 +92,10 @@ def validate_params(algorithm: str, params: Dict[str, Any]) -> Dict[str, Any]:
     if params:
         validated.update(params)
 
+    # 코어 수는 실행 환경 설정(ML_N_JOBS)이므로 모델 파라미터로 저장하지 않음
+    if "n_jobs" in validated:
+        raise ValueError("n_jobs is not a model parameter; set ML_N_JOBS instead")
+
     return validated
 
 
@@ -95,12 +126,147 @@ def protocol_to_numeric(protocol: str) -> int:
     Returns:
         Numeric representation
     """
-    protocol_map = {
-        "TCP": 6,
-        "UDP": 17,
-        "ICMP": 1,
-        "IGMP": 2,
-        "ESP": 50,
-        "AH": 51
-    }
-    return protocol_map.get(protocol.upper(), 0)
+    return PROTOCOL_MAP.get(protocol.upper(), 0)
+
+
+def numeric_to_ip(value: int) -> str:
+    """
+    Convert numeric value back to IP address string
+
+    Args:
+        value: Numeric representation from ip_to_numeric
+
+    Returns:
+        Dotted-quad string (or the number itself if out of IPv4 range)
+    """
+    if 0 <= value <= 0xFFFFFFFF:
+        return str(ipaddress.IPv4Address(value))
+    return str(value)
+
+
+def numeric_to_protocol(code: int) -> str:
+    """
+    Convert protocol number back to protocol name
+
+    Args:
+        code: Protocol number from protocol_to_numeric
+
+    Returns:
+        Protocol name ("UNKNOWN" for 0 / unmapped codes)
+    """
+    return PROTOCOL_NAMES.get(code, "UNKNOWN")
+
+
+def ipv4_cidr_range(cidr: str) -> Tuple[int, int]:
+    """
+    Convert IPv4 CIDR notation to an inclusive numeric range
+
+    Args:
+        cidr: CIDR string (e.g., "10.0.0.0/8") or a single address
+
+    Returns:
+        Tuple of (first address, last address) as numeric values
+
+    Raises:
+        ValueError: If cidr is not a valid IPv4 network
+    """
+    network = ipaddress.IPv4Network(cidr, strict=False)
+    return int(network.network_address), int(network.broadcast_address)
+
+
+def ips_to_numeric(ips: Any) -> np.ndarray:
+    """
+    Vectorized ip_to_numeric for an array of IP address strings
+
+    Dotted-quad values are parsed with NumPy arithmetic on the character
+    matrix; anything else falls back to ip_to_numeric so results are identical.
+
+    Args:
+        ips: Sequence or array of IP address strings
+
+    Returns:
+        int64 array of numeric representations
+    """
+    values = np.asarray(ips, dtype=object)
+
+    # 실제 트래픽은 IP 중복이 많으므로, 앞부분 표본에서 중복이 충분하면 고유값만 파싱 후 펼침
+    if len(values) > IP_DEDUP_SAMPLE_SIZE:
+        sample_unique = len(pd.unique(values[:IP_DEDUP_SAMPLE_SIZE]))
+        if sample_unique <= IP_DEDUP_SAMPLE_SIZE * IP_DEDUP_MAX_UNIQUE_RATIO:
+            codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            return ips_to_numeric(np.asarray(uniques, dtype=object))[codes]
+
+    result = np.zeros(len(values), dtype=np.int64)
+
+    invalid = []
+    for start in range(0, len(values), IP_PARSE_CHUNK_SIZE):
+        chunk = values[start:start + IP_PARSE_CHUNK_SIZE]
+        parsed, valid = _parse_dotted_quads(chunk)
+        result[start:start + len(chunk)] = parsed
+        invalid.append(np.flatnonzero(~valid) + start)
+
+    fallback = np.concatenate(invalid) if invalid else np.array([], dtype=np.int64)
+    if len(fallback):
+        fallback_values = [ip_to_numeric(v) for v in values[fallback]]
+        try:
+            result[fallback] = fallback_values
+        except OverflowError:
+            # 비정상적으로 큰 옥텟: apply 경로와 동일하게 Python int 유지
+            result = result.astype(object)
+            result[fallback] = fallback_values
+
+    return result
+
+
+def _parse_dotted_quads(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(values)
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        is_str = np.ones(n, dtype=bool)
+    else:
+        is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=n)
+        values = np.where(is_str, values, "")
+
+    # 15자를 넘는 값은 잘리지만 원래 길이로 걸러냄
+    # (NumPy 유니코드 배열은 끝의 NUL 문자도 버리므로 길이를 함께 비교)
+    text = values.astype(f"U{MAX_IPV4_LENGTH}")
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=n)
+    valid = is_str & (lengths <= MAX_IPV4_LENGTH) & (lengths == np.char.str_len(text))
+    if not valid.any():
+        return np.zeros(n, dtype=np.int64), valid
+
+    # (n, 15) 코드포인트 행렬: 0은 패딩
+    chars = text.view(np.uint32).reshape(n, MAX_IPV4_LENGTH)
+    is_digit = (chars >= 48) & (chars <= 57)
+    is_dot = chars == 46
+    is_pad = chars == 0
+
+    # 숫자와 점만 허용, 점 3개, 패딩은 끝에만, 빈 옥텟 및 4자리 이상 옥텟 금지
+    next_is_sep = np.concatenate([(is_dot | is_pad)[:, 1:], np.ones((n, 1), dtype=bool)], axis=1)
+    valid &= np.all(is_digit | is_dot | is_pad, axis=1)
+    valid &= np.count_nonzero(is_dot, axis=1) == 3
+    valid &= ~np.any(is_pad[:, :-1] & ~is_pad[:, 1:], axis=1)
+    valid &= ~is_dot[:, 0] & ~np.any(is_dot & next_is_sep, axis=1)
+    valid &= ~np.any(is_digit[:, :-3] & is_digit[:, 1:-2] & is_digit[:, 2:-1] & is_digit[:, 3:], axis=1)
+
+    result = np.zeros(n, dtype=np.int64)
+    if valid.any():
+        # 검증된 값은 정확히 4개의 숫자를 가지므로 한 번에 파싱
+        joined = ".".join(values[valid].tolist())
+        octets = np.fromstring(joined, dtype=np.int64, sep=".").reshape(-1, 4)
+        result[valid] = (octets[:, 0] << 24) + (octets[:, 1] << 16) + (octets[:, 2] << 8) + octets[:, 3]
+    return result, valid
+
+
+def protocols_to_numeric(protocols: Any) -> np.ndarray:
+    """
+    Vectorized protocol_to_numeric using a categorical lookup
+
+    Args:
+        protocols: Sequence or array of protocol names
+
+    Returns:
+        int64 array of protocol numbers
+    """
+    codes, uniques = pd.factorize(np.asarray(protocols, dtype=object), use_na_sentinel=False)
+    lookup = np.array([protocol_to_numeric(p) for p in uniques], dtype=np.int64)
+    return lookup[codes]
@@ -1,6 +1,16 @@
 from app.models.example import Example
 from app.models.traffic_log import TrafficLog
+from app.models.traffic_rollup import (
+    TrafficRollupMinute, TrafficRollupHour, TrafficRollupDay, TrafficRollupSketch, TrafficRollupSketchWatermark
+)
 from app.models.ml_model import MLModel
 from app.models.alert import Alert
+from app.models.import_watermark import ImportWatermark
+from app.models.job import Job
+from app.models.cold_partition import ColdPartition
 
-__all__ = ["Example", "TrafficLog", "MLModel", "Alert"]
+__all__ = [
+    "Example", "TrafficLog", "TrafficRollupMinute", "TrafficRollupHour", "TrafficRollupDay",
+    "TrafficRollupSketch", "TrafficRollupSketchWatermark", "MLModel", "Alert", "ImportWatermark", "Job",
+    "ColdPartition"
+]
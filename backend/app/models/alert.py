@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -18,3 +18,8 @@ class Alert(Base):
     # Relationships
     traffic_log = relationship("TrafficLog", backref="alerts")
     ml_model = relationship("MLModel", backref="alerts")
+
+    __table_args__ = (
+        # 범위 스캔 재실행 시 이미 알림이 있는 로그를 건너뛰기 위한 조회
+        Index('idx_alert_traffic_log_model', 'traffic_log_id', 'ml_model_id'),
+    )
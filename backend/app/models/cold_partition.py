@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from app.database import Base
+
+
+class ColdPartition(Base):
+    __tablename__ = "cold_partitions"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    day = Column(String, nullable=False, index=True)  # 파티션 날짜 'YYYY-MM-DD'
+    path = Column(String, nullable=False, unique=True)  # COLD_TIER_DIR 기준 Parquet 파일 경로
+    row_count = Column(Integer, nullable=False)
+    first_id = Column(Integer, nullable=False)  # 옮긴 traffic_logs id 범위
+    last_id = Column(Integer, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from app.database import Base
+
+
+class ImportWatermark(Base):
+    __tablename__ = "import_watermarks"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    source_file = Column(String, nullable=False, unique=True)  # logcollector DB 파일명
+    last_source_id = Column(Integer, nullable=False, default=0)  # 마지막으로 가져온 원본 id
+    imported_rows = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, JSON, Index
+from datetime import datetime
+
+from app.database import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    job_type = Column(String, nullable=False)  # train, scan, tier
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    params = Column(JSON, nullable=False)
+    progress = Column(Float, nullable=False, default=0.0)  # 0-1
+    message = Column(String, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("idx_jobs_status_created_at", "status", "created_at"),
+    )
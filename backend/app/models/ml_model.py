@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, JSON, ForeignKey
 from datetime import datetime
 
 from app.database import Base
@@ -14,3 +14,15 @@ class MLModel(Base):
     model_path = Column(String, nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     is_merged = Column(Boolean, nullable=False, default=False)
+    version = Column(Integer, nullable=False, default=1)  # 증분 갱신마다 1씩 증가
+    parent_model_id = Column(Integer, ForeignKey("ml_models.id"), nullable=True)  # 갱신 전 모델
+
+    # 아티팩트 메타데이터 (목록/상세 조회 시 모델 파일을 읽지 않도록 학습 시점에 저장)
+    algorithm = Column(String, nullable=True)
+    params = Column(JSON, nullable=True)
+    trained_at = Column(DateTime, nullable=True)
+    training_samples = Column(Integer, nullable=True)
+    training_sample = Column(JSON, nullable=True)  # 부분 표본 학습 시 표본 정보
+    artifact_size = Column(Integer, nullable=True)  # bytes
+    feature_schema_version = Column(Integer, nullable=True)
+    training_duration_ms = Column(Float, nullable=True)
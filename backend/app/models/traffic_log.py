@@ -1,7 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, Index
 from datetime import datetime
 
 from app.database import Base
+from app.ml.utils import ip_to_numeric, protocol_to_numeric
+
+
+def _ip_default(column: str):
+    def default(context):
+        return ip_to_numeric(context.get_current_parameters()[column])
+    return default
+
+
+def _protocol_default(context):
+    return protocol_to_numeric(context.get_current_parameters()["protocol"])
 
 
 class TrafficLog(Base):
@@ -18,8 +29,18 @@ class TrafficLog(Base):
     timestamp = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
     cpu_id = Column(Integer, nullable=True, default=0)
 
+    # 정수 인코딩 컬럼: 수집 시 자동 계산 (ML 특성 및 IP 범위/CIDR 조회용)
+    src_ip_numeric = Column(Integer, nullable=True, default=_ip_default("src_ip"))
+    dst_ip_numeric = Column(Integer, nullable=True, default=_ip_default("dst_ip"))
+    protocol_numeric = Column(SmallInteger, nullable=True, default=_protocol_default)
+
+    # 문자열 IP 인덱스는 IPv4가 아닌 값(IPv6 등) 조회용으로 유지
     # 복합 인덱스: 시간 기반 쿼리 최적화
+    # (SQLite 인덱스는 끝에 rowid(id)를 포함하므로 (timestamp, id) 키셋 페이지는 ix_traffic_logs_timestamp 사용)
     __table_args__ = (
-        Index('idx_timestamp_src_ip', 'timestamp', 'src_ip'),
-        Index('idx_timestamp_dst_ip', 'timestamp', 'dst_ip'),
+        Index('idx_timestamp_src_ip_numeric', 'timestamp', 'src_ip_numeric'),
+        Index('idx_timestamp_dst_ip_numeric', 'timestamp', 'dst_ip_numeric'),
+        # IP 일치/CIDR 조회 + 최신순 페이지: 정렬 없이 (ip, timestamp, id) 순으로 탐색
+        Index('idx_src_ip_numeric_timestamp', 'src_ip_numeric', 'timestamp'),
+        Index('idx_dst_ip_numeric_timestamp', 'dst_ip_numeric', 'timestamp'),
     )
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON
+
+from app.database import Base
+
+
+class _RollupColumns:
+    # 버킷 시작 시각 + 프로토콜(저장된 문자열 그대로)별 집계 (수집 시 갱신)
+    bucket_start = Column(DateTime, primary_key=True)
+    protocol = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    packets_sum = Column(Integer, nullable=False, default=0)
+    packets_sum_sq = Column(Float, nullable=False, default=0.0)  # 정수 overflow 방지를 위해 REAL
+    packets_min = Column(Integer, nullable=False)
+    packets_max = Column(Integer, nullable=False)
+    bytes_sum = Column(Integer, nullable=False, default=0)
+    bytes_sum_sq = Column(Float, nullable=False, default=0.0)
+    bytes_min = Column(Integer, nullable=False)
+    bytes_max = Column(Integer, nullable=False)
+
+
+class TrafficRollupMinute(_RollupColumns, Base):
+    __tablename__ = "traffic_rollup_minute"
+
+
+class TrafficRollupHour(_RollupColumns, Base):
+    __tablename__ = "traffic_rollup_hour"
+
+
+class TrafficRollupDay(_RollupColumns, Base):
+    __tablename__ = "traffic_rollup_day"
+
+
+class TrafficRollupSketch(Base):
+    __tablename__ = "traffic_rollup_sketch"
+
+    # 버킷 단위(minute/hour/day) + 시작 시각 + 요약 대상(src_ip, dst_ip, dst_port)별 병합 가능한 요약
+    level = Column(String(8), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    name = Column(String(16), primary_key=True)
+    data = Column(JSON, nullable=False)  # app.ml.sketches 요약의 to_dict()
+
+
+class TrafficRollupSketchWatermark(Base):
+    __tablename__ = "traffic_rollup_sketch_watermark"
+
+    # 요약에 반영된 마지막 traffic_logs id (단일 행, id=1). 이후 행은 반영 대기 중
+    id = Column(Integer, primary_key=True)
+    last_log_id = Column(Integer, nullable=False, default=0)
@@ -1,16 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from typing import Any, List, Literal, Optional
 from datetime import datetime
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.models.alert import Alert
 from app.models.traffic_log import TrafficLog
 from app.models.ml_model import MLModel
 from app.schemas.alert import AlertCreate, AlertResponse, AlertDetailResponse
+from app.services.export import ALERT_EXPORT_COLUMNS, EXPORT_FORMATS, ExportService
+from app.services.pagination import NEXT_CURSOR_HEADER, paginate
 
 router = APIRouter(prefix="/api/alerts", tags=["Alerts"])
 
+# AlertDetailResponse의 중첩 객체를 한 번의 JOIN으로 로드 (행마다 지연 로딩 쿼리 방지)
+DETAIL_LOAD_OPTIONS = (joinedload(Alert.traffic_log), joinedload(Alert.ml_model))
+
+
+def _alert_filters(
+    min_risk_score: Optional[int],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime]
+) -> List[Any]:
+    conditions = []
+    if min_risk_score is not None:
+        conditions.append(Alert.risk_score >= min_risk_score)
+    if start_time:
+        conditions.append(Alert.detected_at >= start_time)
+    if end_time:
+        conditions.append(Alert.detected_at <= end_time)
+    return conditions
+
 
 @router.post("", response_model=AlertResponse, status_code=201)
 def create_alert(
@@ -41,38 +63,109 @@ def create_alert(
     return db_alert
 
 
-@router.get("", response_model=List[AlertDetailResponse])
+@router.get(
+    "",
+    response_model=List[AlertDetailResponse],
+    responses={200: {"description": "List of AlertDetailResponse (AlertResponse items when lean=true)"}}
+)
 def get_alerts(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip (offset paging)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(
+        None, description=f"Keyset paging: {NEXT_CURSOR_HEADER} header of the previous page (skip is ignored)"
+    ),
     min_risk_score: Optional[int] = Query(None, ge=0, le=100, description="Minimum risk score"),
     start_time: Optional[datetime] = Query(None, description="Filter by start detection time"),
     end_time: Optional[datetime] = Query(None, description="Filter by end detection time"),
+    lean: bool = Query(
+        False, description="Return AlertResponse items without the nested traffic_log and ml_model objects"
+    ),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve alerts with pagination and filtering.
     Returns alerts sorted by detected_at in descending order (most recent first).
-    Includes related traffic log and ML model details.
-    """
-    query = db.query(Alert)
+    Includes related traffic log and ML model details (loaded in the same
+    query), unless lean=true.
 
+    When more rows follow, the X-Next-Cursor response header holds the
+    cursor for the next page (constant cost at any depth, unlike skip).
+    """
     # Apply filters
-    if min_risk_score is not None:
-        query = query.filter(Alert.risk_score >= min_risk_score)
-    if start_time:
-        query = query.filter(Alert.detected_at >= start_time)
-    if end_time:
-        query = query.filter(Alert.detected_at <= end_time)
+    query = db.query(Alert).filter(*_alert_filters(min_risk_score, start_time, end_time))
+    if not lean:
+        query = query.options(*DETAIL_LOAD_OPTIONS)
 
-    # Order by detected_at descending (most recent first)
-    query = query.order_by(Alert.detected_at.desc())
+    # Order by detected_at descending (most recent first) and paginate
+    try:
+        alerts, next_cursor = paginate(query, Alert.detected_at, Alert.id, limit, skip, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Apply pagination
-    alerts = query.offset(skip).limit(limit).all()
+    if lean:
+        # 응답 스키마(AlertDetailResponse)를 거치지 않고 직접 직렬화
+        return JSONResponse(
+            content=jsonable_encoder([AlertResponse.model_validate(alert) for alert in alerts]),
+            headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return alerts
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {media_type: {} for media_type, _ in EXPORT_FORMATS.values()}},
+        400: {"description": "Unknown column"},
+        501: {"description": "Parquet export without pyarrow installed"}
+    }
+)
+def export_alerts(
+    fmt: Literal["csv", "ndjson", "parquet"] = Query("csv", alias="format", description="Output format"),
+    columns: Optional[str] = Query(
+        None, description=f"Comma-separated columns to export (default: {','.join(ALERT_EXPORT_COLUMNS)})"
+    ),
+    min_risk_score: Optional[int] = Query(None, ge=0, le=100, description="Minimum risk score"),
+    start_time: Optional[datetime] = Query(None, description="Filter by start detection time"),
+    end_time: Optional[datetime] = Query(None, description="Filter by end detection time")
+):
+    """
+    Stream every matching alert as CSV, NDJSON or Parquet.
+
+    Accepts the same filters as GET /api/alerts without a row limit. Rows
+    are ordered by (detected_at, id) ascending and read through a
+    server-side cursor; nested objects are not included (join on
+    traffic_log_id / ml_model_id, or select them from a logs export).
+    """
+    try:
+        names = ExportService.resolve_columns(ALERT_EXPORT_COLUMNS, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fmt == "parquet" and not ExportService.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires the pyarrow package")
+
+    conditions = _alert_filters(min_risk_score, start_time, end_time)
+    stmt = ExportService.build_select(ALERT_EXPORT_COLUMNS, names, conditions, Alert.detected_at, Alert.id)
+
+    # 요청 세션은 응답 전에 닫히므로 스트림 전용 세션 사용
+    def chunks():
+        export_db = SessionLocal()
+        try:
+            yield from ExportService.iter_export(export_db, stmt, names, fmt)
+        finally:
+            export_db.close()
+
+    media_type, extension = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        chunks(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="alerts.{extension}"'}
+    )
+
+
 @router.get("/{alert_id}", response_model=AlertDetailResponse)
 def get_alert(
     alert_id: int,
@@ -81,7 +174,7 @@ def get_alert(
     """
     Retrieve a specific alert by ID with related traffic log and ML model details.
     """
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    alert = db.query(Alert).options(*DETAIL_LOAD_OPTIONS).filter(Alert.id == alert_id).first()
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     return alert
@@ -0,0 +1,150 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+
+from app.database import get_db
+from app.models.job import Job
+from app.schemas.job import ColdTierRequest, JobResponse
+from app.ml.utils import validate_params
+from app.schemas.ml_analysis import TrainModelRequest, RangeScanRequest
+from app.services.cold_tier import ColdTierService, TieredRangeError
+from app.services.job_queue import JobQueueUnavailable, job_queue
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+def _to_response(job: Job) -> JobResponse:
+    response = JobResponse.model_validate(job)
+    if job.started_at:
+        response.elapsed_sec = round(
+            ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds(), 3
+        )
+    return response
+
+
+def _submit(db: Session, job_type: str, params: Dict[str, Any]) -> JobResponse:
+    try:
+        return _to_response(job_queue.submit(db, job_type, params))
+    except JobQueueUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/train", response_model=JobResponse, status_code=202)
+def submit_train_job(
+    request: TrainModelRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Queue model training and return the job immediately.
+
+    Invalid algorithms or parameters are rejected with 400 before queueing.
+    """
+    try:
+        validate_params(request.algorithm, request.params or {})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if request.incremental and request.sample:
+        raise HTTPException(status_code=400, detail="Sampling is not supported for incremental training")
+    return _submit(db, "train", request.model_dump(mode="json"))
+
+
+@router.post(
+    "/scan",
+    response_model=JobResponse,
+    status_code=202,
+    responses={409: {"description": "Cold-tier days are not scanned: alerts reference traffic_logs ids, so tiered days must be excluded from the range"}}
+)
+def submit_scan_job(
+    request: RangeScanRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Queue a range scan (POST /api/ml/scan) and return the job immediately.
+
+    Ranges covering days moved to the cold tier are rejected with 409
+    before queueing, as on POST /api/ml/scan.
+    """
+    try:
+        ColdTierService.ensure_hot(db, request.start_date, request.end_date)
+    except TieredRangeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _submit(db, "scan", request.model_dump(mode="json"))
+
+
+@router.post("/tier", response_model=JobResponse, status_code=202)
+def submit_tier_job(
+    request: ColdTierRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Queue moving closed days of traffic logs into Parquet partitions and return the job immediately.
+    """
+    if not ColdTierService.available():
+        raise HTTPException(status_code=501, detail="The Parquet cold tier requires the pyarrow package")
+    return _submit(db, "tier", request.model_dump(mode="json"))
+
+
+@router.get("/tier/partitions")
+def get_cold_partitions(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
+    """
+    Parquet cold tier partitions (manifest), oldest first.
+    """
+    return ColdTierService.get_partitions(db)
+
+
+@router.get("", response_model=List[JobResponse])
+def get_jobs(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    job_type: Optional[str] = Query(None, description="Filter by job type"),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve jobs, most recent first.
+    """
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if job_type:
+        query = query.filter(Job.job_type == job_type)
+
+    jobs = query.order_by(Job.created_at.desc()).offset(skip).limit(limit).all()
+    return [_to_response(job) for job in jobs]
+
+
+@router.get("/workers")
+def get_job_workers() -> Dict[str, Any]:
+    """
+    Worker pool status and local queue depth.
+    """
+    return job_queue.get_status()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve job status, progress and result.
+    """
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _to_response(job)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+def cancel_job(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Cancel a queued job, or ask a running job to stop at its next progress update.
+    """
+    try:
+        return _to_response(job_queue.cancel(db, job_id))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
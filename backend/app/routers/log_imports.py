@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any
+
+from app.database import get_db
+from app.models.import_watermark import ImportWatermark
+from app.schemas.log_import import LogImportResponse, ImportWatermarkResponse
+from app.services.log_import import LogImportService, log_import_watcher
+
+router = APIRouter(prefix="/api/imports", tags=["Log Imports"])
+
+
+@router.post("/logcollector", response_model=LogImportResponse)
+def import_logcollector_files():
+    """
+    Import rolled logcollector DB files (logs_<epoch>.db) into traffic_logs.
+    Only rows above each file's watermark are copied, so re-runs are incremental.
+    """
+    try:
+        return LogImportService.import_directory(log_import_watcher.directory)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
+
+
+@router.get("/logcollector/watermarks", response_model=List[ImportWatermarkResponse])
+def get_import_watermarks(db: Session = Depends(get_db)):
+    """
+    Retrieve per-file import watermarks.
+    """
+    return db.query(ImportWatermark).order_by(ImportWatermark.source_file).all()
+
+
+@router.get("/logcollector/watcher")
+def get_import_watcher_status() -> Dict[str, Any]:
+    """
+    Directory watcher status and the last import result.
+    """
+    return log_import_watcher.get_status()
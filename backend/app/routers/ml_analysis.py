@@ -1,26 +1,51 @@
 """
 ML Analysis API Endpoints
 """
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
+from app.routers.jobs import submit_train_job
+from app.schemas.job import JobResponse
 from app.schemas.ml_analysis import (
     TrainModelRequest,
     TrainModelResponse,
     AnalyzeLogsRequest,
     AnalyzeLogsResponse,
     StatisticsResponse,
-    ModelInfoResponse
+    TopTalkersResponse,
+    ModelInfoResponse,
+    RangeScanRequest,
+    RangeScanProgress,
+    RefreshModelRequest
 )
+from app.services.cold_tier import ColdTierService, TieredRangeError
 from app.services.ml_service import MLService
+from app.services.job_queue import job_queue
+from app.services.range_scan import RangeScanService
+from app.ml.model_cache import model_cache
+from app.ml.parallel import sharded_scorer
 
 router = APIRouter(prefix="/api/ml", tags=["ML Analysis"])
 
 
-@router.post("/train", response_model=TrainModelResponse)
+@router.post(
+    "/train",
+    response_model=JobResponse,
+    status_code=202,
+    responses={
+        201: {
+            "model": TrainModelResponse,
+            "description": "Trained inside the request (job queue disabled)"
+        },
+        400: {"description": "Invalid algorithm or parameters"}
+    }
+)
 def train_model(
     request: TrainModelRequest,
     db: Session = Depends(get_db)
@@ -28,16 +53,24 @@ def train_model(
     """
     Train a new ML model
 
+    Training runs in the background job queue and the queued job is
+    returned right away; poll GET /api/jobs/{id} for progress and the
+    training result. With the job queue disabled (JOB_QUEUE_ENABLED=false)
+    the model is trained inside the request and returned with 201.
+
     Args:
         request: Training request with model configuration
         db: Database session
 
     Returns:
-        Training result with model information
+        Queued training job (or the training result without a job queue)
 
     Raises:
-        HTTPException: If training fails
+        HTTPException: If the request is invalid or training fails
     """
+    if job_queue.running:
+        return submit_train_job(request, db)
+
     try:
         result = MLService.train_model(
             db=db,
@@ -45,9 +78,11 @@ def train_model(
             start_date=request.start_date,
             end_date=request.end_date,
             algorithm=request.algorithm,
-            params=request.params or {}
+            params=request.params or {},
+            incremental=request.incremental,
+            sample=request.sample.model_dump() if request.sample else None
         )
-        return result
+        return JSONResponse(status_code=201, content=TrainModelResponse(**result).model_dump())
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -90,10 +125,85 @@ def analyze_logs(
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@router.post(
+    "/scan",
+    response_model=RangeScanProgress,
+    responses={
+        404: {"description": "Model or model file not found"},
+        409: {"description": "Cold-tier days are not scanned: alerts reference traffic_logs ids, so tiered days must be excluded from the range"}
+    }
+)
+def scan_logs(
+    request: RangeScanRequest,
+    stream: bool = Query(False, description="Stream NDJSON progress after every chunk"),
+    db: Session = Depends(get_db)
+):
+    """
+    Score stored logs in a time range and create alerts for anomalies
+
+    Only rows kept in SQLite can be scanned: alerts reference traffic_logs
+    ids, which rows moved to the Parquet cold tier no longer have. Ranges
+    covering tiered days are rejected with 409 (the error lists the days)
+    rather than scanned partially.
+
+    Args:
+        request: Scan request with model ID and time range
+        stream: Return NDJSON progress lines instead of a single result
+        db: Database session
+
+    Returns:
+        Scan summary (or a stream of progress lines)
+
+    Raises:
+        HTTPException: If model not found, the range covers tiered days or scan fails
+    """
+    if stream:
+        # 스트림 시작 후에는 상태 코드를 바꿀 수 없으므로 미리 확인
+        try:
+            ColdTierService.ensure_hot(db, request.start_date, request.end_date)
+        except TieredRangeError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+        # 요청 세션은 응답 전에 닫히므로 스트림 전용 세션 사용
+        def progress_lines():
+            scan_db = SessionLocal()
+            try:
+                for progress in RangeScanService.iter_scan(
+                    scan_db, request.model_id, request.start_date, request.end_date,
+                    request.chunk_size, request.min_risk_score
+                ):
+                    yield json.dumps(progress) + "\n"
+            except Exception as e:
+                yield json.dumps({"error": str(e), "done": True}) + "\n"
+            finally:
+                scan_db.close()
+
+        return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
+
+    try:
+        return RangeScanService.scan(
+            db=db,
+            model_id=request.model_id,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            chunk_size=request.chunk_size,
+            min_risk_score=request.min_risk_score
+        )
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TieredRangeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scan failed: {str(e)}")
+
+
 @router.get("/statistics", response_model=StatisticsResponse)
 def get_statistics(
     start_date: datetime = Query(..., description="Start date for statistics"),
     end_date: datetime = Query(..., description="End date for statistics"),
+    source: Literal["rollup", "raw"] = Query(
+        "rollup", description="rollup: merge time buckets (sketch quantiles/top IPs); raw: scan every row (exact)"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -102,6 +212,7 @@ def get_statistics(
     Args:
         start_date: Start datetime
         end_date: End datetime
+        source: Statistics source (rollup buckets or raw rows)
         db: Database session
 
     Returns:
@@ -114,13 +225,55 @@ def get_statistics(
         result = MLService.get_statistics(
             db=db,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            source=source
         )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Statistics computation failed: {str(e)}")
 
 
+@router.get("/statistics/top-talkers", response_model=TopTalkersResponse)
+def get_top_talkers(
+    start_date: datetime = Query(..., description="Start date"),
+    end_date: datetime = Query(..., description="End date"),
+    dimension: Literal["src_ip", "dst_ip", "dst_port"] = Query("src_ip", description="Column to rank"),
+    limit: int = Query(10, ge=1, le=100, description="Number of values to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get approximate top talkers from per-bucket heavy-hitter sketches
+
+    Args:
+        start_date: Start datetime
+        end_date: End datetime
+        dimension: Column to rank
+        limit: Number of values to return
+        db: Database session
+
+    Returns:
+        Top values with count bounds and the maximum error
+
+    Raises:
+        HTTPException: If the query fails
+    """
+    try:
+        return MLService.get_top_talkers(db, start_date, end_date, dimension, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Top talker query failed: {str(e)}")
+
+
+@router.get("/cache")
+def get_model_cache_metrics():
+    """
+    Get model cache and scoring pool metrics
+
+    Returns:
+        Hit/miss counters, cached size, cached model IDs and process pool counters
+    """
+    return {**model_cache.get_metrics(), "scoring_pool": sharded_scorer.get_metrics()}
+
+
 @router.get("/models", response_model=List[ModelInfoResponse])
 def get_ml_models_list(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
@@ -154,19 +307,8 @@ def get_ml_models_list(
         query = query.order_by(MLModel.created_at.desc())
         models = query.offset(skip).limit(limit).all()
 
-        # Convert to response schema
-        return [
-            ModelInfoResponse(
-                id=model.id,
-                name=model.name,
-                start_date=model.start_date.isoformat(),
-                end_date=model.end_date.isoformat(),
-                model_path=model.model_path,
-                created_at=model.created_at.isoformat(),
-                is_merged=model.is_merged
-            )
-            for model in models
-        ]
+        # Convert to response schema (metadata columns only, model files are not read)
+        return [ModelInfoResponse(**MLService.model_info(model)) for model in models]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get models list: {str(e)}")
 
@@ -198,6 +340,34 @@ def get_model_info(
         raise HTTPException(status_code=500, detail=f"Failed to get model info: {str(e)}")
 
 
+@router.post("/models/{model_id}/refresh", response_model=TrainModelResponse, status_code=201)
+def refresh_model(
+    model_id: int,
+    request: RefreshModelRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Refresh an incremental model with one new day of data
+
+    Args:
+        model_id: ID of a model trained with incremental=true
+        request: Day to add
+        db: Database session
+
+    Returns:
+        Training result of the new model version
+
+    Raises:
+        HTTPException: If the model cannot be refreshed
+    """
+    try:
+        return MLService.refresh_model(db=db, model_id=model_id, day=request.day)
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Refresh failed: {str(e)}")
+
+
 @router.delete("/models/{model_id}")
 def delete_model(
     model_id: int,
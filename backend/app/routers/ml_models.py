@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime
 
 from app.database import get_db
 from app.models.ml_model import MLModel
 from app.schemas.ml_model import MLModelCreate, MLModelResponse, MLModelMergeRequest
+from app.services.ml_service import MLService
 
 router = APIRouter(prefix="/api/models", tags=["ML Models"])
 
@@ -78,32 +78,15 @@ def merge_ml_models(
 ):
     """
     Merge multiple ML models into a new merged model.
-    Accepts a list of model IDs to merge.
+    Accepts a list of model IDs to merge. The stored artifacts are combined
+    (pooled trees, weighted scaler statistics), so the merged model can be
+    used for analysis right away.
     """
-    # Validate that all models exist
-    models = db.query(MLModel).filter(MLModel.id.in_(merge_request.model_ids)).all()
-
-    if len(models) != len(merge_request.model_ids):
-        raise HTTPException(
-            status_code=404,
-            detail="One or more model IDs not found"
+    try:
+        return MLService.merge_models(
+            db, merge_request.model_ids, merge_request.merged_model_name
         )
-
-    # Calculate date range (min start_date, max end_date)
-    start_date = min(model.start_date for model in models)
-    end_date = max(model.end_date for model in models)
-
-    # Create merged model
-    merged_model = MLModel(
-        name=merge_request.merged_model_name,
-        start_date=start_date,
-        end_date=end_date,
-        model_path=None,  # Will be set after actual merging process
-        is_merged=True,
-        created_at=datetime.utcnow()
-    )
-
-    db.add(merged_model)
-    db.commit()
-    db.refresh(merged_model)
-    return merged_model
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,42 +1,229 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import ipaddress
+import queue
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import Any, List, Literal, Optional, Tuple
 from datetime import datetime
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
+from app.ml.utils import ipv4_cidr_range, protocol_to_numeric
 from app.models.traffic_log import TrafficLog
-from app.schemas.traffic_log import TrafficLogCreate, TrafficLogResponse
+from app.schemas.traffic_log import (
+    TrafficLogCreate,
+    TrafficLogResponse,
+    TrafficLogBulkCreate,
+    TrafficLogBulkResponse,
+    TrafficLogStreamResponse,
+    TrafficLogQueuedResponse
+)
+from app.services.cold_tier import ColdTierService
+from app.services.ingest_buffer import ingest_buffer
+from app.services.export import EXPORT_FORMATS, LOG_EXPORT_COLUMNS, ExportService
+from app.services.ingest_service import IngestService
+from app.services.pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_query, merge_pages, paginate
 
 router = APIRouter(prefix="/api/logs", tags=["Traffic Logs"])
 
 
-@router.post("", response_model=TrafficLogResponse, status_code=201)
-def create_traffic_log(
-    log_data: TrafficLogCreate,
+def _ip_filter(string_column, numeric_column, ip: str):
+    # 문자열 일치가 기준 (저장된 "010.0.0.1" 등은 같은 숫자라도 제외)
+    # IPv4면 정수 컬럼 조건을 더해 정수 인덱스로 찾고, 아니면 문자열 인덱스 사용
+    try:
+        return and_(numeric_column == int(ipaddress.IPv4Address(ip)), string_column == ip)
+    except ValueError:
+        return string_column == ip
+
+
+def _cidr_filter(numeric_column, cidr: str):
+    try:
+        low, high = ipv4_cidr_range(cidr)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid IPv4 CIDR: {cidr}")
+    return numeric_column.between(low, high)
+
+
+def _log_filters(
+    src_ip: Optional[str],
+    dst_ip: Optional[str],
+    src_cidr: Optional[str],
+    dst_cidr: Optional[str],
+    protocol: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime]
+) -> List[Any]:
+    # IP/프로토콜은 저장된 문자열과 정확히 일치해야 하며, 정수 인코딩 컬럼은 인덱스 탐색용
+    conditions = []
+    if src_ip:
+        conditions.append(_ip_filter(TrafficLog.src_ip, TrafficLog.src_ip_numeric, src_ip))
+    if dst_ip:
+        conditions.append(_ip_filter(TrafficLog.dst_ip, TrafficLog.dst_ip_numeric, dst_ip))
+    if src_cidr:
+        conditions.append(_cidr_filter(TrafficLog.src_ip_numeric, src_cidr))
+    if dst_cidr:
+        conditions.append(_cidr_filter(TrafficLog.dst_ip_numeric, dst_cidr))
+    if protocol:
+        conditions.append(TrafficLog.protocol == protocol)
+        protocol_code = protocol_to_numeric(protocol)
+        if protocol_code:
+            conditions.append(TrafficLog.protocol_numeric == protocol_code)
+    if start_time:
+        conditions.append(TrafficLog.timestamp >= start_time)
+    if end_time:
+        conditions.append(TrafficLog.timestamp <= end_time)
+    return conditions
+
+
+def _cold_log_filters(
+    src_ip: Optional[str],
+    dst_ip: Optional[str],
+    src_cidr: Optional[str],
+    dst_cidr: Optional[str],
+    protocol: Optional[str]
+) -> List[Tuple[str, str, Any]]:
+    # _log_filters와 같은 조건을 cold tier(Parquet) 필터로 표현 (시간 범위는 read_rows가 처리)
+    filters = []
+    for column, ip in (("src_ip", src_ip), ("dst_ip", dst_ip)):
+        if ip:
+            filters.append((column, "==", ip))
+            try:
+                filters.append((f"{column}_numeric", "==", int(ipaddress.IPv4Address(ip))))
+            except ValueError:
+                pass
+    for column, cidr in (("src_ip_numeric", src_cidr), ("dst_ip_numeric", dst_cidr)):
+        if cidr:
+            low, high = ipv4_cidr_range(cidr)
+            filters += [(column, ">=", low), (column, "<=", high)]
+    if protocol:
+        filters.append(("protocol", "==", protocol))
+        protocol_code = protocol_to_numeric(protocol)
+        if protocol_code:
+            filters.append(("protocol_numeric", "==", protocol_code))
+    return filters
+
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+@router.post(
+    "",
+    response_model=TrafficLogResponse,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/TrafficLogCreate"}
+                },
+                "application/x-ndjson": {
+                    "schema": {"type": "string", "description": "One TrafficLogCreate JSON object per line"}
+                }
+            }
+        }
+    },
+    responses={
+        200: {
+            "model": TrafficLogStreamResponse,
+            "description": "NDJSON stream ingest summary"
+        },
+        202: {
+            "model": TrafficLogQueuedResponse,
+            "description": "Queued in the write-behind buffer (durable=false)"
+        },
+        503: {"description": "Write-behind buffer is full"}
+    }
+)
+async def create_traffic_log(
+    request: Request,
+    batch_size: Optional[int] = Query(
+        None, ge=1, le=50000, description="Records per commit for NDJSON streams"
+    ),
+    durable: bool = Query(
+        True,
+        description="Wait until the record is committed and return it; "
+                    "false returns 202 as soon as it is queued in the write-behind buffer"
+    ),
     db: Session = Depends(get_db)
 ):
     """
     Create a new traffic log entry.
     Used by logcollector to submit traffic data.
+
+    With Content-Type application/x-ndjson the body is parsed line by line
+    as it arrives and committed in micro-batches; invalid lines are reported
+    in the summary without aborting the stream.
+
+    Single JSON records return 201 with the stored record once committed.
+    While the write-behind buffer is running they are written by its group
+    commit; durable=false opts into a 202 as soon as the record is queued.
     """
-    # timestamp가 제공되지 않으면 현재 시각 사용
-    log_dict = log_data.model_dump()
-    if log_dict.get("timestamp") is None:
-        log_dict["timestamp"] = datetime.utcnow()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in NDJSON_MEDIA_TYPES:
+        summary = await IngestService.ingest_ndjson_stream(db, request.stream(), batch_size)
+        return JSONResponse(status_code=200, content=summary)
+
+    try:
+        log_data = TrafficLogCreate.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    if not ingest_buffer.running:
+        return await run_in_threadpool(IngestService.insert_log, db, log_data)
+
+    row = IngestService.prepare_row(log_data)
+    try:
+        future = ingest_buffer.submit(row)
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="Ingest buffer is full, retry later")
 
-    db_log = TrafficLog(**log_dict)
-    db.add(db_log)
-    db.commit()
-    db.refresh(db_log)
-    return db_log
+    if not durable:
+        return JSONResponse(
+            status_code=202,
+            content={"queued": True, "queue_depth": ingest_buffer.get_metrics()["queue_depth"]}
+        )
+
+    try:
+        log_id = await asyncio.wrap_future(future)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Buffered insert failed: {str(e)}")
+    return TrafficLogResponse(id=log_id, **row)
+
+
+@router.post("/bulk", response_model=TrafficLogBulkResponse, status_code=201)
+def create_traffic_logs_bulk(
+    bulk_data: TrafficLogBulkCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create many traffic log entries in a single transaction.
+    Returns the inserted count and ID range instead of echoing every row.
+    """
+    try:
+        return IngestService.bulk_insert(db, bulk_data.logs)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk insert failed: {str(e)}")
 
 
 @router.get("", response_model=List[TrafficLogResponse])
 def get_traffic_logs(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip (offset paging)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(
+        None, description=f"Keyset paging: {NEXT_CURSOR_HEADER} header of the previous page (skip is ignored)"
+    ),
     src_ip: Optional[str] = Query(None, description="Filter by source IP"),
     dst_ip: Optional[str] = Query(None, description="Filter by destination IP"),
+    src_cidr: Optional[str] = Query(None, description="Filter by source IPv4 network (e.g. 10.0.0.0/8)"),
+    dst_cidr: Optional[str] = Query(None, description="Filter by destination IPv4 network"),
     protocol: Optional[str] = Query(None, description="Filter by protocol"),
     start_time: Optional[datetime] = Query(None, description="Filter by start timestamp"),
     end_time: Optional[datetime] = Query(None, description="Filter by end timestamp"),
@@ -44,29 +231,130 @@ def get_traffic_logs(
 ):
     """
     Retrieve traffic logs with pagination and filtering.
-    """
-    query = db.query(TrafficLog)
 
+    Logs are ordered by (timestamp, id) descending. When more rows follow,
+    the X-Next-Cursor response header holds the cursor for the next page;
+    cursor paging keeps a constant cost at any depth, unlike skip.
+
+    Days moved to the cold tier are listed transparently: when a page
+    reaches them, the newest matching Parquet rows are merged in by the
+    same order, so paging runs on across the hot/cold boundary. Without
+    pyarrow installed only the rows kept in SQLite are listed.
+    """
     # Apply filters
-    if src_ip:
-        query = query.filter(TrafficLog.src_ip == src_ip)
-    if dst_ip:
-        query = query.filter(TrafficLog.dst_ip == dst_ip)
-    if protocol:
-        query = query.filter(TrafficLog.protocol == protocol)
-    if start_time:
-        query = query.filter(TrafficLog.timestamp >= start_time)
-    if end_time:
-        query = query.filter(TrafficLog.timestamp <= end_time)
+    query = db.query(TrafficLog).filter(
+        *_log_filters(src_ip, dst_ip, src_cidr, dst_cidr, protocol, start_time, end_time)
+    )
 
-    # Order by timestamp descending (most recent first)
-    query = query.order_by(TrafficLog.timestamp.desc())
+    # Order by timestamp descending (most recent first) and paginate
+    try:
+        logs, next_cursor = paginate(query, TrafficLog.timestamp, TrafficLog.id, limit, skip, cursor)
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Apply pagination
-    logs = query.offset(skip).limit(limit).all()
+    # 페이지가 덮는 구간(이전 커서 ~ 마지막 행, 마지막 페이지면 start_time까지)에 cold 날짜가 있을 때만 병합
+    covered_to = end_time
+    if before and (covered_to is None or before[0] < covered_to):
+        covered_to = before[0]
+    covered_from = logs[-1].timestamp if next_cursor else start_time
+    if ColdTierService.available() and ColdTierService.tiered_days(db, covered_from, covered_to):
+        # 각 저장소에서 skip + limit + 1행씩 읽어 병합 (cursor 사용 시 skip 무시)
+        offset = 0 if cursor else skip
+        hot = keyset_query(query, TrafficLog.timestamp, TrafficLog.id, cursor).limit(offset + limit + 1).all()
+        cold = ColdTierService.read_rows(
+            db, start_time, covered_to, list(TrafficLogResponse.model_fields),
+            _cold_log_filters(src_ip, dst_ip, src_cidr, dst_cidr, protocol), offset + limit + 1, before
+        )
+        logs, next_cursor = merge_pages(
+            [hot, [TrafficLogResponse(**row) for row in cold]], "timestamp", "id", limit, offset
+        )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return logs
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {media_type: {} for media_type, _ in EXPORT_FORMATS.values()}},
+        400: {"description": "Unknown column or invalid filter"},
+        501: {"description": "Parquet export without pyarrow installed, or cold-tier days in range without pyarrow"}
+    }
+)
+def export_traffic_logs(
+    fmt: Literal["csv", "ndjson", "parquet"] = Query("csv", alias="format", description="Output format"),
+    columns: Optional[str] = Query(
+        None, description=f"Comma-separated columns to export (default: {','.join(LOG_EXPORT_COLUMNS)})"
+    ),
+    src_ip: Optional[str] = Query(None, description="Filter by source IP"),
+    dst_ip: Optional[str] = Query(None, description="Filter by destination IP"),
+    src_cidr: Optional[str] = Query(None, description="Filter by source IPv4 network (e.g. 10.0.0.0/8)"),
+    dst_cidr: Optional[str] = Query(None, description="Filter by destination IPv4 network"),
+    protocol: Optional[str] = Query(None, description="Filter by protocol"),
+    start_time: Optional[datetime] = Query(None, description="Filter by start timestamp"),
+    end_time: Optional[datetime] = Query(None, description="Filter by end timestamp"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream every matching traffic log as CSV, NDJSON or Parquet.
+
+    Accepts the same filters as GET /api/logs without a row limit. Rows are
+    ordered by (timestamp, id) ascending and read through a server-side
+    cursor, so memory use does not grow with the size of the export.
+
+    Days moved to the cold tier are exported transparently: their matching
+    Parquet rows are streamed batch by batch and merged into the same order.
+    """
+    try:
+        names = ExportService.resolve_columns(LOG_EXPORT_COLUMNS, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fmt == "parquet" and not ExportService.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires the pyarrow package")
+
+    conditions = _log_filters(src_ip, dst_ip, src_cidr, dst_cidr, protocol, start_time, end_time)
+    stmt = ExportService.build_select(LOG_EXPORT_COLUMNS, names, conditions, TrafficLog.timestamp, TrafficLog.id)
+
+    # 스트림 시작 후에는 상태 코드를 바꿀 수 없으므로 cold 날짜 여부를 미리 확인
+    tiered = bool(ColdTierService.tiered_days(db, start_time, end_time))
+    if tiered and not ColdTierService.available():
+        raise HTTPException(status_code=501, detail="Exporting cold-tier days requires the pyarrow package")
+    cold_filters = _cold_log_filters(src_ip, dst_ip, src_cidr, dst_cidr, protocol) if tiered else None
+
+    # 요청 세션은 응답 전에 닫히므로 스트림 전용 세션 사용
+    def chunks():
+        export_db = SessionLocal()
+        try:
+            if not tiered:
+                yield from ExportService.iter_export(export_db, stmt, names, fmt)
+                return
+            cold_rows = ColdTierService.iter_rows(export_db, start_time, end_time, names, cold_filters)
+            yield from ExportService.iter_export(
+                export_db, stmt, names, fmt,
+                merge_rows=cold_rows, key_columns=(TrafficLog.timestamp, TrafficLog.id)
+            )
+        finally:
+            export_db.close()
+
+    media_type, extension = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        chunks(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="traffic_logs.{extension}"'}
+    )
+
+
+@router.get("/buffer/metrics")
+def get_ingest_buffer_metrics():
+    """
+    Write-behind buffer metrics: queue depth, counters and flush latency.
+    """
+    return ingest_buffer.get_metrics()
+
+
 @router.get("/{log_id}", response_model=TrafficLogResponse)
 def get_traffic_log(
     log_id: int,
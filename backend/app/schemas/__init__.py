@@ -1,11 +1,19 @@
 from app.schemas.example import ExampleCreate, ExampleResponse
-from app.schemas.traffic_log import TrafficLogCreate, TrafficLogResponse
+from app.schemas.traffic_log import (
+    TrafficLogCreate, TrafficLogResponse, TrafficLogBulkCreate, TrafficLogBulkResponse,
+    TrafficLogStreamResponse, TrafficLogQueuedResponse
+)
 from app.schemas.ml_model import MLModelCreate, MLModelResponse, MLModelMergeRequest
 from app.schemas.alert import AlertCreate, AlertResponse, AlertDetailResponse
+from app.schemas.log_import import LogImportResponse, ImportWatermarkResponse
+from app.schemas.job import JobResponse
 
 __all__ = [
     "ExampleCreate", "ExampleResponse",
-    "TrafficLogCreate", "TrafficLogResponse",
+    "TrafficLogCreate", "TrafficLogResponse", "TrafficLogBulkCreate", "TrafficLogBulkResponse",
+    "TrafficLogStreamResponse", "TrafficLogQueuedResponse",
     "MLModelCreate", "MLModelResponse", "MLModelMergeRequest",
-    "AlertCreate", "AlertResponse", "AlertDetailResponse"
+    "AlertCreate", "AlertResponse", "AlertDetailResponse",
+    "LogImportResponse", "ImportWatermarkResponse",
+    "JobResponse"
 ]
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import Optional, Dict, Any
+
+
+class JobResponse(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    params: Dict[str, Any]
+    progress: float
+    message: Optional[str]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    cancel_requested: bool
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    elapsed_sec: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ColdTierRequest(BaseModel):
+    """
+    Request schema for moving closed days of traffic_logs into the Parquet cold tier
+    """
+    before: Optional[date] = Field(
+        default=None, description="First day kept in SQLite (default: today - COLD_TIER_AFTER_DAYS)"
+    )
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List
+
+
+class LogImportFileResult(BaseModel):
+    file: str
+    imported: int
+    last_source_id: Optional[int] = None
+    elapsed_ms: Optional[float] = None
+    rows_per_sec: Optional[float] = None
+    error: Optional[str] = None
+
+
+class LogImportResponse(BaseModel):
+    directory: str
+    files: List[LogImportFileResult]
+    total_imported: int
+
+
+class ImportWatermarkResponse(BaseModel):
+    source_file: str
+    last_source_id: int
+    imported_rows: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
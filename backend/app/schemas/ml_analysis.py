@@ -2,8 +2,22 @@
 Pydantic schemas for ML Analysis API
 """
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Literal, Optional, Union
+from datetime import datetime, date
+
+
+class TrainingSampleSpec(BaseModel):
+    """
+    Training subsample configuration
+    """
+    size: int = Field(..., ge=1, description="Number of rows to sample")
+    method: Literal["sql", "reservoir"] = Field(
+        default="sql", description="SQL-side seeded sample or reservoir sampling over the cursor"
+    )
+    stratify_by: List[Literal["protocol", "hour"]] = Field(
+        default_factory=list, description="Stratification keys"
+    )
+    seed: int = Field(default=42, description="Random seed")
 
 
 class TrainModelRequest(BaseModel):
@@ -15,6 +29,13 @@ class TrainModelRequest(BaseModel):
     end_date: datetime = Field(..., description="Training data end date")
     algorithm: str = Field(default="isolation_forest", description="Algorithm name")
     params: Optional[Dict[str, Any]] = Field(default=None, description="Model parameters")
+    incremental: bool = Field(
+        default=False,
+        description="Keep one sub-forest per day so the model can be refreshed day by day"
+    )
+    sample: Optional[TrainingSampleSpec] = Field(
+        default=None, description="Train on a random subsample instead of every row"
+    )
 
     class Config:
         json_schema_extra = {
@@ -42,6 +63,18 @@ class TrainModelResponse(BaseModel):
     params: Dict[str, Any]
     training_samples: int
     created_at: str
+    version: int = 1
+    training_sample: Optional[Dict[str, Any]] = None
+    training_duration_ms: Optional[float] = None
+
+
+class RefreshModelRequest(BaseModel):
+    """
+    Request schema for refreshing an incremental model with a new day
+    """
+    day: Optional[date] = Field(
+        default=None, description="Day to add (defaults to the day after the model's end date)"
+    )
 
 
 class LogData(BaseModel):
@@ -115,6 +148,26 @@ class StatisticsResponse(BaseModel):
     anomalies_detected: int
 
 
+class TopTalker(BaseModel):
+    """
+    Approximate frequency of one value (true count is within [min_count, count])
+    """
+    value: Union[str, int]
+    count: int
+    min_count: int
+
+
+class TopTalkersResponse(BaseModel):
+    """
+    Response schema for sketch-based top talkers
+    """
+    period: Dict[str, str]
+    dimension: str
+    total: int
+    max_error: int = Field(..., description="Upper bound on the count of any value not listed")
+    items: List[TopTalker]
+
+
 class ModelInfoResponse(BaseModel):
     """
     Response schema for model info
@@ -126,7 +179,44 @@ class ModelInfoResponse(BaseModel):
     model_path: Optional[str]
     created_at: str
     is_merged: bool
+    version: int = 1
+    parent_model_id: Optional[int] = None
     algorithm: Optional[str] = None
     params: Optional[Dict[str, Any]] = None
     trained_at: Optional[str] = None
     training_samples: Optional[int] = None
+    training_sample: Optional[Dict[str, Any]] = None
+    artifact_size: Optional[int] = None
+    feature_schema_version: Optional[int] = None
+    training_duration_ms: Optional[float] = None
+
+
+class RangeScanRequest(BaseModel):
+    """
+    Request schema for scanning stored logs by time range
+    """
+    model_id: int = Field(..., description="Model ID to use")
+    start_date: datetime = Field(..., description="Scan start date")
+    end_date: datetime = Field(..., description="Scan end date")
+    chunk_size: Optional[int] = Field(
+        default=None, ge=100, le=500000, description="Logs scored per chunk"
+    )
+    min_risk_score: int = Field(
+        default=0, ge=0, le=100, description="Only create alerts at or above this risk score"
+    )
+
+
+class RangeScanProgress(BaseModel):
+    """
+    Progress / result of a range scan
+    """
+    model_id: int
+    total: int
+    scanned: int
+    anomalies: int
+    alerts_created: int
+    chunks: int
+    last_log_id: int
+    elapsed_ms: float
+    rows_per_sec: float
+    done: bool
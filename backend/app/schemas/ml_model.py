@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Any, Optional, List
 
 
 class MLModelCreate(BaseModel):
@@ -20,6 +20,15 @@ class MLModelResponse(BaseModel):
     model_path: Optional[str]
     created_at: datetime
     is_merged: bool
+    version: int = 1
+    parent_model_id: Optional[int] = None
+    algorithm: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    trained_at: Optional[datetime] = None
+    training_samples: Optional[int] = None
+    artifact_size: Optional[int] = None
+    feature_schema_version: Optional[int] = None
+    training_duration_ms: Optional[float] = None
 
     model_config = {"from_attributes": True, "protected_namespaces": ()}
 
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class TrafficLogCreate(BaseModel):
@@ -29,3 +29,31 @@ class TrafficLogResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TrafficLogBulkCreate(BaseModel):
+    logs: List[TrafficLogCreate] = Field(
+        ..., min_length=1, max_length=50000, description="Traffic log records to insert"
+    )
+
+
+class TrafficLogBulkResponse(BaseModel):
+    inserted: int
+    first_id: Optional[int]
+    last_id: Optional[int]
+
+
+class TrafficLogStreamError(BaseModel):
+    line: int
+    error: str
+
+
+class TrafficLogStreamResponse(TrafficLogBulkResponse):
+    failed: int
+    batches: int
+    errors: List[TrafficLogStreamError]
+
+
+class TrafficLogQueuedResponse(BaseModel):
+    queued: bool
+    queue_depth: int
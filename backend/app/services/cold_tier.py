@@ -0,0 +1,607 @@
+"""
+Cold Tier Service - Moves closed days of traffic_logs into Parquet files
+
+Days older than COLD_TIER_AFTER_DAYS are written to date-partitioned
+Parquet files (COLD_TIER_DIR/traffic_logs/date=YYYY-MM-DD/part-*.parquet)
+sorted by timestamp, with dictionary encoding for the IP and protocol
+columns, and then deleted from SQLite so the row store and its indexes only
+hold recent data. Rows referenced by alerts stay in SQLite (alert details
+join them), so a day can have rows in both tiers; no row is ever in both.
+
+The cold_partitions table is the manifest: a file is visible to readers
+only once its row is committed in the same transaction as the DELETE, so a
+crash leaves either the rows in SQLite or a listed file, never both. Files
+without a manifest row are removed on the next run.
+
+Readers (training loader, raw statistics, rollup range edges) pick the
+partitions of the requested days from the manifest and let Arrow skip row
+groups by timestamp statistics and read only the requested columns. Log
+listing merges the newest matching cold rows into its pages (read_rows) and
+export merges the cold rows of its range into the SQLite stream (iter_rows).
+Range scans only read SQLite and reject ranges that cover tiered days
+(TieredRangeError) instead of returning them as empty: they cannot alert on
+cold rows because alerts reference traffic_logs ids.
+"""
+import heapq
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app import config
+from app.models.alert import Alert
+from app.models.cold_partition import ColdPartition
+from app.models.traffic_log import TrafficLog
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    ds = None
+    pq = None
+
+# Parquet 컬럼: (이름, SQL 표현식, Arrow 타입 이름)
+# 정수 인코딩 컬럼은 비어 있으면 SQL 함수로 계산해 저장
+COLD_COLUMNS = (
+    ("id", TrafficLog.id, "int64"),
+    ("timestamp", TrafficLog.timestamp, "timestamp"),
+    ("protocol", TrafficLog.protocol, "string"),
+    ("src_ip", TrafficLog.src_ip, "string"),
+    ("src_port", TrafficLog.src_port, "int32"),
+    ("dst_ip", TrafficLog.dst_ip, "string"),
+    ("dst_port", TrafficLog.dst_port, "int32"),
+    ("packets", TrafficLog.packets, "int64"),
+    ("bytes", TrafficLog.bytes, "int64"),
+    ("cpu_id", TrafficLog.cpu_id, "int32"),
+    ("src_ip_numeric", func.coalesce(TrafficLog.src_ip_numeric, func.ip_to_numeric(TrafficLog.src_ip)), "int64"),
+    ("dst_ip_numeric", func.coalesce(TrafficLog.dst_ip_numeric, func.ip_to_numeric(TrafficLog.dst_ip)), "int64"),
+    (
+        "protocol_numeric",
+        func.coalesce(TrafficLog.protocol_numeric, func.protocol_to_numeric(TrafficLog.protocol)),
+        "int16"
+    ),
+)
+
+COLD_COLUMN_NAMES = [name for name, _, _ in COLD_COLUMNS]
+
+# 반복 값이 많은 IP/프로토콜 컬럼은 dictionary 인코딩
+DICTIONARY_COLUMNS = ["protocol", "src_ip", "dst_ip", "src_ip_numeric", "dst_ip_numeric", "protocol_numeric"]
+
+PARTITION_ROOT = "traffic_logs"
+
+# 동시에 두 작업이 같은 날짜를 옮기거나 서로의 임시 파일을 지우지 않도록 직렬화
+_tier_lock = threading.Lock()
+
+
+def _schema() -> Any:
+    types = {"int16": pa.int16(), "int32": pa.int32(), "int64": pa.int64(),
+             "string": pa.string(), "timestamp": pa.timestamp("us")}
+    return pa.schema([pa.field(name, types[type_name]) for name, _, type_name in COLD_COLUMNS])
+
+
+class TieredRangeError(Exception):
+    """
+    Raised when a reader that only sees SQLite is asked for days moved to the cold tier
+    """
+
+    def __init__(self, days: List[str]):
+        self.days = days
+        super().__init__(
+            f"Range covers days moved to the cold tier: {', '.join(days)}; "
+            "narrow the range to days after them (see GET /api/jobs/tier/partitions)"
+        )
+
+
+class ColdTierService:
+    """
+    Service for the Parquet cold tier of traffic_logs
+    """
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Whether the optional pyarrow dependency is installed
+        """
+        return pq is not None
+
+    @staticmethod
+    def tier_closed_days(
+        db: Session,
+        before: Optional[date] = None,
+        progress: Optional[Callable[[float, str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Move every day before a cutoff from SQLite into Parquet partitions
+
+        Args:
+            db: Database session
+            before: First day kept in SQLite (default: today - COLD_TIER_AFTER_DAYS, UTC)
+            progress: Optional callback (fraction, message)
+
+        Returns:
+            Summary with per-day results and totals
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        if not ColdTierService.available():
+            raise RuntimeError("The Parquet cold tier requires the pyarrow package")
+        before = before or (datetime.utcnow().date() - timedelta(days=config.COLD_TIER_AFTER_DAYS))
+
+        with _tier_lock:
+            removed = ColdTierService.remove_orphans(db)
+            days = ColdTierService._hot_days(db, before)
+            results = []
+            for i, day in enumerate(days):
+                result = ColdTierService.tier_day(db, day)
+                if result:
+                    results.append(result)
+                if progress:
+                    progress((i + 1) / len(days), f"{day.isoformat()} ({i + 1}/{len(days)} days)")
+
+        return {
+            "before": before.isoformat(),
+            "days": results,
+            "moved_rows": sum(result["row_count"] for result in results),
+            "written_bytes": sum(result["size_bytes"] for result in results),
+            "orphans_removed": removed
+        }
+
+    @staticmethod
+    def tier_day(db: Session, day: date) -> Optional[Dict[str, Any]]:
+        """
+        Move one day of traffic_logs (except rows referenced by alerts) into a new Parquet file
+
+        The file is written and renamed first; the DELETE and the manifest
+        row are committed together only if the DELETE removed exactly the
+        rows that were written, otherwise the file is discarded.
+
+        Args:
+            db: Database session
+            day: Day to move
+
+        Returns:
+            Manifest entry of the new file, or None if the day has no movable rows
+
+        Raises:
+            RuntimeError: If the rows changed while the file was being written
+        """
+        from app.services.rollup import RollupService
+
+        start = datetime.combine(day, time())
+        conditions = (
+            TrafficLog.timestamp >= start,
+            TrafficLog.timestamp < start + timedelta(days=1),
+            TrafficLog.id.not_in(select(Alert.traffic_log_id))
+        )
+        first_id, last_id, count = db.execute(
+            select(func.min(TrafficLog.id), func.max(TrafficLog.id), func.count()).where(*conditions)
+        ).one()
+        db.rollback()  # 읽기 트랜잭션을 닫아 파일 작성 중 다른 쓰기를 막지 않음
+        if not count:
+            return None
+        # 이후 들어온 행(id > last_id)은 다음 실행에서 옮김
+        conditions += (TrafficLog.id <= last_id,)
+
+        relative_path = os.path.join(
+            PARTITION_ROOT, f"date={day.isoformat()}", f"part-{first_id:012d}-{last_id:012d}.parquet"
+        )
+        path = os.path.join(config.COLD_TIER_DIR, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        written = ColdTierService._write_partition(db, conditions, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+        try:
+            # 반영 대기 중인 행이 옮겨지기 전에 요약에 반영
+            RollupService.flush_sketches(db)
+            deleted = db.execute(delete(TrafficLog).where(*conditions)).rowcount
+            if deleted != written:
+                raise RuntimeError(
+                    f"{day.isoformat()}: wrote {written} rows but {deleted} matched on delete, retry later"
+                )
+            entry = ColdPartition(
+                day=day.isoformat(), path=relative_path, row_count=written,
+                first_id=first_id, last_id=last_id, size_bytes=os.path.getsize(path)
+            )
+            db.add(entry)
+            db.commit()
+        except Exception:
+            db.rollback()
+            os.remove(path)
+            raise
+
+        return {
+            "day": entry.day,
+            "path": entry.path,
+            "row_count": entry.row_count,
+            "size_bytes": entry.size_bytes
+        }
+
+    @staticmethod
+    def remove_orphans(db: Session) -> int:
+        """
+        Delete partition files that are not in the manifest (interrupted runs)
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of files removed
+        """
+        root = os.path.join(config.COLD_TIER_DIR, PARTITION_ROOT)
+        if not os.path.isdir(root):
+            return 0
+
+        listed = set(db.execute(select(ColdPartition.path)).scalars().all())
+        removed = 0
+        for directory, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(directory, name)
+                if os.path.relpath(path, config.COLD_TIER_DIR) not in listed:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    @staticmethod
+    def partition_paths(db: Session, start: datetime, end: datetime) -> List[str]:
+        """
+        Partition files that may hold rows in a time range (partition pruning by day)
+
+        Args:
+            db: Database session
+            start: Range start
+            end: Range end
+
+        Returns:
+            Absolute file paths, oldest first
+        """
+        paths = db.execute(
+            select(ColdPartition.path)
+            .where(ColdPartition.day >= start.date().isoformat(), ColdPartition.day <= end.date().isoformat())
+            .order_by(ColdPartition.day, ColdPartition.first_id)
+        ).scalars().all()
+        return [os.path.join(config.COLD_TIER_DIR, path) for path in paths]
+
+    @staticmethod
+    def tiered_days(db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[str]:
+        """
+        Days in a time range that have rows in the cold tier
+
+        Args:
+            db: Database session
+            start: Range start (None: unbounded)
+            end: Range end (None: unbounded)
+
+        Returns:
+            ISO dates, oldest first
+        """
+        stmt = select(ColdPartition.day).distinct().order_by(ColdPartition.day)
+        if start is not None:
+            stmt = stmt.where(ColdPartition.day >= start.date().isoformat())
+        if end is not None:
+            stmt = stmt.where(ColdPartition.day <= end.date().isoformat())
+        return list(db.execute(stmt).scalars().all())
+
+    @staticmethod
+    def ensure_hot(db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None) -> None:
+        """
+        Check that a time range has no rows in the cold tier
+
+        For readers that only query SQLite (range scans), which would
+        otherwise return tiered days as empty.
+
+        Args:
+            db: Database session
+            start: Range start (None: unbounded)
+            end: Range end (None: unbounded)
+
+        Raises:
+            TieredRangeError: If any day in the range has been tiered
+        """
+        days = ColdTierService.tiered_days(db, start, end)
+        if days:
+            raise TieredRangeError(days)
+
+    @staticmethod
+    def iter_batches(
+        db: Session,
+        start: datetime,
+        end: datetime,
+        columns: Sequence[str],
+        end_inclusive: bool = True,
+        batch_size: Optional[int] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Stream cold rows of a time range as NumPy column batches
+
+        Args:
+            db: Database session
+            start: Range start (inclusive)
+            end: Range end
+            columns: Column names from COLD_COLUMN_NAMES
+            end_inclusive: Whether rows at exactly end are included
+            batch_size: Maximum rows per batch
+
+        Yields:
+            Dictionary of column name -> 1D ndarray (integer nulls read as 0)
+
+        Raises:
+            RuntimeError: If partitions exist but pyarrow is not installed
+        """
+        paths = ColdTierService.partition_paths(db, start, end)
+        if not paths:
+            return
+        if not ColdTierService.available():
+            raise RuntimeError("Reading cold partitions requires the pyarrow package")
+
+        dataset = ds.dataset(paths, schema=_schema(), format="parquet")
+        for batch in dataset.to_batches(
+            columns=list(columns),
+            filter=ColdTierService._time_filter(start, end, end_inclusive),
+            batch_size=batch_size or config.TRAINING_LOAD_CHUNK_SIZE
+        ):
+            if batch.num_rows:
+                yield {name: _to_numpy(batch.column(name)) for name in columns}
+
+    @staticmethod
+    def load_columns(
+        db: Session,
+        start: datetime,
+        end: datetime,
+        columns: Sequence[str],
+        end_inclusive: bool = True
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Load cold rows of a time range into NumPy column arrays
+
+        Args:
+            db: Database session
+            start: Range start (inclusive)
+            end: Range end
+            columns: Column names from COLD_COLUMN_NAMES
+            end_inclusive: Whether rows at exactly end are included
+
+        Returns:
+            Dictionary of column name -> 1D ndarray, or None if no partition overlaps the range
+
+        Raises:
+            RuntimeError: If partitions exist but pyarrow is not installed
+        """
+        paths = ColdTierService.partition_paths(db, start, end)
+        if not paths:
+            return None
+        if not ColdTierService.available():
+            raise RuntimeError("Reading cold partitions requires the pyarrow package")
+
+        table = ds.dataset(paths, schema=_schema(), format="parquet").to_table(
+            columns=list(columns), filter=ColdTierService._time_filter(start, end, end_inclusive)
+        )
+        return {name: _to_numpy(table.column(name)) for name in columns}
+
+    @staticmethod
+    def read_rows(
+        db: Session,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        columns: Sequence[str],
+        filters: Sequence[Tuple[str, str, Any]],
+        limit: int,
+        before: Optional[Tuple[datetime, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Newest cold rows of a time range, ordered by (timestamp, id) descending
+
+        Days are read newest first and reading stops once limit rows are
+        found, so a page near the hot/cold boundary only opens the
+        partitions it needs.
+
+        Args:
+            db: Database session
+            start: Range start, inclusive (None: unbounded)
+            end: Range end, inclusive (None: unbounded)
+            columns: Column names from COLD_COLUMN_NAMES (must include timestamp and id)
+            filters: Extra (column, operator, value) conditions, as in pyarrow.parquet filters
+            limit: Maximum rows to return
+            before: Only rows whose (timestamp, id) is below this key (keyset paging)
+
+        Returns:
+            List of row dictionaries
+
+        Raises:
+            RuntimeError: If partitions exist but pyarrow is not installed
+        """
+        paths_by_day = ColdTierService._paths_by_day(db, start, end, newest_first=True)
+        if not paths_by_day:
+            return []
+        if not ColdTierService.available():
+            raise RuntimeError("Reading cold partitions requires the pyarrow package")
+
+        condition = ColdTierService._row_filter(start, end, filters, before)
+        rows: List[Dict[str, Any]] = []
+        for paths in paths_by_day.values():
+            table = ds.dataset(paths, schema=_schema(), format="parquet").to_table(
+                columns=list(columns), filter=condition
+            )
+            if table.num_rows:
+                table = table.sort_by([("timestamp", "descending"), ("id", "descending")])
+                rows.extend(table.slice(0, limit - len(rows)).to_pylist())
+            if len(rows) >= limit:
+                break
+        return rows
+
+    @staticmethod
+    def iter_rows(
+        db: Session,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        columns: Sequence[str],
+        filters: Sequence[Tuple[str, str, Any]],
+        batch_size: Optional[int] = None
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream cold rows of a time range as tuples, ordered by (timestamp, id) ascending
+
+        Partition files are sorted when written, so each file is scanned in
+        batches and the files of a day are merged; days do not overlap in
+        time and are read one after another. Memory holds one batch per file
+        of the current day.
+
+        Args:
+            db: Database session
+            start: Range start, inclusive (None: unbounded)
+            end: Range end, inclusive (None: unbounded)
+            columns: Column names from COLD_COLUMN_NAMES
+            filters: Extra (column, operator, value) conditions, as in pyarrow.parquet filters
+            batch_size: Maximum rows read per batch
+
+        Yields:
+            Row tuples: timestamp, id, then the values of columns
+
+        Raises:
+            RuntimeError: If partitions exist but pyarrow is not installed
+        """
+        paths_by_day = ColdTierService._paths_by_day(db, start, end, newest_first=False)
+        if not paths_by_day:
+            return
+        if not ColdTierService.available():
+            raise RuntimeError("Reading cold partitions requires the pyarrow package")
+
+        condition = ColdTierService._row_filter(start, end, filters)
+        output_columns = ["timestamp", "id", *columns]
+        batch_size = batch_size or config.EXPORT_CHUNK_SIZE
+
+        def file_rows(path: str) -> Iterator[Tuple[Any, ...]]:
+            scanner = ds.dataset(path, schema=_schema(), format="parquet").scanner(
+                columns=list(dict.fromkeys(output_columns)), filter=condition,
+                batch_size=batch_size, use_threads=False
+            )
+            for batch in scanner.to_batches():
+                yield from zip(*(batch.column(name).to_pylist() for name in output_columns))
+
+        for paths in paths_by_day.values():
+            # 같은 날짜의 파일끼리는 시간이 겹칠 수 있으므로 (timestamp, id)로 병합
+            yield from heapq.merge(*(file_rows(path) for path in paths), key=lambda row: row[:2])
+
+    @staticmethod
+    def get_partitions(db: Session) -> List[Dict[str, Any]]:
+        """
+        Manifest entries, oldest first
+
+        Args:
+            db: Database session
+
+        Returns:
+            List of partition dictionaries
+        """
+        partitions = db.query(ColdPartition).order_by(ColdPartition.day, ColdPartition.first_id).all()
+        return [
+            {
+                "day": partition.day,
+                "path": partition.path,
+                "row_count": partition.row_count,
+                "first_id": partition.first_id,
+                "last_id": partition.last_id,
+                "size_bytes": partition.size_bytes,
+                "created_at": partition.created_at.isoformat()
+            }
+            for partition in partitions
+        ]
+
+    @staticmethod
+    def _hot_days(db: Session, before: date) -> List[date]:
+        # 날짜마다 timestamp 인덱스 탐색 한 번으로 다음 데이터가 있는 날짜로 이동
+        cutoff = datetime.combine(before, time())
+        days = []
+        cursor = datetime.min
+        while True:
+            timestamp = db.execute(
+                select(func.min(TrafficLog.timestamp)).where(TrafficLog.timestamp >= cursor)
+            ).scalar()
+            if timestamp is None or timestamp >= cutoff:
+                break
+            days.append(timestamp.date())
+            cursor = datetime.combine(timestamp.date() + timedelta(days=1), time())
+        db.rollback()
+        return days
+
+    @staticmethod
+    def _write_partition(db: Session, conditions: tuple, path: str) -> int:
+        schema = _schema()
+        stmt = select(*(expression for _, expression, _ in COLD_COLUMNS)).where(*conditions).order_by(
+            TrafficLog.timestamp, TrafficLog.id
+        )
+
+        written = 0
+        writer = pq.ParquetWriter(path, schema, compression="zstd", use_dictionary=DICTIONARY_COLUMNS)
+        try:
+            result = db.connection().execution_options(yield_per=config.COLD_TIER_ROW_GROUP_SIZE).execute(stmt)
+            for rows in result.partitions():
+                columns = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+                ))
+                written += len(rows)
+            result.close()
+        finally:
+            writer.close()
+            db.rollback()
+        return written
+
+    @staticmethod
+    def _paths_by_day(
+        db: Session, start: Optional[datetime], end: Optional[datetime], newest_first: bool
+    ) -> Dict[str, List[str]]:
+        day_order = ColdPartition.day.desc() if newest_first else ColdPartition.day
+        stmt = select(ColdPartition.day, ColdPartition.path).order_by(day_order, ColdPartition.first_id)
+        if start is not None:
+            stmt = stmt.where(ColdPartition.day >= start.date().isoformat())
+        if end is not None:
+            stmt = stmt.where(ColdPartition.day <= end.date().isoformat())
+        paths_by_day: Dict[str, List[str]] = {}
+        for day, path in db.execute(stmt).all():
+            paths_by_day.setdefault(day, []).append(os.path.join(config.COLD_TIER_DIR, path))
+        return paths_by_day
+
+    @staticmethod
+    def _row_filter(
+        start: Optional[datetime],
+        end: Optional[datetime],
+        filters: Sequence[Tuple[str, str, Any]],
+        before: Optional[Tuple[datetime, int]] = None
+    ) -> Any:
+        timestamp = ds.field("timestamp")
+        condition = pq.filters_to_expression([list(filters)]) if filters else None
+        bounds = []
+        if start is not None:
+            bounds.append(timestamp >= pa.scalar(start, type=pa.timestamp("us")))
+        if end is not None:
+            bounds.append(timestamp <= pa.scalar(end, type=pa.timestamp("us")))
+        if before is not None:
+            key_time = pa.scalar(before[0], type=pa.timestamp("us"))
+            bounds.append((timestamp < key_time) | ((timestamp == key_time) & (ds.field("id") < before[1])))
+        for bound in bounds:
+            condition = bound if condition is None else condition & bound
+        return condition
+
+    @staticmethod
+    def _time_filter(start: datetime, end: datetime, end_inclusive: bool) -> Any:
+        timestamp = ds.field("timestamp")
+        upper = pa.scalar(end, type=pa.timestamp("us"))
+        return (timestamp >= pa.scalar(start, type=pa.timestamp("us"))) & (
+            timestamp <= upper if end_inclusive else timestamp < upper
+        )
+
+
+def _to_numpy(column: Any) -> np.ndarray:
+    if pa.types.is_integer(column.type):
+        column = column.fill_null(0)
+    if isinstance(column, pa.ChunkedArray):
+        return column.to_numpy()
+    return column.to_numpy(zero_copy_only=False)
@@ -0,0 +1,266 @@
+"""
+Export Service - Streams filtered traffic_logs / alerts as CSV, NDJSON or Parquet
+
+Rows are read with a server-side cursor (yield_per) and encoded one
+partition at a time, so an export of any size holds a single chunk in
+memory. Log exports merge in the cold-tier rows of their range the same
+way. Parquet output writes one row group per chunk and needs the optional
+pyarrow package.
+"""
+import csv
+import heapq
+import io
+import itertools
+import json
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app import config
+from app.models.alert import Alert
+from app.models.traffic_log import TrafficLog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+# 형식별 MIME 타입과 파일 확장자
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+# 내보낼 수 있는 컬럼 (정의 순서 = 기본 출력 순서)
+LOG_EXPORT_COLUMNS = {
+    column.key: column for column in (
+        TrafficLog.id, TrafficLog.timestamp, TrafficLog.protocol, TrafficLog.src_ip, TrafficLog.src_port,
+        TrafficLog.dst_ip, TrafficLog.dst_port, TrafficLog.packets, TrafficLog.bytes, TrafficLog.cpu_id
+    )
+}
+ALERT_EXPORT_COLUMNS = {
+    column.key: column for column in (
+        Alert.id, Alert.detected_at, Alert.traffic_log_id, Alert.ml_model_id, Alert.risk_score, Alert.description
+    )
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that hands out what was written since the last drain
+
+    Tracks the absolute position itself because the Parquet writer records
+    column chunk offsets from tell().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+class ExportService:
+    """
+    Service for streaming bulk exports
+    """
+
+    @staticmethod
+    def parquet_available() -> bool:
+        """
+        Whether the optional pyarrow dependency is installed
+        """
+        return pq is not None
+
+    @staticmethod
+    def resolve_columns(available: Dict[str, Any], columns: Optional[str]) -> List[str]:
+        """
+        Parse a comma-separated column projection
+
+        Args:
+            available: Exportable columns (name -> column)
+            columns: Comma-separated column names, or None for all
+
+        Returns:
+            Selected column names in request order
+
+        Raises:
+            ValueError: If a column is unknown or the projection is empty
+        """
+        if columns is None:
+            return list(available)
+
+        names = [name.strip() for name in columns.split(",") if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)} (available: {', '.join(available)})")
+        if not names:
+            raise ValueError("No columns selected")
+        # 중복 지정은 한 번만 출력
+        return list(dict.fromkeys(names))
+
+    @staticmethod
+    def build_select(
+        available: Dict[str, Any],
+        names: Sequence[str],
+        conditions: Sequence[Any],
+        timestamp_column: Any,
+        id_column: Any
+    ) -> Select:
+        """
+        Projected, filtered SELECT in (timestamp, id) ascending order
+
+        Args:
+            available: Exportable columns (name -> column)
+            names: Selected column names
+            conditions: Filter expressions (same as the list endpoint)
+            timestamp_column: Ordering timestamp column
+            id_column: Primary key column (tie breaker)
+
+        Returns:
+            SELECT statement
+        """
+        return select(*(available[name] for name in names)).where(*conditions).order_by(
+            timestamp_column, id_column
+        )
+
+    @staticmethod
+    def iter_export(
+        db: Session,
+        stmt: Select,
+        names: Sequence[str],
+        fmt: str,
+        chunk_size: Optional[int] = None,
+        merge_rows: Optional[Iterator[Sequence[Any]]] = None,
+        key_columns: Sequence[Any] = ()
+    ) -> Iterator[bytes]:
+        """
+        Execute a SELECT and yield the encoded output chunk by chunk
+
+        Rows from another store (the cold tier) can be interleaved with the
+        statement's rows: both sides are already ordered, so they are merged
+        lazily and the output keeps the statement's order.
+
+        Args:
+            db: Database session (kept open until the generator finishes)
+            stmt: Statement from build_select
+            names: Column names of the statement
+            fmt: One of EXPORT_FORMATS
+            chunk_size: Rows fetched and encoded per chunk
+            merge_rows: Extra rows in the statement's order, each the key_columns values followed by the row
+            key_columns: Ordering columns of the statement (required with merge_rows)
+
+        Yields:
+            Encoded bytes (header, one block per chunk, footer)
+
+        Raises:
+            ValueError: If the format is unknown or pyarrow is missing for Parquet
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        if fmt == "parquet" and not ExportService.parquet_available():
+            raise ValueError("Parquet export requires the pyarrow package")
+
+        chunk_size = chunk_size or config.EXPORT_CHUNK_SIZE
+        encoders = {"csv": _encode_csv, "ndjson": _encode_ndjson, "parquet": _encode_parquet}
+        if merge_rows is None:
+            result = db.connection().execution_options(yield_per=chunk_size).execute(stmt)
+            partitions = result.partitions()
+        else:
+            # 정렬 키를 앞에 붙여 읽고 두 저장소의 행을 키 순서로 병합
+            keyed = stmt.with_only_columns(*key_columns, *stmt.selected_columns)
+            result = db.connection().execution_options(yield_per=chunk_size).execute(keyed)
+            partitions = _merged_partitions(result, merge_rows, len(key_columns), chunk_size)
+        try:
+            yield from encoders[fmt](partitions, names, stmt)
+        finally:
+            result.close()
+
+
+def _merged_partitions(
+    result: Any, merge_rows: Iterator[Sequence[Any]], key_length: int, chunk_size: int
+) -> Iterator[List[Sequence[Any]]]:
+    rows = heapq.merge(result, merge_rows, key=lambda row: tuple(row[:key_length]))
+    while True:
+        chunk = [row[key_length:] for row in itertools.islice(rows, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_csv(partitions: Iterator[Sequence[Any]], names: Sequence[str], stmt: Select) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(names)
+    for rows in partitions:
+        # datetime은 str()로 "YYYY-MM-DD HH:MM:SS[.ffffff]" 형식 (pandas/스프레드시트 호환)
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _encode_ndjson(partitions: Iterator[Sequence[Any]], names: Sequence[str], stmt: Select) -> Iterator[bytes]:
+    encoder = json.JSONEncoder(default=_json_default, separators=(",", ":"))
+    for rows in partitions:
+        yield "".join(encoder.encode(dict(zip(names, row))) + "\n" for row in rows).encode()
+
+
+def _arrow_type(column: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return pa.timestamp("us")
+    if python_type is int:
+        return pa.int64()
+    if python_type is float:
+        return pa.float64()
+    return pa.string()
+
+
+def _encode_parquet(partitions: Iterator[Sequence[Any]], names: Sequence[str], stmt: Select) -> Iterator[bytes]:
+    schema = pa.schema([
+        pa.field(name, _arrow_type(column)) for name, column in zip(names, stmt.selected_columns)
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        # 청크 하나 = row group 하나
+        for rows in partitions:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    # footer (행이 없어도 스키마만 있는 유효한 파일)
+    yield sink.drain()
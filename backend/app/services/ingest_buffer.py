@@ -0,0 +1,241 @@
+"""
+Write-behind ingest buffer with group commit
+
+Single-record POSTs are queued here and a background writer flushes them to
+traffic_logs in one transaction. The writer takes everything queued (up to the
+flush size) and commits as soon as the queue is empty, so a lone record is
+written at once while records arriving during a commit are grouped into the
+next one (same idea as CACHE_SIZE_THRESHOLD in logcollector).
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import config
+from app.database import SessionLocal
+from app.services.ingest_service import IngestService
+
+
+class IngestBuffer:
+    """
+    Bounded in-process queue flushed by a single background writer
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_size: int,
+        flush_size: int,
+        flush_interval_ms: int,
+        flush_retries: int = 0,
+        retry_backoff_ms: int = 100
+    ):
+        """
+        Initialize ingest buffer
+
+        Args:
+            session_factory: Factory for writer sessions
+            max_size: Maximum number of queued records
+            flush_size: Records per group commit
+            flush_interval_ms: How long the idle writer waits for a record
+                before checking for stop
+            flush_retries: Retries of a group commit that failed with a
+                transient database error (e.g. "database is locked")
+            retry_backoff_ms: Delay before the first retry, doubled per attempt
+        """
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.flush_retries = flush_retries
+        self.retry_backoff = retry_backoff_ms / 1000.0
+
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Future]]" = queue.Queue(maxsize=max_size)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self._enqueued = 0
+        self._flushed = 0
+        self._failed = 0
+        self._retried = 0
+        self._rejected = 0
+        self._flush_count = 0
+        self._last_flush_size = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Start the background writer thread
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ingest-buffer-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the writer after flushing everything still queued
+
+        If the final flush outlives the timeout the writer keeps running and
+        stays referenced, so running stays true and start() does not launch
+        a second writer next to it.
+
+        Args:
+            timeout: Maximum seconds to wait for the final flush
+        """
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._thread = None
+
+    def submit(self, row: Dict[str, Any]) -> Future:
+        """
+        Queue a prepared row for the next group commit
+
+        Args:
+            row: Column dictionary from IngestService.prepare_row
+
+        Returns:
+            Future resolved with the inserted ID once the row is durable
+
+        Raises:
+            queue.Full: If the buffer is at capacity
+        """
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((row, future))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise
+
+        with self._lock:
+            self._enqueued += 1
+        return future
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get buffer metrics
+
+        Returns:
+            Queue depth, throughput counters and flush latency
+        """
+        with self._lock:
+            return {
+                "running": self.running,
+                "queue_depth": self._queue.qsize(),
+                "max_size": self.max_size,
+                "flush_size": self.flush_size,
+                "flush_interval_ms": int(self.flush_interval * 1000),
+                "enqueued": self._enqueued,
+                "flushed": self._flushed,
+                "failed": self._failed,
+                "retried": self._retried,
+                "rejected": self._rejected,
+                "flush_count": self._flush_count,
+                "last_flush_size": self._last_flush_size,
+                "last_flush_ms": round(self._last_flush_ms, 3),
+                "avg_flush_ms": round(self._total_flush_ms / self._flush_count, 3) if self._flush_count else 0.0,
+                "max_flush_ms": round(self._max_flush_ms, 3)
+            }
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+            elif self._stop_event.is_set() and self._queue.empty():
+                return
+
+    def _collect_batch(self) -> List[Tuple[Dict[str, Any], Future]]:
+        # 첫 레코드를 기다린 뒤 큐에 쌓인 만큼만 가져감 (flush_size 한도)
+        # 큐가 비면 바로 커밋하므로 단건 요청은 대기 없이 기록되고, 커밋 중 도착한 레코드는 다음 배치로 묶임
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.flush_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        rows = [row for row, _ in batch]
+        start = time.perf_counter()
+
+        # 일시적 오류(잠금 등)는 backoff 후 같은 배치를 재시도, 소진 시에만 실패 처리
+        attempt = 0
+        while True:
+            try:
+                ids = self._commit(rows)
+                break
+            except OperationalError as e:
+                if attempt >= self.flush_retries:
+                    self._fail(batch, e)
+                    return
+                with self._lock:
+                    self._retried += 1
+                time.sleep(self.retry_backoff * (2 ** attempt))
+                attempt += 1
+            except Exception as e:
+                self._fail(batch, e)
+                return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._flushed += len(ids)
+            self._flush_count += 1
+            self._last_flush_size = len(ids)
+            self._last_flush_ms = elapsed_ms
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+
+        # executemany + RETURNING은 입력 순서대로 ID를 반환
+        for (_, future), log_id in zip(batch, ids):
+            future.set_result(log_id)
+
+    def _commit(self, rows: List[Dict[str, Any]]) -> List[int]:
+        db = self.session_factory()
+        try:
+            ids = IngestService.insert_rows(db, rows)
+            db.commit()
+            return ids
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _fail(self, batch: List[Tuple[Dict[str, Any], Future]], error: Exception) -> None:
+        with self._lock:
+            self._failed += len(batch)
+        for _, future in batch:
+            future.set_exception(error)
+
+
+ingest_buffer = IngestBuffer(
+    session_factory=SessionLocal,
+    max_size=config.INGEST_BUFFER_MAX_SIZE,
+    flush_size=config.INGEST_BUFFER_FLUSH_SIZE,
+    flush_interval_ms=config.INGEST_BUFFER_FLUSH_INTERVAL_MS,
+    flush_retries=config.INGEST_BUFFER_FLUSH_RETRIES,
+    retry_backoff_ms=config.INGEST_BUFFER_RETRY_BACKOFF_MS
+)
@@ -0,0 +1,247 @@
+"""
+Ingest Service - Bulk and streaming insertion of traffic logs
+"""
+from typing import Dict, Any, List, Iterable, AsyncIterator, Optional, Tuple
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import config
+from app.models.traffic_log import TrafficLog
+from app.schemas.traffic_log import TrafficLogCreate
+from app.services.rollup import RollupService
+
+
+class IngestService:
+    """
+    Service for traffic log ingestion
+    """
+
+    @staticmethod
+    def prepare_row(log_data: TrafficLogCreate) -> Dict[str, Any]:
+        """
+        Convert a validated log record into a column dictionary
+
+        Args:
+            log_data: Validated traffic log record
+
+        Returns:
+            Column dictionary ready for insertion
+        """
+        row = log_data.model_dump()
+
+        # timestamp가 제공되지 않으면 현재 시각 사용
+        if row.get("timestamp") is None:
+            row["timestamp"] = datetime.utcnow()
+
+        return row
+
+    @staticmethod
+    def insert_log(db: Session, log_data: TrafficLogCreate) -> TrafficLog:
+        """
+        Insert one traffic log and commit
+
+        Args:
+            db: Database session
+            log_data: Validated traffic log record
+
+        Returns:
+            Inserted TrafficLog row
+        """
+        db_log = TrafficLog(**IngestService.prepare_row(log_data))
+        db.add(db_log)
+        try:
+            db.flush()
+            RollupService.apply_id_range(db, db_log.id, db_log.id)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        db.refresh(db_log)
+        return db_log
+
+    @staticmethod
+    def insert_rows(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert prepared rows with a single executemany (no commit)
+
+        Rollup buckets are updated in the same transaction.
+
+        Args:
+            db: Database session
+            rows: Column dictionaries from prepare_row
+
+        Returns:
+            List of inserted IDs (in the same order as rows)
+        """
+        if not rows:
+            return []
+
+        stmt = insert(TrafficLog).returning(TrafficLog.id, sort_by_parameter_order=True)
+        ids = list(db.execute(stmt, rows).scalars().all())
+        RollupService.apply_id_range(db, min(ids), max(ids))
+        return ids
+
+    @staticmethod
+    def bulk_insert(db: Session, logs: Iterable[TrafficLogCreate]) -> Dict[str, Any]:
+        """
+        Insert many traffic logs in one transaction
+
+        Args:
+            db: Database session
+            logs: Validated traffic log records
+
+        Returns:
+            Inserted count and ID range
+        """
+        rows = [IngestService.prepare_row(log) for log in logs]
+
+        try:
+            ids = IngestService.insert_rows(db, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return {
+            "inserted": len(ids),
+            "first_id": min(ids) if ids else None,
+            "last_id": max(ids) if ids else None
+        }
+
+    @staticmethod
+    async def iter_ndjson_lines(
+        chunks: AsyncIterator[bytes],
+        max_line_bytes: int
+    ) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+        """
+        Split a chunked byte stream into NDJSON lines as it arrives
+
+        Only the current partial line is buffered, so memory is bounded by
+        max_line_bytes regardless of stream length.
+
+        Args:
+            chunks: Async iterator of raw body chunks
+            max_line_bytes: Maximum accepted line length
+
+        Yields:
+            Tuple of (1-based line number, line bytes or None if too long)
+        """
+        buffer = b""
+        line_no = 0
+        oversized = False
+
+        async for chunk in chunks:
+            lines = (buffer + chunk).split(b"\n")
+            buffer = lines.pop()
+            for line in lines:
+                line_no += 1
+                if oversized or len(line) > max_line_bytes:
+                    oversized = False
+                    yield line_no, None
+                elif line.strip():
+                    yield line_no, line
+
+            # 개행 없이 한도를 넘으면 라인 끝까지 버림
+            if len(buffer) > max_line_bytes:
+                oversized = True
+                buffer = b""
+
+        if oversized or buffer.strip():
+            line_no += 1
+            yield line_no, None if oversized else buffer
+
+    @staticmethod
+    async def ingest_ndjson_stream(
+        db: Session,
+        chunks: AsyncIterator[bytes],
+        batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse an NDJSON stream line by line and commit it in micro-batches
+
+        Invalid lines are reported and skipped without aborting the stream.
+        The next chunk is only read after the current batch is committed,
+        so a slow database pushes back on the sender.
+
+        Args:
+            db: Database session
+            chunks: Async iterator of raw body chunks
+            batch_size: Records per commit (defaults to INGEST_STREAM_BATCH_SIZE)
+
+        Returns:
+            Summary with inserted/failed counts, ID range and per-line errors
+        """
+        batch_size = batch_size or config.INGEST_STREAM_BATCH_SIZE
+        summary = {
+            "inserted": 0,
+            "failed": 0,
+            "batches": 0,
+            "first_id": None,
+            "last_id": None,
+            "errors": []
+        }
+
+        def report(line_no: int, message: str, count: int = 1) -> None:
+            summary["failed"] += count
+            if len(summary["errors"]) < config.INGEST_STREAM_MAX_REPORTED_ERRORS:
+                summary["errors"].append({"line": line_no, "error": message})
+
+        def commit_batch(rows: List[Dict[str, Any]]) -> List[int]:
+            try:
+                ids = IngestService.insert_rows(db, rows)
+                db.commit()
+                return ids
+            except Exception:
+                db.rollback()
+                raise
+
+        async def flush(rows: List[Dict[str, Any]], first_line: int) -> None:
+            try:
+                ids = await run_in_threadpool(commit_batch, rows)
+            except Exception as e:
+                report(first_line, f"batch of {len(rows)} failed: {str(e)}", len(rows))
+                return
+
+            summary["batches"] += 1
+            summary["inserted"] += len(ids)
+            if ids:
+                low, high = min(ids), max(ids)
+                if summary["first_id"] is None or low < summary["first_id"]:
+                    summary["first_id"] = low
+                if summary["last_id"] is None or high > summary["last_id"]:
+                    summary["last_id"] = high
+
+        rows: List[Dict[str, Any]] = []
+        first_line = 0
+
+        async for line_no, line in IngestService.iter_ndjson_lines(
+            chunks, config.INGEST_STREAM_MAX_LINE_BYTES
+        ):
+            if line is None:
+                report(line_no, f"line exceeds {config.INGEST_STREAM_MAX_LINE_BYTES} bytes")
+                continue
+
+            try:
+                log_data = TrafficLogCreate.model_validate_json(line)
+            except ValidationError as e:
+                report(line_no, "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc']) or 'line'}: {err['msg']}"
+                    for err in e.errors()
+                ))
+                continue
+
+            if not rows:
+                first_line = line_no
+            rows.append(IngestService.prepare_row(log_data))
+
+            if len(rows) >= batch_size:
+                await flush(rows, first_line)
+                rows = []
+
+        if rows:
+            await flush(rows, first_line)
+
+        return summary
@@ -0,0 +1,306 @@
+"""
+Background job queue for model training, range scans and cold tiering
+
+Jobs are persisted in the jobs table and executed by a small pool of worker
+threads fed from a local queue, so long requests return a job id right away.
+The pool size (JOB_WORKERS) caps how many trainings/scans run at once so
+they cannot starve the ingest path. Cancellation is cooperative: a queued job
+is cancelled immediately, a running job stops at its next progress update.
+Training reports progress between per-day fits and before the artifact is
+written, so a cancelled training leaves no model behind. Submitting while
+the workers are not running (JOB_QUEUE_ENABLED=false) is rejected.
+"""
+import queue
+import threading
+from datetime import date, datetime
+from typing import Dict, Any, Callable, List, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import config
+from app.database import SessionLocal
+from app.models.job import Job
+
+JOB_TYPES = ("train", "scan", "tier")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a job handler when cancellation was requested
+    """
+
+
+class JobQueueUnavailable(Exception):
+    """
+    Raised on submit when no worker is running (JOB_QUEUE_ENABLED=false)
+    """
+
+
+class JobContext:
+    """
+    Handle passed to job handlers for progress reporting and cancellation
+    """
+
+    def __init__(self, job_queue: "JobQueue", job_id: int):
+        self.job_queue = job_queue
+        self.job_id = job_id
+
+    def update(self, progress: float, message: Optional[str] = None) -> None:
+        """
+        Persist progress and stop the job if cancellation was requested
+
+        Args:
+            progress: Completed fraction (0-1)
+            message: Short stage / status message
+
+        Raises:
+            JobCancelled: If cancellation was requested
+        """
+        db = self.job_queue.session_factory()
+        try:
+            job = db.get(Job, self.job_id)
+            job.progress = min(max(progress, 0.0), 1.0)
+            if message is not None:
+                job.message = message
+            db.commit()
+            cancelled = job.cancel_requested
+        finally:
+            db.close()
+
+        if cancelled:
+            raise JobCancelled()
+
+
+class JobQueue:
+    """
+    Local job queue with a worker thread pool and job state in SQLite
+    """
+
+    def __init__(self, session_factory: sessionmaker, workers: int):
+        """
+        Initialize job queue
+
+        Args:
+            session_factory: Factory for worker sessions
+            workers: Number of worker threads (max concurrent jobs)
+        """
+        self.session_factory = session_factory
+        self.workers = workers
+
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._handlers: Dict[str, Callable[[Session, Dict[str, Any], JobContext], Dict[str, Any]]] = {
+            "train": _run_train,
+            "scan": _run_scan,
+            "tier": _run_tier
+        }
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        """
+        Recover persisted jobs and start the worker threads
+        """
+        if self.running:
+            return
+        self._recover()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers after their current job
+
+        Args:
+            timeout: Maximum seconds to wait per worker
+        """
+        if not self.running:
+            return
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, db: Session, job_type: str, params: Dict[str, Any]) -> Job:
+        """
+        Persist a new job and queue it
+
+        Args:
+            db: Database session
+            job_type: Job type (train, scan, tier)
+            params: JSON-serializable job parameters
+
+        Returns:
+            Created Job row
+
+        Raises:
+            ValueError: If the job type is unknown
+            JobQueueUnavailable: If the workers are not running (the job
+                would stay queued until the next start)
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unsupported job type: {job_type}")
+        if not self.running:
+            raise JobQueueUnavailable("Job queue is not running (JOB_QUEUE_ENABLED=false)")
+
+        job = Job(job_type=job_type, status="queued", params=params, created_at=datetime.utcnow())
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self._queue.put(job.id)
+        return job
+
+    def cancel(self, db: Session, job_id: int) -> Job:
+        """
+        Request cancellation of a job
+
+        Args:
+            db: Database session
+            job_id: Job ID
+
+        Returns:
+            Updated Job row
+
+        Raises:
+            ValueError: If job not found
+        """
+        job = db.get(Job, job_id)
+        if not job:
+            raise ValueError(f"Job not found: {job_id}")
+
+        if job.status not in FINISHED_STATUSES:
+            job.cancel_requested = True
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = datetime.utcnow()
+            db.commit()
+            db.refresh(job)
+        return job
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get worker pool status
+
+        Returns:
+            Worker count and local queue depth
+        """
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "alive_workers": sum(thread.is_alive() for thread in self._threads),
+            "queue_depth": self._queue.qsize()
+        }
+
+    def _recover(self) -> None:
+        # 재시작 전에 실행 중이던 작업은 실패 처리, 대기 중이던 작업은 다시 큐에 넣음
+        db = self.session_factory()
+        try:
+            db.query(Job).filter(Job.status == "running").update({
+                "status": "failed",
+                "error": "Interrupted by server restart",
+                "finished_at": datetime.utcnow()
+            })
+            db.commit()
+            queued = db.query(Job.id).filter(Job.status == "queued").order_by(Job.id).all()
+        finally:
+            db.close()
+
+        for (job_id,) in queued:
+            self._queue.put(job_id)
+
+    def _run(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            self._execute(job_id)
+
+    def _execute(self, job_id: int) -> None:
+        db = self.session_factory()
+        try:
+            job = db.get(Job, job_id)
+            # 대기 중 취소된 작업은 건너뜀
+            if job is None or job.status != "queued":
+                return
+
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            context = JobContext(self, job_id)
+            try:
+                result = self._handlers[job.job_type](db, dict(job.params), context)
+                status, error = "succeeded", None
+            except JobCancelled:
+                result, status, error = None, "cancelled", None
+            except Exception as e:
+                result, status, error = None, "failed", str(e)
+
+            db.rollback()
+            job = db.get(Job, job_id)
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            if status == "succeeded":
+                job.progress = 1.0
+            db.commit()
+        finally:
+            db.close()
+
+
+def _run_train(db: Session, params: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    from app.services.ml_service import MLService
+
+    context.update(0.0, "loading")
+    return MLService.train_model(
+        db=db,
+        name=params["name"],
+        start_date=datetime.fromisoformat(params["start_date"]),
+        end_date=datetime.fromisoformat(params["end_date"]),
+        algorithm=params.get("algorithm", "isolation_forest"),
+        params=params.get("params") or {},
+        progress=context.update,
+        incremental=params.get("incremental", False),
+        sample=params.get("sample")
+    )
+
+
+def _run_scan(db: Session, params: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    from app.services.range_scan import RangeScanService
+
+    progress = None
+    for progress in RangeScanService.iter_scan(
+        db,
+        model_id=params["model_id"],
+        start_date=datetime.fromisoformat(params["start_date"]),
+        end_date=datetime.fromisoformat(params["end_date"]),
+        chunk_size=params.get("chunk_size"),
+        min_risk_score=params.get("min_risk_score", 0)
+    ):
+        fraction = progress["scanned"] / progress["total"] if progress["total"] else 1.0
+        context.update(fraction, f"{progress['scanned']:,}/{progress['total']:,} logs, "
+                                 f"{progress['alerts_created']:,} alerts")
+    return progress
+
+
+def _run_tier(db: Session, params: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+    from app.services.cold_tier import ColdTierService
+
+    context.update(0.0, "finding closed days")
+    before = params.get("before")
+    return ColdTierService.tier_closed_days(
+        db, before=date.fromisoformat(before) if before else None, progress=context.update
+    )
+
+
+job_queue = JobQueue(session_factory=SessionLocal, workers=config.JOB_WORKERS)
@@ -0,0 +1,310 @@
+"""
+Log Import Service - Copies logcollector SQLite files into traffic_logs
+
+The C daemon writes logs.db and renames it to logs_<epoch>.db once
+DB_MAX_SIZE_MB is reached. Each rolled file is ATTACHed and copied with a
+single INSERT ... SELECT; a per-file watermark (last source id) makes re-runs
+incremental.
+
+Usage:
+    python -m app.services.log_import [--dir ../logcollector] [--watch]
+"""
+import argparse
+import glob
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from app import config
+from app.database import engine as default_engine
+from app.models.import_watermark import ImportWatermark
+from app.services.rollup import RollupService
+
+ROLLED_FILE_PATTERN = "logs_*.db"
+
+# logcollector는 timestamp를 epoch 정수로 저장하므로 SQLAlchemy DateTime 문자열 형식으로 변환
+# (ip_to_numeric / protocol_to_numeric은 app.database에서 등록한 SQL 함수)
+IMPORT_SQL = text("""
+    INSERT INTO main.traffic_logs
+        (protocol, src_ip, src_port, dst_ip, dst_port, packets, bytes, timestamp, cpu_id,
+         src_ip_numeric, dst_ip_numeric, protocol_numeric)
+    SELECT protocol, src_ip, src_port, dst_ip, dst_port, packets, bytes,
+           datetime(timestamp, 'unixepoch') || '.000000', cpu_id,
+           ip_to_numeric(src_ip), ip_to_numeric(dst_ip), protocol_to_numeric(protocol)
+    FROM src.traffic_logs
+    WHERE id > :last_id AND id <= :max_id
+    ORDER BY id
+""")
+
+MAX_LOG_ID_SQL = text("SELECT MAX(id) FROM main.traffic_logs")
+
+
+class LogImportService:
+    """
+    Service for importing logcollector database files
+    """
+
+    @staticmethod
+    def list_rolled_files(directory: str) -> List[str]:
+        """
+        List rolled logcollector DB files in roll order
+
+        The active logs.db is skipped: it is recreated with ids starting from 1
+        after every roll, so an id watermark cannot track it.
+
+        Args:
+            directory: logcollector working directory
+
+        Returns:
+            List of file paths, oldest roll first
+        """
+        return sorted(
+            glob.glob(os.path.join(directory, ROLLED_FILE_PATTERN)),
+            key=lambda path: os.path.basename(path)[len("logs_"):-len(".db")].zfill(20)
+        )
+
+    @staticmethod
+    def import_file(path: str, engine: Engine = default_engine) -> Dict[str, Any]:
+        """
+        Copy new rows of one logcollector DB file into traffic_logs
+
+        Args:
+            path: Path to the logcollector DB file
+            engine: Target (backend) database engine
+
+        Returns:
+            Per-file result with imported row count and throughput
+        """
+        source_file = os.path.basename(path)
+        start = time.perf_counter()
+
+        with engine.connect() as conn:
+            # ATTACH는 트랜잭션 밖에서 실행해야 함
+            conn.exec_driver_sql("ATTACH DATABASE ? AS src", (os.path.abspath(path),))
+            conn.commit()
+            try:
+                # pysqlite는 첫 DML 직전에야 BEGIN을 보내므로, 워터마크와 MAX(id)를 읽기 전에
+                # 쓰기 잠금을 잡아 그 사이 다른 writer의 행이 롤업에 두 번 반영되지 않게 함
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                last_id = conn.execute(
+                    select(ImportWatermark.last_source_id).where(
+                        ImportWatermark.source_file == source_file
+                    )
+                ).scalar() or 0
+                max_id = conn.execute(text("SELECT MAX(id) FROM src.traffic_logs")).scalar() or 0
+
+                imported = 0
+                if max_id > last_id:
+                    previous_log_id = conn.execute(MAX_LOG_ID_SQL).scalar() or 0
+                    imported = conn.execute(
+                        IMPORT_SQL, {"last_id": last_id, "max_id": max_id}
+                    ).rowcount
+                    RollupService.apply_id_range(conn, previous_log_id + 1, conn.execute(MAX_LOG_ID_SQL).scalar())
+
+                    stmt = sqlite_insert(ImportWatermark).values(
+                        source_file=source_file,
+                        last_source_id=max_id,
+                        imported_rows=imported,
+                        updated_at=datetime.utcnow()
+                    )
+                    conn.execute(stmt.on_conflict_do_update(
+                        index_elements=[ImportWatermark.source_file],
+                        set_={
+                            "last_source_id": max_id,
+                            "imported_rows": ImportWatermark.imported_rows + imported,
+                            "updated_at": datetime.utcnow()
+                        }
+                    ))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.exec_driver_sql("DETACH DATABASE src")
+                conn.commit()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "file": source_file,
+            "imported": imported,
+            "last_source_id": max(max_id, last_id),
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "rows_per_sec": round(imported / elapsed, 1) if imported and elapsed > 0 else 0.0
+        }
+
+    @staticmethod
+    def import_directory(
+        directory: Optional[str] = None,
+        engine: Engine = default_engine
+    ) -> Dict[str, Any]:
+        """
+        Import every rolled logcollector DB file found in a directory
+
+        Args:
+            directory: logcollector working directory (defaults to LOGCOLLECTOR_DB_DIR)
+            engine: Target (backend) database engine
+
+        Returns:
+            Per-file results and the total imported row count
+        """
+        directory = directory or config.LOGCOLLECTOR_DB_DIR
+        if not os.path.isdir(directory):
+            raise ValueError(f"logcollector directory not found: {directory}")
+
+        results = []
+        for path in LogImportService.list_rolled_files(directory):
+            try:
+                results.append(LogImportService.import_file(path, engine))
+            except Exception as e:
+                results.append({"file": os.path.basename(path), "imported": 0, "error": str(e)})
+
+        return {
+            "directory": directory,
+            "files": results,
+            "total_imported": sum(result["imported"] for result in results)
+        }
+
+
+class LogImportWatcher:
+    """
+    Background thread that polls the logcollector directory for new rolls
+    """
+
+    def __init__(self, directory: str, interval_sec: int, engine: Engine = default_engine):
+        """
+        Initialize watcher
+
+        Args:
+            directory: logcollector working directory
+            interval_sec: Polling interval in seconds
+            engine: Target (backend) database engine
+        """
+        self.directory = directory
+        self.interval_sec = interval_sec
+        self.engine = engine
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._total_imported = 0
+        self._last_run_at: Optional[str] = None
+        self._last_result: Optional[Dict[str, Any]] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Start polling in a background thread
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="log-import-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop polling
+
+        Args:
+            timeout: Maximum seconds to wait for the current import
+        """
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def run_once(self) -> Dict[str, Any]:
+        """
+        Import new rolls immediately
+
+        Returns:
+            Result of LogImportService.import_directory
+        """
+        try:
+            result = LogImportService.import_directory(self.directory, engine=self.engine)
+            error = None
+        except Exception as e:
+            result, error = None, str(e)
+
+        with self._lock:
+            self._runs += 1
+            self._last_run_at = datetime.utcnow().isoformat()
+            self._last_error = error
+            if result is not None:
+                self._last_result = result
+                self._total_imported += result["total_imported"]
+        return result
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get watcher status
+
+        Returns:
+            Run counters and the last import result
+        """
+        with self._lock:
+            return {
+                "running": self.running,
+                "directory": self.directory,
+                "interval_sec": self.interval_sec,
+                "runs": self._runs,
+                "total_imported": self._total_imported,
+                "last_run_at": self._last_run_at,
+                "last_error": self._last_error,
+                "last_result": self._last_result
+            }
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(self.interval_sec)
+
+
+log_import_watcher = LogImportWatcher(
+    directory=config.LOGCOLLECTOR_DB_DIR,
+    interval_sec=config.LOGCOLLECTOR_WATCH_INTERVAL_SEC
+)
+
+
+def main():
+    from app.database import Base
+    from app.models import traffic_log  # noqa: F401 (register tables)
+
+    parser = argparse.ArgumentParser(description="Import logcollector rolled DB files into app.db")
+    parser.add_argument("--dir", default=config.LOGCOLLECTOR_DB_DIR, help="logcollector directory")
+    parser.add_argument("--watch", action="store_true", help="Keep polling for new rolls")
+    parser.add_argument("--interval", type=int, default=config.LOGCOLLECTOR_WATCH_INTERVAL_SEC,
+                        help="Polling interval in seconds (with --watch)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=default_engine)
+
+    while True:
+        result = LogImportService.import_directory(args.dir)
+        for file_result in result["files"]:
+            if "error" in file_result:
+                print(f"[ERROR] {file_result['file']}: {file_result['error']}")
+            elif file_result["imported"]:
+                print(f"[OK] {file_result['file']}: {file_result['imported']:,} rows "
+                      f"({file_result['rows_per_sec']:,.0f} rows/s)")
+        print(f"Total imported: {result['total_imported']:,}")
+
+        if not args.watch:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,20 @@
 """
 ML Service - Orchestrates ML operations
 """
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Callable, Optional, Tuple
+from datetime import datetime, date, time, timedelta
 from sqlalchemy.orm import Session
 from pathlib import Path
+import os
 
-from app.models.traffic_log import TrafficLog
 from app.models.ml_model import MLModel
 from app.ml.trainer import ModelTrainer
-from app.ml.predictor import ModelPredictor
+from app.ml.merger import ModelMerger
+from app.ml.incremental import IncrementalTrainer
+from app.ml.model_cache import model_cache
 from app.ml.preprocessor import TrafficLogPreprocessor
+from app.services.rollup import RollupService
+from app.services.training_data import TrainingDataLoader
 
 
 class MLService:
@@ -18,41 +22,6 @@ class MLService:
     Service for ML operations
     """
 
-    @staticmethod
-    def get_training_data(
-        db: Session,
-        start_date: datetime,
-        end_date: datetime
-    ) -> List[Dict[str, Any]]:
-        """
-        Fetch training data from database
-
-        Args:
-            db: Database session
-            start_date: Start datetime
-            end_date: End datetime
-
-        Returns:
-            List of log dictionaries
-        """
-        logs = db.query(TrafficLog).filter(
-            TrafficLog.timestamp >= start_date,
-            TrafficLog.timestamp <= end_date
-        ).all()
-
-        return [
-            {
-                "protocol": log.protocol,
-                "src_ip": log.src_ip,
-                "src_port": log.src_port,
-                "dst_ip": log.dst_ip,
-                "dst_port": log.dst_port,
-                "packets": log.packets,
-                "bytes": log.bytes
-            }
-            for log in logs
-        ]
-
     @staticmethod
     def train_model(
         db: Session,
@@ -60,7 +29,10 @@ class MLService:
         start_date: datetime,
         end_date: datetime,
         algorithm: str,
-        params: Dict[str, Any]
+        params: Dict[str, Any],
+        progress: Optional[Callable[[float, str], None]] = None,
+        incremental: bool = False,
+        sample: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Train new ML model
@@ -72,19 +44,40 @@ class MLService:
             end_date: Training data end date
             algorithm: Algorithm name
             params: Model parameters
+            progress: Optional callback(fraction, stage) for job progress
+            incremental: Train one sub-forest per day (refreshable model)
+            sample: Subsample spec (size, method, stratify_by, seed); the
+                sample actually drawn is stored in the model artifact
 
         Returns:
             Training result
         """
-        # Fetch training data
-        training_data = MLService.get_training_data(db, start_date, end_date)
-
-        if len(training_data) == 0:
+        progress = progress or (lambda fraction, stage: None)
+
+        if incremental:
+            if sample:
+                raise ValueError("Sampling is not supported for incremental training")
+            return MLService._train_incremental(
+                db, name, start_date, end_date, algorithm, params, progress
+            )
+
+        # Fetch training data (column arrays, read in chunks, or a random sample)
+        extra = {}
+        if sample:
+            training_data, extra["training_sample"] = TrainingDataLoader.sample_columns(
+                db, start_date, end_date, **sample
+            )
+        else:
+            training_data = TrainingDataLoader.load_columns(db, start_date, end_date)
+
+        if TrainingDataLoader.count_rows(training_data) == 0:
             raise ValueError("No training data found for the specified period")
 
+        progress(0.3, "training")
+
         # Train model
         trainer = ModelTrainer()
-        result = trainer.train(training_data, algorithm, params, name)
+        result = trainer.train(training_data, algorithm, params, name, extra, progress=progress)
 
         # Save model metadata to database
         ml_model = MLModel(
@@ -92,7 +85,9 @@ class MLService:
             start_date=start_date,
             end_date=end_date,
             model_path=result["model_path"],
-            created_at=datetime.utcnow()
+            created_at=datetime.utcnow(),
+            training_sample=extra.get("training_sample"),
+            **MLService._metadata_columns(result)
         )
         db.add(ml_model)
         db.commit()
@@ -105,9 +100,171 @@ class MLService:
             "algorithm": result["algorithm"],
             "params": result["params"],
             "training_samples": result["training_samples"],
-            "created_at": ml_model.created_at.isoformat()
+            "created_at": ml_model.created_at.isoformat(),
+            "version": ml_model.version,
+            "training_sample": extra.get("training_sample"),
+            "training_duration_ms": ml_model.training_duration_ms
         }
 
+    @staticmethod
+    def refresh_model(db: Session, model_id: int, day: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Refresh an incremental model with one new day of data
+
+        Only the new day is fitted; the oldest day leaves the window. The
+        result is saved as a new MLModel (same name, version + 1).
+
+        Args:
+            db: Database session
+            model_id: ID of the incremental model
+            day: Day to add (defaults to the day after the model's end date)
+
+        Returns:
+            Training result of the new model version
+
+        Raises:
+            ValueError: If model not found, not incremental or the day has no data
+        """
+        ml_model = db.query(MLModel).filter(MLModel.id == model_id).first()
+        if not ml_model:
+            raise ValueError(f"Model not found: {model_id}")
+        if not ml_model.model_path:
+            raise ValueError(f"Model path not found for model: {model_id}")
+
+        day = day or (ml_model.end_date.date() + timedelta(days=1))
+        day_start, day_end = MLService._day_bounds(day)
+        logs = TrainingDataLoader.load_columns(db, day_start, day_end)
+        if TrainingDataLoader.count_rows(logs) == 0:
+            raise ValueError(f"No training data found for {day.isoformat()}")
+
+        trainer = IncrementalTrainer()
+        result = trainer.refresh(ml_model.model_path, day, logs, ml_model.name)
+
+        return MLService._save_incremental(db, ml_model.name, result, parent=ml_model)
+
+    @staticmethod
+    def _train_incremental(
+        db: Session,
+        name: str,
+        start_date: datetime,
+        end_date: datetime,
+        algorithm: str,
+        params: Dict[str, Any],
+        progress: Callable[[float, str], None]
+    ) -> Dict[str, Any]:
+        day_logs = {}
+        day = start_date.date()
+        while day <= end_date.date():
+            day_start, day_end = MLService._day_bounds(day)
+            logs = TrainingDataLoader.load_columns(
+                db, max(day_start, start_date), min(day_end, end_date)
+            )
+            if TrainingDataLoader.count_rows(logs):
+                day_logs[day] = logs
+            day += timedelta(days=1)
+
+        if not day_logs:
+            raise ValueError("No training data found for the specified period")
+
+        progress(0.3, "training")
+
+        trainer = IncrementalTrainer()
+        result = trainer.train(day_logs, algorithm, params, name, progress=progress)
+        return MLService._save_incremental(db, name, result)
+
+    @staticmethod
+    def _save_incremental(
+        db: Session,
+        name: str,
+        result: Dict[str, Any],
+        parent: Optional[MLModel] = None
+    ) -> Dict[str, Any]:
+        ml_model = MLModel(
+            name=name,
+            start_date=MLService._day_bounds(result["window_start"])[0],
+            end_date=MLService._day_bounds(result["window_end"])[1],
+            model_path=result["model_path"],
+            version=parent.version + 1 if parent else 1,
+            parent_model_id=parent.id if parent else None,
+            created_at=datetime.utcnow(),
+            **MLService._metadata_columns(result)
+        )
+        db.add(ml_model)
+        db.commit()
+        db.refresh(ml_model)
+
+        return {
+            "model_id": ml_model.id,
+            "name": ml_model.name,
+            "model_path": ml_model.model_path,
+            "algorithm": result["algorithm"],
+            "params": result["params"],
+            "training_samples": result["training_samples"],
+            "created_at": ml_model.created_at.isoformat(),
+            "version": ml_model.version,
+            "training_duration_ms": ml_model.training_duration_ms
+        }
+
+    @staticmethod
+    def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+        return datetime.combine(day, time.min), datetime.combine(day, time.max)
+
+    @staticmethod
+    def _metadata_columns(result: Dict[str, Any]) -> Dict[str, Any]:
+        # 학습/병합 결과에서 MLModel 메타데이터 컬럼 값 추출
+        return {
+            "algorithm": result["algorithm"],
+            "params": result["params"],
+            "trained_at": datetime.fromisoformat(result["trained_at"]),
+            "training_samples": result["training_samples"],
+            "artifact_size": os.path.getsize(result["model_path"]),
+            "feature_schema_version": result.get("feature_schema_version"),
+            "training_duration_ms": result.get("training_duration_ms")
+        }
+
+    @staticmethod
+    def merge_models(db: Session, model_ids: List[int], name: str) -> MLModel:
+        """
+        Merge trained models into a new usable model without retraining
+
+        Args:
+            db: Database session
+            model_ids: IDs of models to merge
+            name: Name for the merged model
+
+        Returns:
+            Created MLModel row
+
+        Raises:
+            LookupError: If any model ID does not exist
+            ValueError: If a model has no artifact or cannot be merged
+        """
+        models = db.query(MLModel).filter(MLModel.id.in_(model_ids)).all()
+        if len(models) != len(set(model_ids)):
+            raise LookupError("One or more model IDs not found")
+
+        missing = [model.id for model in models if not model.model_path]
+        if missing:
+            raise ValueError(f"Models without a trained artifact cannot be merged: {missing}")
+
+        merger = ModelMerger()
+        result = merger.merge([model.model_path for model in models], name)
+
+        # Calculate date range (min start_date, max end_date)
+        merged_model = MLModel(
+            name=name,
+            start_date=min(model.start_date for model in models),
+            end_date=max(model.end_date for model in models),
+            model_path=merger.model_path,
+            is_merged=True,
+            created_at=datetime.utcnow(),
+            **MLService._metadata_columns(result)
+        )
+        db.add(merged_model)
+        db.commit()
+        db.refresh(merged_model)
+        return merged_model
+
     @staticmethod
     def analyze_logs(
         db: Session,
@@ -133,8 +290,8 @@ class MLService:
         if not ml_model.model_path:
             raise ValueError(f"Model path not found for model: {model_id}")
 
-        # Load predictor
-        predictor = ModelPredictor(ml_model.model_path)
+        # Load predictor (cached across requests)
+        predictor = model_cache.get(ml_model.id, ml_model.model_path)
 
         # Predict
         results = predictor.predict(logs)
@@ -149,7 +306,8 @@ class MLService:
     def get_statistics(
         db: Session,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        source: str = "rollup"
     ) -> Dict[str, Any]:
         """
         Get statistical analysis of logs
@@ -158,26 +316,19 @@ class MLService:
             db: Database session
             start_date: Start datetime
             end_date: End datetime
+            source: "rollup" merges pre-aggregated time buckets (raw rows only
+                at unaligned edges; top IPs and quantiles come from sketches);
+                "raw" loads every row for exact medians and top IPs
 
         Returns:
             Statistical metrics
         """
-        # Fetch logs
-        logs = MLService.get_training_data(db, start_date, end_date)
-
-        if len(logs) == 0:
-            return {
-                "period": {
-                    "start": start_date.isoformat(),
-                    "end": end_date.isoformat()
-                },
-                "statistics": {},
-                "anomalies_detected": 0
-            }
-
-        # Compute statistics
-        preprocessor = TrafficLogPreprocessor()
-        stats = preprocessor.compute_statistics(logs)
+        if source == "rollup":
+            stats = RollupService.get_statistics(db, start_date, end_date)
+        elif source == "raw":
+            stats = MLService._raw_statistics(db, start_date, end_date)
+        else:
+            raise ValueError(f"Unsupported statistics source: {source}")
 
         return {
             "period": {
@@ -188,10 +339,57 @@ class MLService:
             "anomalies_detected": 0  # This would require a trained model
         }
 
+    @staticmethod
+    def get_top_talkers(
+        db: Session,
+        start_date: datetime,
+        end_date: datetime,
+        dimension: str,
+        limit: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Get approximate top talkers from the rollup heavy-hitter sketches
+
+        Args:
+            db: Database session
+            start_date: Start datetime
+            end_date: End datetime
+            dimension: Column to rank ("src_ip", "dst_ip" or "dst_port")
+            limit: Number of values to return
+
+        Returns:
+            Top values with count bounds and the maximum error
+        """
+        return {
+            "period": {
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat()
+            },
+            "dimension": dimension,
+            **RollupService.get_top_talkers(db, start_date, end_date, dimension, limit)
+        }
+
+    @staticmethod
+    def _raw_statistics(db: Session, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        # Fetch only the columns used by statistics
+        logs = TrainingDataLoader.load_columns(db, start_date, end_date, columns=["packets", "bytes"])
+        if TrainingDataLoader.count_rows(logs) == 0:
+            return {}
+
+        # Compute statistics
+        preprocessor = TrafficLogPreprocessor()
+        stats = preprocessor.compute_statistics(logs)
+
+        # 상위 IP / 프로토콜 분포는 원본 문자열로 집계 (정수 인코딩은 IPv6 등을 잃음)
+        stats["top_src_ips"] = TrainingDataLoader.value_counts(db, start_date, end_date, "src_ip", limit=10)
+        stats["top_dst_ips"] = TrainingDataLoader.value_counts(db, start_date, end_date, "dst_ip", limit=10)
+        stats["protocol_distribution"] = TrainingDataLoader.value_counts(db, start_date, end_date, "protocol")
+        return stats
+
     @staticmethod
     def get_model_info(db: Session, model_id: int) -> Dict[str, Any]:
         """
-        Get model information
+        Get model information (from the database only, model files are not read)
 
         Args:
             db: Database session
@@ -204,27 +402,39 @@ class MLService:
         if not ml_model:
             raise ValueError(f"Model not found: {model_id}")
 
-        result = {
+        return MLService.model_info(ml_model)
+
+    @staticmethod
+    def model_info(ml_model: MLModel) -> Dict[str, Any]:
+        """
+        Build the model information dictionary from an MLModel row
+
+        Args:
+            ml_model: MLModel row
+
+        Returns:
+            Model information
+        """
+        return {
             "id": ml_model.id,
             "name": ml_model.name,
             "start_date": ml_model.start_date.isoformat(),
             "end_date": ml_model.end_date.isoformat(),
             "model_path": ml_model.model_path,
             "created_at": ml_model.created_at.isoformat(),
-            "is_merged": ml_model.is_merged
+            "is_merged": ml_model.is_merged,
+            "version": ml_model.version,
+            "parent_model_id": ml_model.parent_model_id,
+            "algorithm": ml_model.algorithm,
+            "params": ml_model.params,
+            "trained_at": ml_model.trained_at.isoformat() if ml_model.trained_at else None,
+            "training_samples": ml_model.training_samples,
+            "training_sample": ml_model.training_sample,
+            "artifact_size": ml_model.artifact_size,
+            "feature_schema_version": ml_model.feature_schema_version,
+            "training_duration_ms": ml_model.training_duration_ms
         }
 
-        # If model file exists, load additional info
-        if ml_model.model_path:
-            try:
-                predictor = ModelPredictor(ml_model.model_path)
-                model_info = predictor.get_model_info()
-                result.update(model_info)
-            except Exception:
-                pass
-
-        return result
-
     @staticmethod
     def delete_model(db: Session, model_id: int) -> None:
         """
@@ -256,3 +466,5 @@ class MLService:
         # Delete from database
         db.delete(ml_model)
         db.commit()
+
+        model_cache.invalidate(model_id)
@@ -0,0 +1,154 @@
+"""
+Keyset (cursor) pagination for time-ordered listings
+
+Pages are ordered by (timestamp, id) descending. The cursor is the key of
+the last row of a page, so the next page is a range seek on the
+timestamp index (SQLite indexes end with the rowid, so an index on the
+timestamp column already orders ties by id) and its latency does not
+depend on the page depth. Rows inserted while a client is paging never
+shift the pages it has not read yet.
+"""
+import base64
+import heapq
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Encode a (timestamp, id) key as an opaque URL-safe cursor
+
+    Args:
+        timestamp: Timestamp of the last row on the page
+        row_id: ID of the last row on the page
+
+    Returns:
+        Cursor string
+    """
+    payload = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (timestamp, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(payload)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_query(query: Query, timestamp_column: Any, id_column: Any, cursor: Optional[str] = None) -> Query:
+    """
+    Order a query by (timestamp, id) descending and seek past a cursor
+
+    Args:
+        query: Filtered query
+        timestamp_column: Ordering timestamp column
+        id_column: Primary key column (tie breaker)
+        cursor: Cursor of the previous page, or None for the first page
+
+    Returns:
+        Ordered query
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = query.order_by(timestamp_column.desc(), id_column.desc())
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(timestamp_column, id_column) < tuple_(timestamp, row_id))
+    return query
+
+
+def paginate(
+    query: Query,
+    timestamp_column: Any,
+    id_column: Any,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page ordered by (timestamp, id) descending
+
+    Args:
+        query: Filtered query
+        timestamp_column: Ordering timestamp column
+        id_column: Primary key column (tie breaker)
+        limit: Page size
+        skip: Offset (compatibility; ignored when a cursor is given)
+        cursor: Cursor of the previous page, or None for offset paging
+
+    Returns:
+        Tuple of (rows, next page cursor or None on the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = keyset_query(query, timestamp_column, id_column, cursor)
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    # 한 행 더 읽어 다음 페이지 존재 여부 확인
+    rows = query.limit(limit + 1).all()
+    return _page(rows, timestamp_column.key, id_column.key, limit)
+
+
+def merge_pages(
+    sources: Sequence[List[Any]],
+    timestamp_key: str,
+    id_key: str,
+    limit: int,
+    skip: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Merge rows from several stores into one page ordered by (timestamp, id) descending
+
+    Each source must already be in that order and hold at least
+    skip + limit + 1 rows when it has that many, so the merged page and its
+    cursor are the same as if every row came from one table.
+
+    Args:
+        sources: Row lists, each sorted by (timestamp, id) descending
+        timestamp_key: Name of the timestamp attribute
+        id_key: Name of the ID attribute
+        limit: Page size
+        skip: Offset (0 when paging by cursor)
+
+    Returns:
+        Tuple of (rows, next page cursor or None on the last page)
+    """
+    merged = heapq.merge(
+        *sources, key=lambda row: (getattr(row, timestamp_key), getattr(row, id_key)), reverse=True
+    )
+    rows = list(merged)[skip:skip + limit + 1]
+    return _page(rows, timestamp_key, id_key, limit)
+
+
+def _page(rows: List[Any], timestamp_key: str, id_key: str, limit: int) -> Tuple[List[Any], Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_key), getattr(last, id_key))
@@ -0,0 +1,611 @@
+"""
+Time-bucket rollups of traffic logs
+
+Minute, hour and day tables hold count, sum, sum of squares, min and max of
+packets and bytes per protocol (keyed by the stored protocol string, so
+unmapped and differently cased protocols stay apart). Every ingest path updates them in the same
+transaction as the insert (an INSERT ... SELECT ... ON CONFLICT over the id
+range just written), so range statistics merge a handful of bucket rows per
+day instead of scanning raw logs. Only the unaligned edges of a range (the
+part before the first / after the last whole minute) are read from
+traffic_logs (and the Parquet cold tier for days moved there; the buckets
+themselves are kept when a day is moved).
+
+The same buckets also keep mergeable sketches (traffic_rollup_sketch):
+Space-Saving heavy-hitter summaries of src_ip, dst_ip and dst_port, merged on
+query into approximate top talkers with per-item error bounds, and KLL
+quantile sketches of packets and bytes for medians, quartiles and p95/p99.
+Rewriting a day's sketches per insert is too costly for single-row ingest,
+so rows after a watermark (traffic_rollup_sketch_watermark) stay pending
+until ROLLUP_SKETCH_FLUSH_ROWS rows or ROLLUP_SKETCH_FLUSH_INTERVAL_MS have
+accumulated and are then merged in one go; queries add the pending rows
+from traffic_logs, so results do not depend on when the last merge ran.
+"""
+import json
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app import config
+from app.ml.sketches import SpaceSaving, KLLSketch
+from app.models.traffic_log import TrafficLog
+from app.models.traffic_rollup import (
+    TrafficRollupMinute, TrafficRollupHour, TrafficRollupDay, TrafficRollupSketch, TrafficRollupSketchWatermark
+)
+from app.services.cold_tier import ColdTierService
+
+# (name, table model, bucket length, timestamp string prefix length), coarse to fine.
+# 버킷 키는 저장된 timestamp 문자열('YYYY-MM-DD HH:MM:SS.ffffff')의 앞부분을 잘라 만듦
+ROLLUP_LEVELS = (
+    ("day", TrafficRollupDay, timedelta(days=1), 10),
+    ("hour", TrafficRollupHour, timedelta(hours=1), 13),
+    ("minute", TrafficRollupMinute, timedelta(minutes=1), 16),
+)
+
+# Zero fill appended to a truncated timestamp, by prefix length
+_BUCKET_SUFFIX = {10: " 00:00:00.000000", 13: ":00:00.000000", 16: ":00.000000"}
+
+_UPSERT_SQL = """
+    INSERT INTO {table} (
+        bucket_start, protocol, count,
+        packets_sum, packets_sum_sq, packets_min, packets_max,
+        bytes_sum, bytes_sum_sq, bytes_min, bytes_max
+    )
+    SELECT substr(timestamp, 1, {prefix}) || '{suffix}', protocol, count(*),
+           sum(packets), sum(CAST(packets AS REAL) * packets), min(packets), max(packets),
+           sum(bytes), sum(CAST(bytes AS REAL) * bytes), min(bytes), max(bytes)
+    FROM traffic_logs
+    WHERE id BETWEEN :first_id AND :last_id
+    GROUP BY 1, 2
+    ON CONFLICT (bucket_start, protocol) DO UPDATE SET
+        count = count + excluded.count,
+        packets_sum = packets_sum + excluded.packets_sum,
+        packets_sum_sq = packets_sum_sq + excluded.packets_sum_sq,
+        packets_min = min(packets_min, excluded.packets_min),
+        packets_max = max(packets_max, excluded.packets_max),
+        bytes_sum = bytes_sum + excluded.bytes_sum,
+        bytes_sum_sq = bytes_sum_sq + excluded.bytes_sum_sq,
+        bytes_min = min(bytes_min, excluded.bytes_min),
+        bytes_max = max(bytes_max, excluded.bytes_max)
+"""
+
+# (text()에서 ':'는 바인드 파라미터로 해석되므로 이스케이프)
+UPSERT_STATEMENTS = [
+    text(_UPSERT_SQL.format(
+        table=model.__tablename__, prefix=prefix, suffix=_BUCKET_SUFFIX[prefix].replace(":", "\\:")
+    ))
+    for _, model, _, prefix in ROLLUP_LEVELS
+]
+
+# Columns summarized by heavy-hitter sketches
+HEAVY_HITTER_DIMENSIONS = ("src_ip", "dst_ip", "dst_port")
+
+# 새로 들어온 행의 분 단위 항목별 건수 (시/일 버킷은 Python에서 분 키를 잘라 합산)
+HEAVY_HITTER_COUNT_STATEMENTS = {
+    name: text(f"""
+        SELECT substr(timestamp, 1, 16), {name}, count(*)
+        FROM traffic_logs
+        WHERE id BETWEEN :first_id AND :last_id
+        GROUP BY 1, 2
+    """)
+    for name in HEAVY_HITTER_DIMENSIONS
+}
+
+# Columns summarized by quantile sketches
+QUANTILE_COLUMNS = ("packets", "bytes")
+
+QUANTILE_VALUES_STATEMENT = text(f"""
+    SELECT substr(timestamp, 1, 16), {", ".join(QUANTILE_COLUMNS)}
+    FROM traffic_logs
+    WHERE id BETWEEN :first_id AND :last_id
+""")
+
+SKETCH_NAMES = HEAVY_HITTER_DIMENSIONS + QUANTILE_COLUMNS
+
+# Quantiles reported for packets/bytes in rollup statistics
+STATISTICS_QUANTILES = {"q1": 0.25, "median": 0.5, "q3": 0.75, "p95": 0.95, "p99": 0.99}
+
+SKETCH_SELECT = text("""
+    SELECT bucket_start, name, data FROM traffic_rollup_sketch
+    WHERE level = :level AND bucket_start BETWEEN :first_bucket AND :last_bucket
+""")
+
+SKETCH_UPSERT = text("""
+    INSERT INTO traffic_rollup_sketch (level, bucket_start, name, data)
+    VALUES (:level, :bucket_start, :name, :data)
+    ON CONFLICT (level, bucket_start, name) DO UPDATE SET data = excluded.data
+""")
+
+WATERMARK_UPSERT = text("""
+    INSERT INTO traffic_rollup_sketch_watermark (id, last_log_id) VALUES (1, :last_log_id)
+    ON CONFLICT (id) DO UPDATE SET last_log_id = excluded.last_log_id
+""")
+
+# 이 프로세스에서 마지막으로 요약을 반영한 시각 (time.monotonic)
+_last_sketch_flush = 0.0
+
+
+class RollupService:
+    """
+    Service for maintaining and querying traffic rollups
+    """
+
+    @staticmethod
+    def apply_id_range(db: Any, first_id: int, last_id: int) -> None:
+        """
+        Add traffic_logs rows in an id range to every rollup table (no commit)
+
+        Must run in the transaction that inserted the rows; SQLite holds the
+        write lock until commit, so the range contains only those rows.
+        Bucket aggregates are updated right away, sketches through
+        flush_sketches once enough rows are pending.
+
+        Args:
+            db: Database session or connection
+            first_id: First inserted log ID
+            last_id: Last inserted log ID
+        """
+        if first_id is None or last_id is None or last_id < first_id:
+            return
+        RollupService.apply_aggregates(db, first_id, last_id)
+        RollupService.flush_sketches(db, last_id, force=False)
+
+    @staticmethod
+    def flush_sketches(db: Any, last_id: Optional[int] = None, force: bool = True) -> int:
+        """
+        Merge the rows after the sketch watermark into the bucket sketches (no commit)
+
+        Args:
+            db: Database session or connection (in a write transaction)
+            last_id: Last log ID to merge (defaults to the current maximum)
+            force: Merge even if fewer than ROLLUP_SKETCH_FLUSH_ROWS rows are
+                pending and ROLLUP_SKETCH_FLUSH_INTERVAL_MS has not passed
+
+        Returns:
+            Number of IDs merged (0 if the rows were left pending)
+        """
+        global _last_sketch_flush
+
+        watermark = RollupService.sketch_watermark(db)
+        if last_id is None:
+            last_id = db.execute(select(func.max(TrafficLog.id))).scalar() or 0
+        if last_id <= watermark:
+            return 0
+
+        now = time.monotonic()
+        if not force and last_id - watermark < config.ROLLUP_SKETCH_FLUSH_ROWS \
+                and (now - _last_sketch_flush) * 1000 < config.ROLLUP_SKETCH_FLUSH_INTERVAL_MS:
+            return 0
+
+        RollupService.apply_sketches(db, watermark + 1, last_id)
+        db.execute(WATERMARK_UPSERT, {"last_log_id": last_id})
+        _last_sketch_flush = now
+        return last_id - watermark
+
+    @staticmethod
+    def sketch_watermark(db: Any) -> int:
+        """
+        Last log ID merged into the bucket sketches
+
+        Args:
+            db: Database session or connection
+
+        Returns:
+            Log ID (0 if nothing was merged yet)
+        """
+        return db.execute(
+            select(TrafficRollupSketchWatermark.last_log_id).where(TrafficRollupSketchWatermark.id == 1)
+        ).scalar() or 0
+
+    @staticmethod
+    def apply_aggregates(db: Any, first_id: int, last_id: int) -> None:
+        """
+        Add an id range to the count/sum/min/max bucket tables (no commit)
+
+        Args:
+            db: Database session or connection
+            first_id: First inserted log ID
+            last_id: Last inserted log ID
+        """
+        for stmt in UPSERT_STATEMENTS:
+            db.execute(stmt, {"first_id": first_id, "last_id": last_id})
+
+    @staticmethod
+    def apply_sketches(
+        db: Any,
+        first_id: int,
+        last_id: int,
+        names: Sequence[str] = SKETCH_NAMES
+    ) -> None:
+        """
+        Merge an id range into the per-bucket sketches (no commit)
+
+        Args:
+            db: Database session or connection
+            first_id: First inserted log ID
+            last_id: Last inserted log ID
+            names: Sketches to update (defaults to all of SKETCH_NAMES)
+        """
+        params = {"first_id": first_id, "last_id": last_id}
+        deltas: Dict[str, Dict[Tuple[str, str], Any]] = {level: {} for level, _, _, _ in ROLLUP_LEVELS}
+
+        for name in HEAVY_HITTER_DIMENSIONS:
+            if name not in names:
+                continue
+            minute_counts: Dict[str, Dict[Any, int]] = {}
+            for minute, item, count in db.execute(HEAVY_HITTER_COUNT_STATEMENTS[name], params).all():
+                minute_counts.setdefault(minute, {})[item] = count
+
+            for level, _, _, prefix in ROLLUP_LEVELS:
+                bucket_counts: Dict[str, Dict[Any, int]] = {}
+                for minute, counts in minute_counts.items():
+                    bucket = bucket_counts.setdefault(minute[:prefix] + _BUCKET_SUFFIX[prefix], {})
+                    for item, count in counts.items():
+                        bucket[item] = bucket.get(item, 0) + count
+                for bucket, counts in bucket_counts.items():
+                    deltas[level][(bucket, name)] = SpaceSaving.from_counts(config.HEAVY_HITTER_CAPACITY, counts)
+
+        columns = [(index, name) for index, name in enumerate(QUANTILE_COLUMNS) if name in names]
+        rows = db.execute(QUANTILE_VALUES_STATEMENT, params).all() if columns else []
+        if rows:
+            minutes = [row[0] for row in rows]
+            values = np.array([row[1:] for row in rows], dtype=np.float64)
+            for level, _, _, prefix in ROLLUP_LEVELS:
+                # 버킷별로 행을 모아 한 번에 요약 생성
+                buckets, inverse = np.unique([minute[:prefix] for minute in minutes], return_inverse=True)
+                order = np.argsort(inverse, kind="stable")
+                groups = np.split(values[order], np.cumsum(np.bincount(inverse))[:-1])
+                for bucket, group in zip(buckets, groups):
+                    for index, name in columns:
+                        deltas[level][(bucket + _BUCKET_SUFFIX[prefix], name)] = KLLSketch.from_values(
+                            config.QUANTILE_SKETCH_K, group[:, index]
+                        )
+
+        for level, level_deltas in deltas.items():
+            if level_deltas:
+                RollupService._store_sketches(db, level, level_deltas)
+
+    @staticmethod
+    def get_top_talkers(
+        db: Session,
+        start_date: datetime,
+        end_date: datetime,
+        name: str,
+        limit: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Approximate most frequent values of a column from the bucket sketches
+
+        Args:
+            db: Database session
+            start_date: Start datetime (inclusive)
+            end_date: End datetime (inclusive)
+            name: Column name (one of HEAVY_HITTER_DIMENSIONS)
+            limit: Number of values to return
+
+        Returns:
+            Dictionary with total rows, max_error (upper bound on the count of
+            any value not listed) and items; each item's true count lies in
+            [min_count, count]
+
+        Raises:
+            ValueError: If the column has no sketch
+        """
+        if name not in HEAVY_HITTER_DIMENSIONS:
+            raise ValueError(f"Unsupported top talker column: {name}")
+
+        segments = RollupService.plan(start_date, end_date + timedelta(microseconds=1))
+        sketch = RollupService._range_sketch(db, segments, name)
+        return {
+            "total": sketch.total,
+            "max_error": sketch.floor,
+            "items": [
+                {
+                    "value": int(item) if name == "dst_port" else item,
+                    "count": count,
+                    "min_count": count - error
+                }
+                for item, count, error in sketch.top(limit)
+            ]
+        }
+
+    @staticmethod
+    def plan(start: datetime, end: datetime) -> List[Tuple[Optional[str], datetime, datetime]]:
+        """
+        Split a half-open time range into whole buckets and raw edges
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+
+        Returns:
+            List of (level name or None for raw rows, segment start, segment end)
+        """
+        segments: List[Tuple[Optional[str], datetime, datetime]] = []
+        RollupService._cover(start, end, 0, segments)
+        return segments
+
+    @staticmethod
+    def get_statistics(db: Session, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Compute range statistics by merging rollup buckets
+
+        Args:
+            db: Database session
+            start_date: Start datetime (inclusive)
+            end_date: End datetime (inclusive)
+
+        Returns:
+            Statistics dictionary (empty if the range has no logs)
+        """
+        # 종료 시각 포함(<=)을 반개구간으로 변환
+        segments = RollupService.plan(start_date, end_date + timedelta(microseconds=1))
+
+        per_protocol: Dict[str, List[float]] = {}
+        buckets = {name: 0 for name, _, _, _ in ROLLUP_LEVELS}
+        raw_rows = 0
+        for level, segment_start, segment_end in segments:
+            if level is None:
+                rows = RollupService._query_raw(db, segment_start, segment_end)
+            else:
+                rows = RollupService._query_buckets(db, level, segment_start, segment_end)
+
+            for protocol, sources, *aggregate in rows:
+                if level is None:
+                    raw_rows += sources
+                else:
+                    buckets[level] += sources
+                RollupService._merge(per_protocol.setdefault(protocol, _empty_aggregate()), aggregate)
+
+        total = _empty_aggregate()
+        for aggregate in per_protocol.values():
+            RollupService._merge(total, aggregate)
+        if not total[0]:
+            return {}
+
+        distribution = {protocol: aggregate[0] for protocol, aggregate in per_protocol.items()}
+
+        top = {
+            name: dict((item, count) for item, count, _ in RollupService._range_sketch(db, segments, name).top(10))
+            for name in ("src_ip", "dst_ip")
+        }
+
+        return {
+            "total_logs": total[0],
+            "packets": RollupService._describe(
+                total[0], *total[1:5], RollupService._range_sketch(db, segments, "packets")
+            ),
+            "bytes": RollupService._describe(
+                total[0], *total[5:9], RollupService._range_sketch(db, segments, "bytes")
+            ),
+            # Space-Saving 추정치 (실제 건수 이상, 오차 범위는 get_top_talkers 참조)
+            "top_src_ips": top["src_ip"],
+            "top_dst_ips": top["dst_ip"],
+            "protocol_distribution": dict(sorted(distribution.items(), key=lambda item: -item[1])),
+            "rollup": {"buckets": buckets, "raw_rows": raw_rows}
+        }
+
+    @staticmethod
+    def _cover(
+        start: datetime,
+        end: datetime,
+        level: int,
+        segments: List[Tuple[Optional[str], datetime, datetime]]
+    ) -> None:
+        if start >= end:
+            return
+        if level == len(ROLLUP_LEVELS):
+            segments.append((None, start, end))
+            return
+
+        name, _, _, _ = ROLLUP_LEVELS[level]
+        first = RollupService._ceil(start, level)
+        last = RollupService._floor(end, level)
+        if first >= last:
+            RollupService._cover(start, end, level + 1, segments)
+            return
+
+        # 정렬된 가운데 구간은 이 단위의 버킷으로, 양 끝은 더 작은 단위로
+        RollupService._cover(start, first, level + 1, segments)
+        segments.append((name, first, last))
+        RollupService._cover(last, end, level + 1, segments)
+
+    @staticmethod
+    def _floor(value: datetime, level: int) -> datetime:
+        name = ROLLUP_LEVELS[level][0]
+        value = value.replace(second=0, microsecond=0)
+        if name in ("hour", "day"):
+            value = value.replace(minute=0)
+        if name == "day":
+            value = value.replace(hour=0)
+        return value
+
+    @staticmethod
+    def _ceil(value: datetime, level: int) -> datetime:
+        floor = RollupService._floor(value, level)
+        return floor if floor == value else floor + ROLLUP_LEVELS[level][2]
+
+    @staticmethod
+    def _query_buckets(db: Session, level: str, start: datetime, end: datetime) -> List[Any]:
+        model = next(model for name, model, _, _ in ROLLUP_LEVELS if name == level)
+        return db.execute(
+            select(
+                model.protocol,
+                func.count(),
+                func.sum(model.count),
+                func.sum(model.packets_sum),
+                func.sum(model.packets_sum_sq),
+                func.min(model.packets_min),
+                func.max(model.packets_max),
+                func.sum(model.bytes_sum),
+                func.sum(model.bytes_sum_sq),
+                func.min(model.bytes_min),
+                func.max(model.bytes_max)
+            )
+            .where(model.bucket_start >= start, model.bucket_start < end)
+            .group_by(model.protocol)
+        ).all()
+
+    @staticmethod
+    def _query_raw(db: Session, start: datetime, end: datetime) -> List[Any]:
+        rows = db.execute(
+            select(
+                TrafficLog.protocol,
+                func.count(),
+                func.count(),
+                func.sum(TrafficLog.packets),
+                func.sum(TrafficLog.packets * 1.0 * TrafficLog.packets),
+                func.min(TrafficLog.packets),
+                func.max(TrafficLog.packets),
+                func.sum(TrafficLog.bytes),
+                func.sum(TrafficLog.bytes * 1.0 * TrafficLog.bytes),
+                func.min(TrafficLog.bytes),
+                func.max(TrafficLog.bytes)
+            )
+            .where(TrafficLog.timestamp >= start, TrafficLog.timestamp < end)
+            .group_by(TrafficLog.protocol)
+        ).all()
+
+        # Parquet cold tier로 옮긴 날짜의 행은 같은 형태의 집계 행으로 추가
+        cold = ColdTierService.load_columns(
+            db, start, end, ["protocol", "packets", "bytes"], end_inclusive=False
+        )
+        if cold is None:
+            return rows
+        rows = list(rows)
+        for protocol in np.unique(cold["protocol"].astype(str)).tolist():
+            mask = cold["protocol"] == protocol
+            packets = cold["packets"][mask].astype(np.float64)
+            values = cold["bytes"][mask].astype(np.float64)
+            rows.append((
+                protocol, len(packets), len(packets),
+                int(packets.sum()), float(np.dot(packets, packets)), int(packets.min()), int(packets.max()),
+                int(values.sum()), float(np.dot(values, values)), int(values.min()), int(values.max())
+            ))
+        return rows
+
+    @staticmethod
+    def _store_sketches(db: Any, level: str, deltas: Dict[Tuple[str, str], Any]) -> None:
+        buckets = [bucket for bucket, _ in deltas]
+        stored = db.execute(SKETCH_SELECT, {
+            "level": level, "first_bucket": min(buckets), "last_bucket": max(buckets)
+        })
+        existing = {(bucket, name): data for bucket, name, data in stored if (bucket, name) in deltas}
+
+        rows = []
+        for (bucket, name), sketch in deltas.items():
+            if (bucket, name) in existing:
+                sketch = _sketch_class(name).from_dict(json.loads(existing[(bucket, name)])).merge(sketch)
+            rows.append({"level": level, "bucket_start": bucket, "name": name, "data": json.dumps(sketch.to_dict())})
+        db.execute(SKETCH_UPSERT, rows)
+
+    @staticmethod
+    def _range_sketch(
+        db: Session,
+        segments: List[Tuple[Optional[str], datetime, datetime]],
+        name: str
+    ) -> Any:
+        # 아직 요약에 반영되지 않은 행 (ROLLUP_SKETCH_FLUSH_ROWS 미만)
+        pending = db.execute(
+            select(TrafficLog.timestamp, getattr(TrafficLog, name)).where(
+                TrafficLog.id > RollupService.sketch_watermark(db)
+            )
+        ).all()
+
+        summaries = []
+        for level, segment_start, segment_end in segments:
+            if level is None:
+                summaries.append(RollupService._raw_sketch(db, name, segment_start, segment_end))
+                continue
+
+            values = [value for timestamp, value in pending if segment_start <= timestamp < segment_end]
+            if values:
+                summaries.append(_sketch_of(name, values))
+
+            stored = db.execute(
+                select(TrafficRollupSketch.data).where(
+                    TrafficRollupSketch.level == level,
+                    TrafficRollupSketch.name == name,
+                    TrafficRollupSketch.bucket_start >= segment_start,
+                    TrafficRollupSketch.bucket_start < segment_end
+                )
+            ).scalars()
+            summaries.extend(_sketch_class(name).from_dict(data) for data in stored)
+        return _sketch_class(name).merge_all(_sketch_size(name), summaries)
+
+    @staticmethod
+    def _raw_sketch(db: Session, name: str, start: datetime, end: datetime) -> Any:
+        column = getattr(TrafficLog, name)
+        in_range = (TrafficLog.timestamp >= start, TrafficLog.timestamp < end)
+        cold = ColdTierService.load_columns(db, start, end, [name], end_inclusive=False)
+        if name in HEAVY_HITTER_DIMENSIONS:
+            counts = dict(db.execute(select(column, func.count()).where(*in_range).group_by(column)).all())
+            if cold is not None:
+                items, item_counts = np.unique(cold[name], return_counts=True)
+                for item, count in zip(items.tolist(), item_counts.tolist()):
+                    counts[item] = counts.get(item, 0) + count
+            return SpaceSaving.from_counts(config.HEAVY_HITTER_CAPACITY, counts)
+
+        values = db.execute(select(column).where(*in_range)).scalars().all()
+        if cold is not None:
+            values = np.concatenate([np.asarray(values, dtype=np.float64), cold[name]])
+        return KLLSketch.from_values(config.QUANTILE_SKETCH_K, values)
+
+    @staticmethod
+    def _merge(into: List[Any], aggregate: List[Any]) -> None:
+        into[0] += aggregate[0]
+        for offset in (1, 5):
+            into[offset] += aggregate[offset]
+            into[offset + 1] += aggregate[offset + 1]
+            low, high = aggregate[offset + 2], aggregate[offset + 3]
+            into[offset + 2] = low if into[offset + 2] is None else min(into[offset + 2], low)
+            into[offset + 3] = high if into[offset + 3] is None else max(into[offset + 3], high)
+
+    @staticmethod
+    def _describe(
+        count: int,
+        total: float,
+        sum_sq: float,
+        low: int,
+        high: int,
+        sketch: KLLSketch
+    ) -> Dict[str, Any]:
+        mean = total / count
+        # 표본분산(ddof=1, pandas와 동일)
+        variance = max(sum_sq - total * total / count, 0.0) / (count - 1) if count > 1 else 0.0
+        std = variance ** 0.5
+        # 요약이 값을 모두 보존하는 작은 범위에서는 정확한 분위수
+        quantiles = dict(zip(STATISTICS_QUANTILES, sketch.quantiles(list(STATISTICS_QUANTILES.values()))))
+        return {
+            "mean": mean,
+            "std": std,
+            "min": int(low),
+            "max": int(high),
+            **quantiles,
+            "iqr": quantiles["q3"] - quantiles["q1"],
+            "threshold_upper": float(mean + 2 * std)
+        }
+
+
+def _sketch_class(name: str) -> Any:
+    return SpaceSaving if name in HEAVY_HITTER_DIMENSIONS else KLLSketch
+
+
+def _sketch_size(name: str) -> int:
+    return config.HEAVY_HITTER_CAPACITY if name in HEAVY_HITTER_DIMENSIONS else config.QUANTILE_SKETCH_K
+
+
+def _sketch_of(name: str, values: List[Any]) -> Any:
+    if name in HEAVY_HITTER_DIMENSIONS:
+        return SpaceSaving.from_counts(config.HEAVY_HITTER_CAPACITY, Counter(values))
+    return KLLSketch.from_values(config.QUANTILE_SKETCH_K, np.asarray(values, dtype=np.float64))
+
+
+def _empty_aggregate() -> List[Any]:
+    # count, 그 다음 packets와 bytes 각각 (합, 제곱합, 최소, 최대)
+    return [0, 0, 0.0, None, None, 0, 0.0, None, None]
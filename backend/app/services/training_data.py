@@ -0,0 +1,455 @@
+"""
+Training Data Loader - Column-oriented, chunked reads of traffic_logs
+"""
+import functools
+import itertools
+from typing import Dict, Any, Callable, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select, func, case, cast, literal, Integer
+from sqlalchemy.orm import Session
+
+from app import config
+from app.ml.utils import numeric_to_protocol
+from app.models.traffic_log import TrafficLog
+from app.services.cold_tier import ColdTierService
+
+# 컬럼별 SQL 표현식과 NumPy dtype (정수 인코딩 컬럼이 비어 있으면 SQL 함수로 계산)
+LOADER_COLUMNS = {
+    "protocol_numeric": (
+        func.coalesce(TrafficLog.protocol_numeric, func.protocol_to_numeric(TrafficLog.protocol)),
+        np.int16
+    ),
+    "src_ip_numeric": (
+        func.coalesce(TrafficLog.src_ip_numeric, func.ip_to_numeric(TrafficLog.src_ip)),
+        np.int64
+    ),
+    "src_port": (TrafficLog.src_port, np.int32),
+    "dst_ip_numeric": (
+        func.coalesce(TrafficLog.dst_ip_numeric, func.ip_to_numeric(TrafficLog.dst_ip)),
+        np.int64
+    ),
+    "dst_port": (TrafficLog.dst_port, np.int32),
+    "packets": (TrafficLog.packets, np.int64),
+    "bytes": (TrafficLog.bytes, np.int64)
+}
+
+FEATURE_COLUMNS = list(LOADER_COLUMNS)
+
+SAMPLE_METHODS = ("sql", "reservoir")
+
+# 층화 키: 프로토콜 번호(0-255), 시(0-23)
+STRATIFY_KEYS = {
+    "protocol": LOADER_COLUMNS["protocol_numeric"][0],
+    "hour": cast(func.strftime("%H", TrafficLog.timestamp), Integer)
+}
+# cold tier(Parquet)에서 층 번호를 계산할 컬럼
+COLD_STRATIFY_COLUMNS = {"protocol": "protocol_numeric", "hour": "timestamp"}
+
+# SQL 표본용 seed 기반 해시: Knuth 곱셈 해시 (0 <= hash < 2^32)
+HASH_MODULUS = 1 << 32
+HASH_MULTIPLIER = 2654435761
+
+# Bernoulli 표본 여유분: quota + 3σ + 10행을 뽑은 뒤 층별 quota로 자름
+SQL_SAMPLE_MARGIN_SIGMAS = 3
+SQL_SAMPLE_MARGIN_ROWS = 10
+
+
+class TrainingDataLoader:
+    """
+    Streams traffic_logs into preallocated NumPy column arrays
+    """
+
+    @staticmethod
+    def load_columns(
+        db: Session,
+        start_date: datetime,
+        end_date: datetime,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Load selected columns for a time range without building ORM objects
+
+        The id upper bound is fixed before scanning so rows inserted during
+        the load do not overflow the preallocated arrays. Rows of days moved
+        to the Parquet cold tier are read from their partitions and come
+        first.
+
+        Args:
+            db: Database session
+            start_date: Start datetime
+            end_date: End datetime
+            columns: Column names from LOADER_COLUMNS (defaults to all features)
+            chunk_size: Rows fetched per round trip
+
+        Returns:
+            Dictionary of column name -> 1D ndarray
+        """
+        columns = list(columns or FEATURE_COLUMNS)
+        chunk_size = chunk_size or config.TRAINING_LOAD_CHUNK_SIZE
+
+        time_filter = (TrafficLog.timestamp >= start_date, TrafficLog.timestamp <= end_date)
+        max_id, total = db.execute(
+            select(func.max(TrafficLog.id), func.count()).where(*time_filter)
+        ).one()
+
+        arrays = {
+            name: np.empty(total, dtype=LOADER_COLUMNS[name][1])
+            for name in columns
+        }
+        if total == 0:
+            return TrainingDataLoader._with_cold(db, start_date, end_date, columns, arrays)
+
+        stmt = select(*(LOADER_COLUMNS[name][0] for name in columns)).where(
+            *time_filter, TrafficLog.id <= max_id
+        )
+        result = db.connection().execution_options(yield_per=chunk_size).execute(stmt)
+
+        width = len(columns)
+        offset = 0
+        for chunk in result.partitions():
+            count = min(len(chunk), total - offset)
+            chunk = chunk[:count]
+            block = np.fromiter(
+                itertools.chain.from_iterable(chunk), dtype=np.int64, count=count * width
+            ).reshape(count, width)
+            for i, name in enumerate(columns):
+                arrays[name][offset:offset + count] = block[:, i]
+            offset += count
+            if offset == total:
+                break
+        result.close()
+
+        # 스캔 중 삭제된 행이 있으면 잘라냄
+        if offset < total:
+            arrays = {name: array[:offset] for name, array in arrays.items()}
+
+        return TrainingDataLoader._with_cold(db, start_date, end_date, columns, arrays)
+
+    @staticmethod
+    def count_rows(arrays: Dict[str, np.ndarray]) -> int:
+        """
+        Number of rows in a column dictionary
+
+        Args:
+            arrays: Dictionary of column arrays
+
+        Returns:
+            Row count
+        """
+        return len(next(iter(arrays.values()))) if arrays else 0
+
+    @staticmethod
+    def value_counts(
+        db: Session,
+        start_date: datetime,
+        end_date: datetime,
+        column: str,
+        limit: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Count the stored string values of a column (GROUP BY, cold tier included)
+
+        Unlike the *_numeric encodings the original strings keep IPv6
+        addresses, hostnames and unmapped or lowercase protocols apart.
+
+        Args:
+            db: Database session
+            start_date: Start datetime
+            end_date: End datetime
+            column: "src_ip", "dst_ip" or "protocol"
+            limit: Keep only the most frequent values
+            chunk_size: Cold rows read per batch
+
+        Returns:
+            Dictionary of value -> count, most frequent first
+        """
+        expression = getattr(TrafficLog, column)
+        counts: Dict[str, int] = dict(db.execute(
+            select(expression, func.count()).where(
+                TrafficLog.timestamp >= start_date, TrafficLog.timestamp <= end_date
+            ).group_by(expression)
+        ).all())
+
+        for batch in ColdTierService.iter_batches(
+            db, start_date, end_date, [column], batch_size=chunk_size
+        ):
+            values, batch_counts = np.unique(batch[column].astype(str), return_counts=True)
+            for value, count in zip(values.tolist(), batch_counts.tolist()):
+                counts[value] = counts.get(value, 0) + count
+
+        # 빈도 내림차순, 동률은 값 순
+        ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return dict(ordered[:limit] if limit else ordered)
+
+    @staticmethod
+    def sample_columns(
+        db: Session,
+        start_date: datetime,
+        end_date: datetime,
+        size: int,
+        method: str = "sql",
+        stratify_by: Optional[Sequence[str]] = None,
+        seed: int = 42,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Load a reproducible random sample of a time range
+
+        Each stratum (protocol and/or hour) gets a quota proportional to its
+        row count. "sql" draws a seeded Bernoulli sample inside SQLite and
+        trims it to the quota; "reservoir" streams every row through seeded
+        per-stratum reservoirs. Either way memory depends on the sample size,
+        not on the window size. Cold tier rows take part in both methods (the
+        "sql" hash sample is the same before and after a day is moved).
+
+        Args:
+            db: Database session
+            start_date: Start datetime
+            end_date: End datetime
+            size: Number of rows to sample
+            method: "sql" or "reservoir"
+            stratify_by: Stratification keys ("protocol", "hour")
+            seed: Random seed
+            columns: Column names from LOADER_COLUMNS (defaults to all features)
+            chunk_size: Rows fetched per round trip (reservoir)
+
+        Returns:
+            Tuple of (column arrays, sample description for model metadata)
+
+        Raises:
+            ValueError: If method or stratification keys are unknown
+        """
+        if method not in SAMPLE_METHODS:
+            raise ValueError(f"Unsupported sample method: {method}")
+        stratify_by = list(stratify_by or [])
+        unknown = [key for key in stratify_by if key not in STRATIFY_KEYS]
+        if unknown:
+            raise ValueError(f"Unsupported stratification keys: {unknown}")
+
+        columns = list(columns or FEATURE_COLUMNS)
+        time_filter = (TrafficLog.timestamp >= start_date, TrafficLog.timestamp <= end_date)
+
+        # 층 번호: 키를 256진수로 결합 (층화하지 않으면 단일 층 0)
+        stratum = literal(0)
+        for key in stratify_by:
+            stratum = stratum * 256 + STRATIFY_KEYS[key]
+
+        max_id = db.execute(select(func.max(TrafficLog.id)).where(*time_filter)).scalar() or 0
+        range_filter = time_filter + (TrafficLog.id <= max_id,)
+        population = dict(db.execute(
+            select(stratum, func.count()).where(*range_filter).group_by(stratum)
+        ).all())
+        cold_blocks = functools.partial(
+            TrainingDataLoader._cold_blocks, db, start_date, end_date, columns, stratify_by,
+            chunk_size or config.TRAINING_LOAD_CHUNK_SIZE
+        )
+        for _, strata, _ in cold_blocks(with_values=False):
+            keys, counts = np.unique(strata, return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                population[key] = population.get(key, 0) + count
+        quotas = TrainingDataLoader._allocate(population, size)
+
+        expressions = [LOADER_COLUMNS[name][0] for name in columns]
+        if method == "sql":
+            rows, strata = TrainingDataLoader._sample_sql(
+                db, expressions, stratum, range_filter, population, quotas, seed, cold_blocks
+            )
+        else:
+            rows, strata = TrainingDataLoader._sample_reservoir(
+                db, expressions, stratum, range_filter, quotas, seed,
+                chunk_size or config.TRAINING_LOAD_CHUNK_SIZE, cold_blocks
+            )
+
+        arrays = {
+            name: rows[:, i].astype(LOADER_COLUMNS[name][1])
+            for i, name in enumerate(columns)
+        }
+        sampled = dict(zip(*np.unique(strata, return_counts=True))) if len(strata) else {}
+
+        sample_info = {
+            "method": method,
+            "seed": seed,
+            "stratify_by": stratify_by,
+            "requested_size": size,
+            "size": len(rows),
+            "population": int(sum(population.values()))
+        }
+        if stratify_by:
+            sample_info["strata"] = {
+                TrainingDataLoader._stratum_label(key, stratify_by): {
+                    "population": int(count),
+                    "sampled": int(sampled.get(key, 0))
+                }
+                for key, count in sorted(population.items())
+            }
+        return arrays, sample_info
+
+    @staticmethod
+    def _allocate(population: Dict[int, int], size: int) -> Dict[int, int]:
+        # 최대 잔여 방식으로 층별 비례 배분
+        total = sum(population.values())
+        if total <= size:
+            return dict(population)
+
+        exact = {key: count * size / total for key, count in population.items()}
+        quotas = {key: int(value) for key, value in exact.items()}
+        remainder = size - sum(quotas.values())
+        for key in sorted(exact, key=lambda k: exact[k] - quotas[k], reverse=True)[:remainder]:
+            quotas[key] += 1
+        return quotas
+
+    @staticmethod
+    def _sample_sql(
+        db: Session,
+        expressions: List[Any],
+        stratum: Any,
+        range_filter: tuple,
+        population: Dict[int, int],
+        quotas: Dict[int, int],
+        seed: int,
+        cold_blocks: Callable[..., Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # seed마다 해시 값을 2^32 범위 안에서 크게 회전시켜 다른 표본을 만듦
+        seed_offset = (seed * 2246822519 + 3266489917) % HASH_MODULUS
+        row_hash = (TrafficLog.id * HASH_MULTIPLIER + seed_offset) % HASH_MODULUS
+
+        # 층별 채택 임계값 = 표본 비율 x 2^32 (quota가 모자라지 않도록 여유분 포함)
+        thresholds = {}
+        for key, count in population.items():
+            quota = quotas.get(key, 0)
+            if quota:
+                margin = SQL_SAMPLE_MARGIN_SIGMAS * quota ** 0.5 + SQL_SAMPLE_MARGIN_ROWS
+                thresholds[key] = min(HASH_MODULUS, int((quota + margin) / count * HASH_MODULUS) + 1)
+        if not thresholds:
+            return np.empty((0, len(expressions)), dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        threshold = case(thresholds, value=stratum, else_=0)
+        result = db.execute(
+            select(*expressions, stratum, row_hash).where(*range_filter, row_hash < threshold)
+        ).all()
+        blocks = [np.array(result, dtype=np.int64).reshape(-1, len(expressions) + 2)]
+
+        # cold tier 행에도 같은 해시와 임계값 적용
+        for values, strata, ids in cold_blocks():
+            hashes = ((ids.astype(np.uint64) * HASH_MULTIPLIER + seed_offset) % HASH_MODULUS).astype(np.int64)
+            keys, inverse = np.unique(strata, return_inverse=True)
+            limits = np.array([thresholds.get(key, 0) for key in keys.tolist()], dtype=np.int64)[inverse]
+            keep = hashes < limits
+            blocks.append(np.column_stack([values[keep], strata[keep], hashes[keep]]))
+        block = np.concatenate(blocks)
+
+        # 층별로 해시 순서 상위 quota개만 유지 (seed가 같으면 항상 같은 표본)
+        order = np.lexsort((block[:, -1], block[:, -2]))
+        block = block[order]
+        strata = block[:, -2]
+        rank = np.arange(len(block)) - np.searchsorted(strata, strata, side="left")
+        limit = np.array([quotas.get(key, 0) for key in strata.tolist()], dtype=np.int64)
+        block = block[rank < limit]
+        return block[:, :-2], block[:, -2]
+
+    @staticmethod
+    def _sample_reservoir(
+        db: Session,
+        expressions: List[Any],
+        stratum: Any,
+        range_filter: tuple,
+        quotas: Dict[int, int],
+        seed: int,
+        chunk_size: int,
+        cold_blocks: Callable[..., Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # 층마다 별도 난수열: 표본이 블록(chunk_size) 경계나 층이 섞인 순서에 따라 달라지지 않음
+        rngs = {key: np.random.default_rng([seed, key]) for key in quotas}
+        width = len(expressions)
+        reservoirs = {key: np.empty((quota, width), dtype=np.int64) for key, quota in quotas.items()}
+        seen = {key: 0 for key in quotas}
+
+        stmt = select(*expressions, stratum).where(*range_filter).order_by(TrafficLog.id)
+        result = db.connection().execution_options(yield_per=chunk_size).execute(stmt)
+        hot = (
+            np.fromiter(
+                itertools.chain.from_iterable(chunk), dtype=np.int64, count=len(chunk) * (width + 1)
+            ).reshape(len(chunk), width + 1)
+            for chunk in result.partitions()
+        )
+        # cold tier(오래된 날짜) 행을 먼저 흘려보냄
+        cold = (np.column_stack([values, strata]) for values, strata, _ in cold_blocks())
+        for block in itertools.chain(cold, hot):
+            for key in np.unique(block[:, -1]).tolist():
+                rows = block[block[:, -1] == key, :-1]
+                reservoir, quota, count = reservoirs[key], quotas[key], seen[key]
+
+                # Algorithm R: 먼저 채우고, 이후 i번째 행은 quota/(i+1) 확률로 교체
+                fill = min(max(quota - count, 0), len(rows))
+                reservoir[count:count + fill] = rows[:fill]
+                rest = rows[fill:]
+                if len(rest) and quota:
+                    slots = rngs[key].integers(0, count + fill + np.arange(1, len(rest) + 1))
+                    replace = slots < quota
+                    reservoir[slots[replace]] = rest[replace]
+                seen[key] = count + len(rows)
+        result.close()
+
+        keys = sorted(reservoirs)
+        sizes = [min(seen[key], quotas[key]) for key in keys]
+        rows = np.concatenate([reservoirs[key][:n] for key, n in zip(keys, sizes)]) if keys else \
+            np.empty((0, width), dtype=np.int64)
+        strata = np.repeat(np.array(keys, dtype=np.int64), sizes)
+        return rows, strata
+
+    @staticmethod
+    def _with_cold(
+        db: Session,
+        start_date: datetime,
+        end_date: datetime,
+        columns: List[str],
+        arrays: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        cold = ColdTierService.load_columns(db, start_date, end_date, columns)
+        if cold is None:
+            return arrays
+        return {
+            name: np.concatenate([cold[name].astype(LOADER_COLUMNS[name][1]), arrays[name]])
+            for name in columns
+        }
+
+    @staticmethod
+    def _cold_blocks(
+        db: Session,
+        start_date: datetime,
+        end_date: datetime,
+        columns: List[str],
+        stratify_by: List[str],
+        chunk_size: int,
+        with_values: bool = True
+    ) -> Iterator[Tuple[Optional[np.ndarray], np.ndarray, np.ndarray]]:
+        # (값 블록, 층 번호, id) 배치; with_values=False면 층 계산용 컬럼만 읽음
+        names = ["id"] + (columns if with_values else []) + [COLD_STRATIFY_COLUMNS[key] for key in stratify_by]
+        for batch in ColdTierService.iter_batches(
+            db, start_date, end_date, list(dict.fromkeys(names)), batch_size=chunk_size
+        ):
+            ids = batch["id"]
+            strata = np.zeros(len(ids), dtype=np.int64)
+            for key in stratify_by:
+                if key == "protocol":
+                    values = batch["protocol_numeric"].astype(np.int64)
+                else:
+                    timestamps = batch["timestamp"]
+                    values = (timestamps - timestamps.astype("datetime64[D]")).astype("timedelta64[h]").astype(np.int64)
+                strata = strata * 256 + values
+            block = np.column_stack([batch[name].astype(np.int64) for name in columns]) if with_values else None
+            yield block, strata, ids
+
+    @staticmethod
+    def _stratum_label(key: int, stratify_by: List[str]) -> str:
+        parts = []
+        for name in reversed(stratify_by):
+            value = key % 256
+            key //= 256
+            parts.append(numeric_to_protocol(value) if name == "protocol" else f"{value:02d}h")
+        return "/".join(reversed(parts))
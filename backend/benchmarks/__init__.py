@@ -0,0 +1 @@
+# Benchmark scripts (run from backend/: python -m benchmarks.<name>)
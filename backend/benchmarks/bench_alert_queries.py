@@ -0,0 +1,118 @@
+"""
+Benchmark: SQL statements per GET /api/alerts page
+
+Counts the statements issued per request, sent through TestClient so
+FastAPI's response serialization (where a lazy load would reappear) is
+included. With lazy relationships every alert costs up to two extra SELECTs
+(traffic log and model); eager loading keeps a page at one statement
+regardless of the page size. Exits with status 1 when a mode exceeds its
+budget; the same budget is asserted by tests/test_alert_queries.py.
+
+Usage:
+    python -m benchmarks.bench_alert_queries [-n 1000] [--models 20] [--limit 100]
+"""
+import argparse
+import random
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Iterator
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+
+from app.database import get_db
+from app.models.alert import Alert
+from app.models.ml_model import MLModel
+from app.models.traffic_log import TrafficLog
+from app.routers import alerts
+from benchmarks.common import random_logs, temp_database
+
+# 요청당 허용 SQL 문 수 (페이지 크기와 무관해야 함)
+STATEMENT_BUDGET = {"detail": 1, "lean": 1, "single": 1}
+
+
+@contextmanager
+def count_statements(engine) -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alert listing statement count")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="Number of alerts")
+    parser.add_argument("--models", type=int, default=20, help="Number of models referenced")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+
+    with temp_database() as (_, session_factory):
+        db = session_factory()
+        db.execute(insert(TrafficLog), random_logs(args.count))
+        db.execute(insert(MLModel), [
+            {"name": f"model-{i}", "start_date": start, "end_date": start + timedelta(days=1)}
+            for i in range(args.models)
+        ])
+        db.execute(insert(Alert), [
+            {
+                "traffic_log_id": i + 1,
+                "risk_score": rng.randint(0, 100),
+                "ml_model_id": rng.randint(1, args.models),
+                "detected_at": start + timedelta(seconds=i)
+            }
+            for i in range(args.count)
+        ])
+        db.commit()
+        engine = db.get_bind()
+        db.close()
+
+        # 알림 라우터만 올린 앱 (요청마다 임시 DB 세션)
+        app = FastAPI()
+        app.include_router(alerts.router)
+
+        def bench_db():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = bench_db
+        client = TestClient(app)
+
+        paths = {
+            "detail": f"/api/alerts?limit={args.limit}",
+            "lean": f"/api/alerts?limit={args.limit}&lean=true",
+            "single": f"/api/alerts/{args.count}"
+        }
+
+        failed = False
+        print(f"{'mode':>8}  {'statements':>10}  {'budget':>6}  {'ms':>8}")
+        for mode, path in paths.items():
+            with count_statements(engine) as statements:
+                began = time.perf_counter()
+                response = client.get(path)
+                elapsed = time.perf_counter() - began
+            response.raise_for_status()
+            over = len(statements) > STATEMENT_BUDGET[mode]
+            failed = failed or over
+            print(f"{mode:>8}  {len(statements):>10}  {STATEMENT_BUDGET[mode]:>6}  {elapsed * 1000:8.2f}"
+                  f"{'  OVER BUDGET' if over else ''}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
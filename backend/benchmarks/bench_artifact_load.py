@@ -0,0 +1,74 @@
+"""
+Benchmark: legacy joblib pickle vs memory-mapped flat artifact
+
+Measures file size, full load time, metadata (get_model_info) read time and
+scoring throughput for the same model saved in both formats.
+
+Usage:
+    python -m benchmarks.bench_artifact_load [--train-rows 200000] [--trees 300]
+                                             [--score-rows 500000]
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+
+from app.ml.artifact import ModelArtifact
+from app.ml.trainer import ModelTrainer
+from benchmarks.bench_feature_extraction import random_columns
+
+
+def best_of(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model artifact load benchmark")
+    parser.add_argument("--train-rows", type=int, default=200_000)
+    parser.add_argument("--trees", type=int, default=300)
+    parser.add_argument("--score-rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    trainer = ModelTrainer()
+    trainer.train(
+        random_columns(args.train_rows, seed=1, ip_pool=50_000),
+        "isolation_forest", {"n_estimators": args.trees}, "bench_artifact"
+    )
+    flat_path = trainer.model_path
+    pickle_path = flat_path.rsplit(".", 1)[0] + ".pkl"
+    joblib.dump(ModelArtifact.load(flat_path, materialize=True), pickle_path)
+
+    X, _ = trainer.preprocessor.transform(random_columns(args.score_rows, seed=2, ip_pool=50_000))
+
+    print(f"{'format':8}  {'size MB':>8}  {'load ms':>9}  {'info ms':>9}  {'score rows/s':>13}")
+    scores = {}
+    for label, path in (("pickle", pickle_path), ("flat", flat_path)):
+        load_s = best_of(lambda: ModelArtifact.load(path), args.repeat)
+        # pickle에는 헤더가 없어 메타데이터를 보려면 전체를 읽어야 함
+        read_info = ModelArtifact.read_info if label == "flat" else joblib.load
+        info_s = best_of(lambda: read_info(path), args.repeat)
+
+        detector = ModelArtifact.load(path)["detector"]
+        start = time.perf_counter()
+        scores[label] = detector.get_decision_scores(X)
+        score_s = time.perf_counter() - start
+
+        print(f"{label:8}  {os.path.getsize(path) / 1e6:8.2f}  {load_s * 1000:9.2f}  "
+              f"{info_s * 1000:9.2f}  {len(X) / score_s:13,.0f}")
+
+    print(f"max score difference: {np.abs(scores['pickle'] - scores['flat']).max():.3g}")
+
+    for path in (flat_path, pickle_path):
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: single-row ingest vs bulk ingest
+
+Usage:
+    python -m benchmarks.bench_bulk_ingest [-n 20000] [--batch 5000]
+"""
+import argparse
+
+from app.schemas.traffic_log import TrafficLogCreate
+from app.services.ingest_service import IngestService
+from benchmarks.common import random_logs, temp_database, timer
+
+
+def run_single_row(session_factory, logs) -> None:
+    """Same path as POST /api/logs: INSERT + COMMIT + refresh per record"""
+    db = session_factory()
+    try:
+        for log in logs:
+            IngestService.insert_log(db, TrafficLogCreate(**log))
+    finally:
+        db.close()
+
+
+def run_bulk(session_factory, logs, batch_size: int) -> None:
+    """Same path as POST /api/logs/bulk"""
+    db = session_factory()
+    try:
+        for i in range(0, len(logs), batch_size):
+            records = [TrafficLogCreate(**log) for log in logs[i:i + batch_size]]
+            IngestService.bulk_insert(db, records)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-row vs bulk ingest benchmark")
+    parser.add_argument("-n", "--count", type=int, default=20000, help="Number of records")
+    parser.add_argument("--batch", type=int, default=5000, help="Records per bulk request")
+    args = parser.parse_args()
+
+    logs = random_logs(args.count)
+
+    with temp_database() as (_, session_factory):
+        with timer("single-row (POST /api/logs)", args.count):
+            run_single_row(session_factory, logs)
+
+    with temp_database() as (_, session_factory):
+        with timer(f"bulk (POST /api/logs/bulk, {args.batch}/req)", args.count):
+            run_bulk(session_factory, logs, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: SQLite row store vs Parquet cold tier for traffic_logs
+
+Fills a throwaway database, times the same reads (all training features,
+two columns, one hour) through TrainingDataLoader.load_columns, moves every
+day into the cold tier and times them again. Sizes are measured after
+VACUUM, so the row store figure includes its indexes.
+
+Random IPs from random_logs barely repeat, so dictionary encoding gains
+little here; real traffic with recurring hosts compresses further.
+
+Usage:
+    python -m benchmarks.bench_cold_tier [-n 1000000]
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+
+from app import config
+from app.models.traffic_log import TrafficLog
+from app.services.cold_tier import ColdTierService
+from app.services.training_data import TrainingDataLoader
+from benchmarks.common import random_logs, temp_database
+
+FILL_BATCH_SIZE = 50000
+START = datetime(2024, 1, 1)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for directory, _, files in os.walk(path) for name in files
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Row store vs Parquet cold tier benchmark")
+    parser.add_argument("-n", "--count", type=int, default=1_000_000, help="Number of logs (one per second)")
+    args = parser.parse_args()
+
+    if not ColdTierService.available():
+        raise SystemExit("pyarrow is not installed")
+
+    end = START + timedelta(seconds=args.count)
+    middle = START + timedelta(seconds=args.count // 2)
+    queries = {
+        "all features": lambda db: TrainingDataLoader.load_columns(db, START, end),
+        "packets,bytes": lambda db: TrainingDataLoader.load_columns(db, START, end, ["packets", "bytes"]),
+        "1 hour": lambda db: TrainingDataLoader.load_columns(db, middle, middle + timedelta(hours=1)),
+    }
+
+    with temp_database() as (db_path, session_factory):
+        config.COLD_TIER_DIR = os.path.join(os.path.dirname(db_path), "cold")
+        db = session_factory()
+        for start in range(0, args.count, FILL_BATCH_SIZE):
+            logs = random_logs(
+                min(FILL_BATCH_SIZE, args.count - start), seed=start, start=START + timedelta(seconds=start)
+            )
+            db.execute(insert(TrafficLog), logs)
+        db.commit()
+        db.execute(text("VACUUM"))
+        row_store_size = os.path.getsize(db_path)
+
+        hot = {name: best_of(lambda: query(db)) for name, query in queries.items()}
+
+        began = time.perf_counter()
+        summary = ColdTierService.tier_closed_days(db, before=end.date() + timedelta(days=1))
+        tier_s = time.perf_counter() - began
+        db.execute(text("VACUUM"))
+        remaining_size = os.path.getsize(db_path)
+
+        cold = {name: best_of(lambda: query(db)) for name, query in queries.items()}
+        db.close()
+
+        print(f"{summary['moved_rows']:,} rows, {len(summary['days'])} partitions, "
+              f"tiered in {tier_s:.1f}s ({summary['moved_rows'] / tier_s:,.0f} rows/s)")
+        print(f"{'':>16}  {'row store':>12}  {'parquet':>12}")
+        print(f"{'size MB':>16}  {row_store_size / 1e6:12.1f}  {directory_size(config.COLD_TIER_DIR) / 1e6:12.1f}"
+              f"   (SQLite after tiering: {remaining_size / 1e6:.1f} MB)")
+        for name in queries:
+            print(f"{name + ' ms':>16}  {hot[name] * 1000:12.1f}  {cold[name] * 1000:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: streaming export of traffic_logs (CSV / NDJSON / Parquet)
+
+Fills a throwaway database and drains ExportService.iter_export for each
+format, reporting throughput, output size and peak Python heap. Peak memory
+should track the chunk size, not the row count; the "list" row shows what
+materializing every ORM row (as paging through /api/logs does) costs.
+
+The "ingest during export" case keeps a writer committing small bulk
+inserts while a slowly consumed CSV export holds its cursor open, and
+reports commit latency and "database is locked" failures.
+
+Usage:
+    python -m benchmarks.bench_export [-n 500000] [--chunk-size 10000]
+"""
+import argparse
+import threading
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from app.models.traffic_log import TrafficLog
+from app.schemas.traffic_log import TrafficLogCreate
+from app.services.export import EXPORT_FORMATS, LOG_EXPORT_COLUMNS, ExportService
+from app.services.ingest_service import IngestService
+from app.services.rollup import RollupService
+from benchmarks.common import random_logs, temp_database
+
+FILL_BATCH_SIZE = 50000
+INGEST_BATCH_SIZE = 100
+# 느린 클라이언트 흉내: 청크마다 쉬는 시간
+SLOW_CLIENT_DELAY_S = 0.05
+
+
+def run_ingest_during_export(session_factory, stmt, names, chunk_size: int) -> None:
+    """Commit bulk inserts from another thread while a CSV export is being drained"""
+    stop = threading.Event()
+    latencies, errors = [], []
+
+    def writer():
+        db = session_factory()
+        try:
+            seed = 0
+            while not stop.is_set():
+                records = [TrafficLogCreate(**log) for log in random_logs(INGEST_BATCH_SIZE, seed=seed)]
+                began = time.perf_counter()
+                try:
+                    IngestService.bulk_insert(db, records)
+                    latencies.append(time.perf_counter() - began)
+                except OperationalError as e:
+                    errors.append(str(e.orig))
+                seed += 1
+        finally:
+            db.close()
+
+    export_db = session_factory()
+    thread = threading.Thread(target=writer)
+    began = time.perf_counter()
+    chunks = ExportService.iter_export(export_db, stmt, names, "csv", chunk_size)
+    next(chunks)  # 커서를 연 뒤 쓰기 시작
+    thread.start()
+    try:
+        for _ in chunks:
+            time.sleep(SLOW_CLIENT_DELAY_S)
+    finally:
+        stop.set()
+        thread.join()
+        export_db.close()
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    worst = latencies[-1] * 1000 if latencies else 0.0
+    print(f"ingest during export ({elapsed:.1f}s): {len(latencies)} commits of {INGEST_BATCH_SIZE} rows, "
+          f"p50 {p50:.1f} ms, max {worst:.1f} ms, {len(errors)} failed"
+          + (f" ({errors[0]})" if errors else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming export benchmark")
+    parser.add_argument("-n", "--count", type=int, default=500_000, help="Number of logs")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per export chunk")
+    args = parser.parse_args()
+
+    with temp_database() as (_, session_factory):
+        db = session_factory()
+        for start in range(0, args.count, FILL_BATCH_SIZE):
+            db.execute(insert(TrafficLog), random_logs(min(FILL_BATCH_SIZE, args.count - start), seed=start))
+        # 쓰기 스레드의 첫 커밋이 채운 행 전체의 롤업을 떠안지 않도록 미리 반영
+        RollupService.apply_aggregates(db, 1, args.count)
+        RollupService.flush_sketches(db)
+        db.commit()
+
+        names = list(LOG_EXPORT_COLUMNS)
+        stmt = ExportService.build_select(LOG_EXPORT_COLUMNS, names, [], TrafficLog.timestamp, TrafficLog.id)
+
+        def run_list():
+            rows = db.query(TrafficLog).order_by(TrafficLog.timestamp, TrafficLog.id).all()
+            db.expunge_all()
+            return len(rows), 0
+
+        def run_export(fmt):
+            size = 0
+            for chunk in ExportService.iter_export(db, stmt, names, fmt, args.chunk_size):
+                size += len(chunk)
+            return args.count, size
+
+        cases = {"list": run_list}
+        for fmt in EXPORT_FORMATS:
+            if fmt != "parquet" or ExportService.parquet_available():
+                cases[fmt] = lambda fmt=fmt: run_export(fmt)
+
+        print(f"{'format':>8}  {'rows/s':>10}  {'MB out':>8}  {'peak MB':>8}")
+        for name, run in cases.items():
+            tracemalloc.start()
+            began = time.perf_counter()
+            rows, size = run()
+            elapsed = time.perf_counter() - began
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:>8}  {rows / elapsed:10,.0f}  {size / 1e6:8.1f}  {peak / 1e6:8.1f}")
+        db.close()
+
+        run_ingest_during_export(session_factory, stmt, names, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: full retrain of a sliding window vs incremental one-day refresh
+
+Usage:
+    python -m benchmarks.bench_incremental_refresh [--days 7] [--rows-per-day 200000]
+"""
+import argparse
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.ml.incremental import IncrementalTrainer
+from app.ml.trainer import ModelTrainer
+from benchmarks.bench_feature_extraction import random_columns
+from benchmarks.common import timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sliding-window refresh benchmark")
+    parser.add_argument("--days", type=int, default=7, help="Window size in days")
+    parser.add_argument("--rows-per-day", type=int, default=200_000)
+    args = parser.parse_args()
+
+    first_day = date(2024, 1, 1)
+    day_logs = {
+        first_day + timedelta(days=i): random_columns(args.rows_per_day, seed=i, ip_pool=50_000)
+        for i in range(args.days + 1)
+    }
+    window = dict(list(day_logs.items())[:args.days])
+    new_day = first_day + timedelta(days=args.days)
+
+    paths = []
+    with timer(f"initial incremental train ({args.days} days)", args.days * args.rows_per_day):
+        trainer = IncrementalTrainer()
+        trainer.train(window, "isolation_forest", {}, "bench_window")
+        paths.append(trainer.model_path)
+
+    with timer("incremental refresh (1 new day)", args.rows_per_day):
+        refresher = IncrementalTrainer()
+        refresher.refresh(trainer.model_path, new_day, day_logs[new_day], "bench_window")
+        paths.append(refresher.model_path)
+
+    # 전체 재학습: 새 창(가장 오래된 날 제외 + 새 날)을 한 번에 학습
+    shifted = list(day_logs.values())[1:]
+    columns = {name: np.concatenate([logs[name] for logs in shifted]) for name in shifted[0]}
+    with timer(f"full retrain ({args.days} days)", args.days * args.rows_per_day):
+        full = ModelTrainer()
+        full.train(columns, "isolation_forest", {}, "bench_full")
+        paths.append(full.model_path)
+
+    for path in paths:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: offset vs keyset (cursor) paging of GET /api/logs
+
+Fills a throwaway database and times one page at increasing depths. Offset
+paging walks and discards every skipped row; a cursor page is an index
+seek, so its latency stays flat.
+
+Usage:
+    python -m benchmarks.bench_pagination [-n 1000000] [--limit 100]
+"""
+import argparse
+import time
+
+from sqlalchemy import insert
+
+from app.models.traffic_log import TrafficLog
+from app.services.pagination import encode_cursor, paginate
+from benchmarks.common import random_logs, temp_database
+
+FILL_BATCH_SIZE = 50000
+
+
+def best_of(func, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offset vs cursor paging benchmark")
+    parser.add_argument("-n", "--count", type=int, default=1_000_000, help="Number of logs")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    args = parser.parse_args()
+
+    with temp_database() as (_, session_factory):
+        db = session_factory()
+        for start in range(0, args.count, FILL_BATCH_SIZE):
+            logs = random_logs(min(FILL_BATCH_SIZE, args.count - start), seed=start)
+            db.execute(insert(TrafficLog), logs)
+        db.commit()
+
+        print(f"{'depth':>10}  {'offset ms':>10}  {'cursor ms':>10}")
+        for fraction in (0, 0.01, 0.1, 0.5, 0.9):
+            depth = int(args.count * fraction)
+            query = db.query(TrafficLog)
+
+            # 같은 깊이의 커서: 직전 행의 (timestamp, id)
+            cursor = None
+            if depth:
+                row = query.order_by(TrafficLog.timestamp.desc(), TrafficLog.id.desc()).offset(depth - 1).first()
+                cursor = encode_cursor(row.timestamp, row.id)
+
+            offset_s = best_of(lambda: paginate(query, TrafficLog.timestamp, TrafficLog.id, args.limit, skip=depth))
+            cursor_s = best_of(lambda: paginate(query, TrafficLog.timestamp, TrafficLog.id, args.limit, cursor=cursor))
+            print(f"{depth:>10,}  {offset_s * 1000:10.2f}  {cursor_s * 1000:10.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
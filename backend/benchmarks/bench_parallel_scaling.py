@@ -0,0 +1,69 @@
+"""
+Benchmark: training and scoring scaling from 1 to N cores
+
+For each worker count it measures IsolationForest fitting (n_jobs), in-process
+threaded scoring (n_jobs) and process-pool sharded scoring.
+
+Usage:
+    python -m benchmarks.bench_parallel_scaling [--cores 1 2 4 8] [--train-rows 1000000]
+                                                [--score-rows 2000000]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.ml.parallel import ShardedScorer
+from app.ml.trainer import ModelTrainer
+from benchmarks.bench_feature_extraction import random_columns
+
+
+def default_cores():
+    cores, count = [], 1
+    while count < (os.cpu_count() or 1):
+        cores.append(count)
+        count *= 2
+    return cores + [os.cpu_count() or 1]
+
+
+def elapsed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-core training/scoring benchmark")
+    parser.add_argument("--cores", type=int, nargs="+", default=default_cores())
+    parser.add_argument("--train-rows", type=int, default=1_000_000)
+    parser.add_argument("--score-rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    train = random_columns(args.train_rows, seed=1, ip_pool=50_000)
+    score = random_columns(args.score_rows, seed=2, ip_pool=50_000)
+
+    print(f"{'cores':>5}  {'fit s':>8}  {'threaded score s':>17}  {'sharded score s':>16}  {'rows/s (sharded)':>17}")
+    baseline = None
+    for cores in args.cores:
+        trainer = ModelTrainer()
+        fit_s, _ = elapsed(lambda: trainer.train(train, "isolation_forest", {}, "bench_scaling", n_jobs=cores))
+
+        detector = trainer.detector
+        X, _ = trainer.preprocessor.transform(score)
+        threaded_s, threaded = elapsed(lambda: detector.get_decision_scores(X))
+
+        scorer = ShardedScorer(processes=cores, min_rows=0)
+        scorer.decision_function(trainer.model_path, X[:cores * 10])  # 워커 기동 및 모델 로드 제외
+        sharded_s, sharded = elapsed(lambda: scorer.decision_function(trainer.model_path, X))
+        scorer.shutdown()
+        os.remove(trainer.model_path)
+
+        assert np.allclose(threaded, sharded)
+        baseline = baseline or (fit_s, threaded_s, sharded_s)
+        print(f"{cores:>5}  {fit_s:8.2f}  {threaded_s:9.2f} (x{baseline[1] / threaded_s:4.1f})  "
+              f"{sharded_s:8.2f} (x{baseline[2] / sharded_s:4.1f})  {args.score_rows / sharded_s:17,.0f}")
+
+
+if __name__ == "__main__":
+    main()
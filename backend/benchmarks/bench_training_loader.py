@@ -0,0 +1,111 @@
+"""
+Benchmark: ORM .all() + dict rows vs chunked column loader for training data
+
+Each loader runs in a fresh process so peak RSS (ru_maxrss) is measured
+independently.
+
+Usage:
+    python -m benchmarks.bench_training_loader [-n 200000] [--chunk 50000]
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import random_logs, temp_database
+
+START = datetime(2024, 1, 1)
+END = datetime(2100, 1, 1)
+
+
+def _peak_rss_mb() -> float:
+    # Linux는 KB, macOS는 byte 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def load_orm_rows(db, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+    """Previous loader: every row as an ORM object, then copied into a dict"""
+    from app.models.traffic_log import TrafficLog
+
+    logs = db.query(TrafficLog).filter(
+        TrafficLog.timestamp >= start_date,
+        TrafficLog.timestamp <= end_date
+    ).all()
+
+    return [
+        {
+            "protocol": log.protocol,
+            "src_ip": log.src_ip,
+            "src_port": log.src_port,
+            "dst_ip": log.dst_ip,
+            "dst_port": log.dst_port,
+            "packets": log.packets,
+            "bytes": log.bytes,
+            "protocol_numeric": log.protocol_numeric,
+            "src_ip_numeric": log.src_ip_numeric,
+            "dst_ip_numeric": log.dst_ip_numeric
+        }
+        for log in logs
+    ]
+
+
+def run_loader(db_path: str, mode: str, chunk_size: int) -> Tuple[int, float, float, float]:
+    """Load training data and fit the preprocessor; returns (rows, load s, fit s, peak RSS MB)"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.ml.preprocessor import TrafficLogPreprocessor
+    from app.services.training_data import TrainingDataLoader
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    db = sessionmaker(bind=engine)()
+    try:
+        start = time.perf_counter()
+        if mode == "orm":
+            data = load_orm_rows(db, START, END)
+        else:
+            data = TrainingDataLoader.load_columns(db, START, END, chunk_size=chunk_size)
+        load_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        X_scaled, _ = TrafficLogPreprocessor().fit_transform(data)
+        fit_elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+        engine.dispose()
+
+    return len(X_scaled), load_elapsed, fit_elapsed, _peak_rss_mb()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training data loader benchmark")
+    parser.add_argument("-n", "--count", type=int, default=200000, help="Number of records")
+    parser.add_argument("--chunk", type=int, default=50000, help="Rows per fetch (column loader)")
+    args = parser.parse_args()
+
+    from app.services.ingest_service import IngestService
+
+    with temp_database() as (db_path, session_factory):
+        db = session_factory()
+        try:
+            for i in range(0, args.count, 50000):
+                IngestService.insert_rows(db, random_logs(min(50000, args.count - i), seed=i, start=START))
+            db.commit()
+        finally:
+            db.close()
+
+        # spawn: 부모 프로세스 메모리가 자식의 peak RSS에 섞이지 않도록 함
+        ctx = multiprocessing.get_context("spawn")
+        for label, mode in (("ORM .all() + dicts", "orm"), ("column loader", "columns")):
+            with ctx.Pool(1) as pool:
+                rows, load_s, fit_s, rss = pool.apply(run_loader, (db_path, mode, args.chunk))
+            print(f"{label:24} rows={rows:>10,}  load={load_s:8.3f}s  "
+                  f"fit={fit_s:7.3f}s  peak_rss={rss:9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Shared helpers for benchmark scripts
+"""
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Iterator, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import traffic_log, traffic_rollup, ml_model, alert, cold_partition  # noqa: F401 (register tables)
+
+PROTOCOLS = ["TCP", "UDP", "ICMP"]
+
+
+def random_ip(rng: random.Random) -> str:
+    """Random IPv4 address string"""
+    return f"{rng.randint(1, 255)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 255)}"
+
+
+def random_logs(
+    count: int,
+    seed: int = 42,
+    start: datetime = datetime(2024, 1, 1)
+) -> List[Dict[str, Any]]:
+    """
+    Generate random traffic log dictionaries (same shape as log-gen)
+
+    Args:
+        count: Number of logs
+        seed: Random seed
+        start: Timestamp of the first log (one log per second)
+
+    Returns:
+        List of log dictionaries
+    """
+    rng = random.Random(seed)
+    logs = []
+    for i in range(count):
+        packets = rng.randint(1, 1000)
+        logs.append({
+            "protocol": rng.choice(PROTOCOLS),
+            "src_ip": random_ip(rng),
+            "src_port": rng.randint(1024, 65535),
+            "dst_ip": random_ip(rng),
+            "dst_port": rng.randint(1024, 65535),
+            "packets": packets,
+            "bytes": packets * rng.randint(64, 1500),
+            "timestamp": start + timedelta(seconds=i),
+            "cpu_id": rng.randint(0, 7)
+        })
+    return logs
+
+
+@contextmanager
+def temp_database() -> Iterator[Tuple[str, sessionmaker]]:
+    """
+    Create a throwaway SQLite file database with the app schema
+
+    Yields:
+        Tuple of (database file path, session factory)
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        engine = create_engine(
+            f"sqlite:///{db_path}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        try:
+            yield db_path, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        finally:
+            engine.dispose()
+
+
+@contextmanager
+def timer(label: str, records: int = 0) -> Iterator[None]:
+    """
+    Print elapsed time (and records/sec if records is given)
+
+    Args:
+        label: Label to print
+        records: Number of records processed
+    """
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    if records:
+        print(f"{label:40} {elapsed:9.3f}s  {records / elapsed:12,.0f} records/s")
+    else:
+        print(f"{label:40} {elapsed:9.3f}s")
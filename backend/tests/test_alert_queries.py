@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.models.alert import Alert
+from app.models.ml_model import MLModel
+from tests.conftest import make_logs
+
+START = datetime(2026, 1, 1)
+
+# 요청당 SQL 문 수: 알림/모델 수가 늘어도 그대로여야 함 (행마다 지연 로딩이 생기면 증가)
+STATEMENTS_PER_REQUEST = 1
+
+
+@contextmanager
+def count_statements(engine) -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def _seed_alerts(db, insert_logs, count: int, models: int) -> None:
+    log_ids = insert_logs(make_logs(count))
+    db.execute(insert(MLModel), [
+        {"name": f"model-{i}", "start_date": START, "end_date": START + timedelta(days=1)}
+        for i in range(models)
+    ])
+    db.execute(insert(Alert), [
+        {
+            "traffic_log_id": log_id,
+            "risk_score": (i * 13) % 101,
+            "ml_model_id": i % models + 1,
+            "detected_at": START + timedelta(seconds=i)
+        }
+        for i, log_id in enumerate(log_ids)
+    ])
+    db.commit()
+
+
+@pytest.mark.parametrize("path", ["/api/alerts?limit=1000", "/api/alerts?limit=1000&lean=true"])
+def test_alert_list_statement_count_does_not_grow(client, engine, db, insert_logs, path):
+    counts = []
+    for count, models in ((5, 2), (60, 20)):
+        _seed_alerts(db, insert_logs, count, models)
+        with count_statements(engine) as statements:
+            response = client.get(path)
+        assert response.status_code == 200
+        counts.append(len(statements))
+
+    assert len(response.json()) == 65
+    if "lean" not in path:
+        assert all(alert["traffic_log"]["id"] == alert["traffic_log_id"] for alert in response.json())
+        assert all(alert["ml_model"]["id"] == alert["ml_model_id"] for alert in response.json())
+    assert counts == [STATEMENTS_PER_REQUEST, STATEMENTS_PER_REQUEST]
+
+
+def test_alert_cursor_page_statement_count(client, engine, db, insert_logs):
+    _seed_alerts(db, insert_logs, 30, 5)
+    first = client.get("/api/alerts", params={"limit": 10})
+    with count_statements(engine) as statements:
+        response = client.get("/api/alerts", params={"limit": 10, "cursor": first.headers["X-Next-Cursor"]})
+
+    assert len(response.json()) == 10
+    assert len(statements) == STATEMENTS_PER_REQUEST
+
+
+def test_alert_detail_statement_count(client, engine, db, insert_logs):
+    _seed_alerts(db, insert_logs, 10, 3)
+    with count_statements(engine) as statements:
+        response = client.get("/api/alerts/7")
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["traffic_log"]["id"] == body["traffic_log_id"] and body["ml_model"]["id"] == body["ml_model_id"]
+    assert len(statements) == STATEMENTS_PER_REQUEST
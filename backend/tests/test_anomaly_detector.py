@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from app.ml.anomaly_detector import CALIBRATION_POINTS, AnomalyDetector
+from app.ml.predictor import ModelPredictor
+from app.ml.preprocessor import TrafficLogPreprocessor
+from app.ml.trainer import ModelTrainer
+from tests.conftest import random_logs
+
+
+@pytest.fixture(scope="module")
+def trained():
+    preprocessor = TrafficLogPreprocessor()
+    X, _ = preprocessor.fit_transform(random_logs(3000, seed=5))
+    detector = AnomalyDetector({"n_estimators": 50, "contamination": 0.05, "random_state": 42}, n_jobs=1)
+    detector.train(X)
+    return detector, preprocessor, X
+
+
+def _per_sample_importance(detector: AnomalyDetector, X: np.ndarray, sample_idx: int) -> np.ndarray:
+    # 배치 이전 구현: 특성마다 단건 decision_function 두 번
+    sample = X[sample_idx:sample_idx + 1]
+    importance = np.zeros(X.shape[1])
+    for i in range(X.shape[1]):
+        perturbed = sample.copy()
+        perturbed[0, i] = 0
+        importance[i] = abs(detector.model.decision_function(sample)[0] - detector.model.decision_function(perturbed)[0])
+    return importance
+
+
+def test_batched_attribution_matches_per_sample_loop(trained):
+    detector, _, X = trained
+    anomalies = np.flatnonzero(detector.predict(X)[0] == -1)[:40]
+    assert len(anomalies)
+
+    batched = detector.get_feature_importances(X, anomalies)
+    expected = np.array([_per_sample_importance(detector, X, i) for i in anomalies])
+    np.testing.assert_allclose(batched, expected, atol=1e-12)
+    # 설명에 쓰이는 상위 3개 특성도 같아야 함
+    assert np.array_equal(np.argsort(batched, axis=1)[:, -3:], np.argsort(expected, axis=1)[:, -3:])
+
+
+def test_single_sample_attribution_and_empty_batch(trained):
+    detector, _, X = trained
+    np.testing.assert_allclose(detector.get_feature_importance(X, 7), _per_sample_importance(detector, X, 7), atol=1e-12)
+    assert detector.get_feature_importances(X, []).shape == (0, X.shape[1])
+
+
+def test_calibrated_score_does_not_depend_on_the_batch(trained):
+    detector, _, X = trained
+    assert len(detector.calibration) == CALIBRATION_POINTS
+    _, batch_scores = detector.predict(X[:500])
+
+    # 단건, 다른 배치와 섞인 경우, 이상치만 모인 배치 모두 같은 점수
+    for i in (0, 17, 499):
+        assert detector.predict(X[i:i + 1])[1][0] == batch_scores[i]
+    _, mixed = detector.predict(np.vstack([X[1000:1200], X[:500]]))
+    assert np.array_equal(mixed[200:], batch_scores)
+    anomalies = np.flatnonzero(detector.predict(X[:500])[0] == -1)
+    assert np.array_equal(detector.predict(X[anomalies])[1], batch_scores[anomalies])
+    assert ((batch_scores >= 0) & (batch_scores <= 1)).all()
+
+
+def test_predictor_scores_a_log_the_same_in_any_batch(model_dir):
+    logs = random_logs(1000, seed=6)
+    result = ModelTrainer().train(logs, "isolation_forest", {"n_estimators": 30}, "calibrated")
+    predictor = ModelPredictor(result["model_path"])
+
+    batch = predictor.predict(logs[:300])
+    alone = [predictor.predict([log])[0] for log in logs[:20]]
+    assert [r["anomaly_score"] for r in alone] == [r["anomaly_score"] for r in batch[:20]]
+    assert [r["is_anomaly"] for r in alone] == [r["is_anomaly"] for r in batch[:20]]
+    shuffled = predictor.predict(logs[300:600] + logs[:300])
+    assert [r["anomaly_score"] for r in shuffled[300:]] == [r["anomaly_score"] for r in batch]
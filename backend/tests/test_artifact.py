@@ -0,0 +1,76 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest
+
+from app.ml import artifact
+from app.ml.artifact import FlatForest, ModelArtifact
+from app.ml.predictor import ModelPredictor
+from app.ml.trainer import ModelTrainer
+from tests.conftest import make_logs
+
+
+@pytest.fixture(scope="module")
+def forest():
+    rng = np.random.default_rng(0)
+    return IsolationForest(n_estimators=50, random_state=42).fit(rng.normal(size=(3000, 7)))
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return np.random.default_rng(1).normal(scale=1.5, size=(6000, 7))
+
+
+@pytest.mark.parametrize("count", [1, 100, artifact.SKLEARN_SCORING_MIN_ROWS + 1])
+def test_flat_forest_matches_sklearn(forest, rows, count):
+    flat = FlatForest(*FlatForest.encode(forest))
+    # 배열 탐색 경로와 재구성한 sklearn 경로 모두 원본과 비트 단위로 같아야 함
+    assert np.array_equal(flat.decision_function(rows[:count]), forest.decision_function(rows[:count]))
+
+
+def test_flat_walk_matches_sklearn_on_large_batch(forest, rows, monkeypatch):
+    monkeypatch.setattr(artifact, "SKLEARN_SCORING_MIN_ROWS", len(rows) + 1)
+    flat = FlatForest(*FlatForest.encode(forest))
+    assert np.array_equal(flat.decision_function(rows), forest.decision_function(rows))
+    assert flat._sklearn_forest is None
+
+
+def test_other_sklearn_version_scores_on_arrays(forest, rows):
+    arrays, header = FlatForest.encode(forest)
+    flat = FlatForest(arrays, {**header, "sklearn_version": "0.0"})
+    assert np.array_equal(flat.decision_function(rows), forest.decision_function(rows))
+    with pytest.raises(ValueError):
+        flat.to_isolation_forest({})
+
+
+def test_artifact_round_trip_scores_like_trained_model(model_dir):
+    logs = make_logs(2000)
+    trainer = ModelTrainer()
+    result = trainer.train(logs, "isolation_forest", {"n_estimators": 30}, "round-trip")
+
+    loaded = ModelArtifact.load(result["model_path"])
+    assert isinstance(loaded["detector"].model, FlatForest)
+    X, _ = trainer.preprocessor.transform(logs)
+    expected = trainer.detector.predict(X)
+    actual = loaded["detector"].predict(loaded["preprocessor"].transform(logs)[0])
+    assert all(np.array_equal(a, b) for a, b in zip(actual, expected))
+    assert ModelArtifact.read_info(result["model_path"])["training_samples"] == 2000
+
+
+def test_legacy_pickle_still_loads(model_dir, tmp_path):
+    logs = make_logs(500)
+    trainer = ModelTrainer()
+    result = trainer.train(logs, "isolation_forest", {"n_estimators": 20}, "legacy")
+
+    # 이전 형식: joblib으로 sklearn 객체를 그대로 저장한 .pkl
+    model_data = ModelArtifact.load(result["model_path"], materialize=True)
+    legacy_path = str(tmp_path / "legacy.pkl")
+    joblib.dump(model_data, legacy_path)
+
+    assert not ModelArtifact.is_flat(legacy_path)
+    predictor = ModelPredictor(legacy_path)
+    legacy_scores = predictor.score(logs)
+    flat_scores = ModelPredictor(result["model_path"]).score(logs)
+    assert all(np.array_equal(a, b) for a, b in zip(legacy_scores, flat_scores))
+    with pytest.raises(ValueError):
+        ModelArtifact.read_info(legacy_path)
@@ -0,0 +1,172 @@
+import io
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.alert import Alert
+from app.models.ml_model import MLModel
+from app.models.traffic_log import TrafficLog
+from app.routers import traffic_logs
+from app.services.cold_tier import ColdTierService, TieredRangeError
+from tests.conftest import make_logs
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+# 2026-01-01 00:00부터 7시간 간격 30건: 1~4일 14건이 cold tier 대상
+ROWS = make_logs(30, step=timedelta(hours=7))
+CUTOFF = date(2026, 1, 5)
+
+
+@pytest.fixture
+def tiered(db, insert_logs, cold_dir):
+    ids = insert_logs(ROWS)
+    ml_model = MLModel(name="m", start_date=datetime(2026, 1, 1), end_date=datetime(2026, 1, 2))
+    db.add(ml_model)
+    db.flush()
+    # 알림이 참조하는 로그는 SQLite에 남음
+    db.add(Alert(traffic_log_id=ids[2], risk_score=90, ml_model_id=ml_model.id))
+    db.commit()
+
+    result = ColdTierService.tier_closed_days(db, before=CUTOFF)
+    return ids, result
+
+
+def _expected_ids(ids, predicate=lambda row: True, rows=ROWS):
+    # (timestamp, id) 내림차순
+    pairs = [(row["timestamp"], log_id) for row, log_id in zip(rows, ids) if predicate(row)]
+    return [log_id for _, log_id in sorted(pairs, reverse=True)]
+
+
+def test_tier_moves_closed_days_except_alerted_rows(db, tiered):
+    ids, result = tiered
+    assert [day["day"] for day in result["days"]] == ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"]
+    assert result["moved_rows"] == 13
+    assert db.execute(select(func.count()).select_from(TrafficLog)).scalar() == 17
+    assert db.get(TrafficLog, ids[2]) is not None
+    paths = ColdTierService.partition_paths(db, datetime(2026, 1, 1), datetime(2026, 1, 5))
+    assert len(paths) == 4 and all(os.path.exists(path) for path in paths)
+
+    with pytest.raises(TieredRangeError):
+        ColdTierService.ensure_hot(db, datetime(2026, 1, 3), datetime(2026, 1, 10))
+    ColdTierService.ensure_hot(db, datetime(2026, 1, 5), None)
+
+
+def test_read_rows_is_ordered_filtered_and_limited(db, tiered):
+    ids, _ = tiered
+    rows = ColdTierService.read_rows(db, None, None, ["id", "timestamp", "src_ip"], [], 100)
+    cold_ids = [log_id for log_id in _expected_ids(ids, lambda row: row["timestamp"].date() < CUTOFF) if log_id != ids[2]]
+    assert [row["id"] for row in rows] == cold_ids
+
+    newest = ColdTierService.read_rows(db, None, None, ["id", "timestamp"], [], 3)
+    assert [row["id"] for row in newest] == cold_ids[:3]
+
+    before = (newest[-1]["timestamp"], newest[-1]["id"])
+    following = ColdTierService.read_rows(db, None, None, ["id", "timestamp"], [], 3, before)
+    assert [row["id"] for row in following] == cold_ids[3:6]
+
+    filtered = ColdTierService.read_rows(db, None, None, ["id", "src_ip", "timestamp"], [("src_ip", "==", "10.0.1.1")], 100)
+    assert {row["src_ip"] for row in filtered} == {"10.0.1.1"} and filtered
+
+
+def test_orphan_files_are_removed(db, tiered, cold_dir):
+    orphan = os.path.join(cold_dir, "traffic_logs", "date=2026-01-01", "part-orphan.parquet")
+    open(orphan, "wb").close()
+    assert ColdTierService.remove_orphans(db) == 1
+    assert not os.path.exists(orphan)
+
+
+def test_log_listing_merges_cold_rows(client, tiered):
+    ids, _ = tiered
+    response = client.get("/api/logs", params={"limit": 1000})
+    assert response.status_code == 200
+    assert [log["id"] for log in response.json()] == _expected_ids(ids)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/logs", params=params)
+        seen += [log["id"] for log in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == _expected_ids(ids)
+
+    response = client.get("/api/logs", params={"limit": 5, "skip": 14})
+    assert [log["id"] for log in response.json()] == _expected_ids(ids)[14:19]
+
+
+def test_log_listing_applies_filters_to_cold_rows(client, tiered):
+    ids, _ = tiered
+    end = datetime(2026, 1, 3)
+    response = client.get("/api/logs", params={"src_cidr": "10.0.0.0/24", "end_time": end.isoformat()})
+    assert [log["id"] for log in response.json()] == _expected_ids(
+        ids, lambda row: row["src_ip"].startswith("10.0.0.") and row["timestamp"] <= end
+    )
+
+
+@pytest.fixture
+def export(client, session_factory, monkeypatch):
+    # 내보내기 스트림은 전용 세션을 열므로 테스트 DB에 연결
+    monkeypatch.setattr(traffic_logs, "SessionLocal", session_factory)
+
+    def get(**params):
+        response = client.get("/api/logs/export", params=params)
+        assert response.status_code == 200
+        return response
+    return get
+
+
+def test_export_merges_cold_rows_in_order(db, insert_logs, tiered, export):
+    ids, _ = tiered
+    # 늦게 들어온 1일 행은 두 번째 파일로 옮겨져 같은 날짜의 파일끼리 시간이 겹침
+    late = make_logs(4, start=datetime(2026, 1, 1, 1), step=timedelta(hours=5))
+    ids = ids + insert_logs(late)
+    ColdTierService.tier_closed_days(db, before=CUTOFF)
+    assert len(ColdTierService.partition_paths(db, datetime(2026, 1, 1), datetime(2026, 1, 1, 23))) == 2
+
+    rows = ROWS + late
+    lines = export(format="ndjson").text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == _expected_ids(ids, rows=rows)[::-1]
+    assert json.loads(lines[0]) == {
+        "id": ids[0], **{key: value for key, value in rows[0].items() if key != "timestamp"},
+        "timestamp": rows[0]["timestamp"].isoformat()
+    }
+
+    csv_lines = export(format="csv", columns="src_ip,id").text.splitlines()
+    assert csv_lines[0] == "src_ip,id"
+    assert [int(line.split(",")[1]) for line in csv_lines[1:]] == _expected_ids(ids, rows=rows)[::-1]
+
+
+def test_export_applies_filters_to_cold_rows(tiered, export):
+    ids, _ = tiered
+    start, end = datetime(2026, 1, 2), datetime(2026, 1, 6)
+    response = export(format="ndjson", columns="id", src_cidr="10.0.0.0/24", protocol="TCP",
+                      start_time=start.isoformat(), end_time=end.isoformat())
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == _expected_ids(
+        ids, lambda row: row["src_ip"].startswith("10.0.0.") and row["protocol"] == "TCP"
+        and start <= row["timestamp"] <= end
+    )[::-1]
+
+
+def test_parquet_export_includes_cold_rows(tiered, export):
+    ids, _ = tiered
+    table = pq.read_table(io.BytesIO(export(format="parquet", columns="id,timestamp,src_port").content))
+    assert table.column_names == ["id", "timestamp", "src_port"]
+    assert table.column("id").to_pylist() == _expected_ids(ids)[::-1]
+    assert table.column("timestamp").to_pylist() == sorted(row["timestamp"] for row in ROWS)
+
+
+@pytest.mark.parametrize("path", ["/api/ml/scan", "/api/jobs/scan"])
+def test_scan_over_tiered_days_is_rejected(client, db, tiered, path):
+    # 모델 파일을 열기 전에 거부됨
+    db.get(MLModel, 1).model_path = "unused.pkl"
+    db.commit()
+    response = client.post(path, json={
+        "model_id": 1, "start_date": datetime(2026, 1, 3).isoformat(), "end_date": datetime(2026, 1, 6).isoformat()
+    })
+    assert response.status_code == 409
+    assert "2026-01-03, 2026-01-04" in response.json()["detail"]
+    assert "409" in client.get("/openapi.json").json()["paths"][path]["post"]["responses"]
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml import utils
+from app.ml.preprocessor import TrafficLogPreprocessor
+from app.ml.utils import ip_to_numeric, ips_to_numeric, protocol_to_numeric, protocols_to_numeric
+from tests.conftest import random_logs
+
+# 벡터화 경로가 행 단위 ip_to_numeric으로 넘겨야 하는 값들 포함
+EDGE_IPS = [
+    "0.0.0.0", "255.255.255.255", "10.0.0.1", "1.2.3.4.5", "1.2.3", "", "256.1.1.1", "999.999.999.999",
+    "01.002.003.004", " 1.2.3.4", "1.2.3.4 ", "+1.2.3.4", "1_0.0.0.1", "a.b.c.d", "1..2.3", ".1.2.3",
+    "::1", "1.2.3.4\x00", "1234.1.1.1", "123456789012.1.1.1", None, np.nan, 167772161
+]
+
+
+def _per_row_features(preprocessor: TrafficLogPreprocessor, logs) -> pd.DataFrame:
+    # 벡터화 이전 구현 (행마다 .apply)
+    df = pd.DataFrame(logs)
+    df["src_ip_numeric"] = df["src_ip"].apply(ip_to_numeric)
+    df["dst_ip_numeric"] = df["dst_ip"].apply(ip_to_numeric)
+    df["protocol_numeric"] = df["protocol"].apply(protocol_to_numeric)
+    return df[preprocessor.feature_columns].copy().fillna(0)
+
+
+def test_ips_to_numeric_matches_per_row_parsing():
+    values = np.array(EDGE_IPS, dtype=object)
+    assert ips_to_numeric(values).tolist() == [ip_to_numeric(ip) for ip in EDGE_IPS]
+
+
+def test_ips_to_numeric_matches_on_deduplicated_path():
+    # 표본의 중복이 많으면 고유값만 파싱하는 경로를 탐
+    rng = np.random.default_rng(0)
+    pool = np.array(EDGE_IPS[:-3] + [f"10.{i}.{i % 7}.{i % 250}" for i in range(200)], dtype=object)
+    values = pool[rng.integers(0, len(pool), utils.IP_DEDUP_SAMPLE_SIZE * 2)]
+    assert ips_to_numeric(values).tolist() == [ip_to_numeric(ip) for ip in values]
+
+
+def test_protocols_to_numeric_matches_per_row():
+    protocols = ["TCP", "tcp", "Udp", "ICMP", "GRE", ""]
+    assert protocols_to_numeric(protocols).tolist() == [protocol_to_numeric(p) for p in protocols]
+
+
+@pytest.mark.parametrize("as_columns", [False, True])
+def test_extract_features_matches_per_row_path(as_columns):
+    logs = random_logs(500, seed=3)
+    logs[0]["src_ip"], logs[1]["dst_ip"], logs[2]["protocol"] = "not-an-ip", "1.2.3", "udp"
+    preprocessor = TrafficLogPreprocessor()
+
+    expected = _per_row_features(preprocessor, logs)
+    source = {column: [log[column] for log in logs] for column in logs[0]} if as_columns else logs
+    pd.testing.assert_frame_equal(preprocessor.extract_features(source), expected)
+
+
+def test_extract_features_uses_stored_numeric_columns():
+    logs = random_logs(50, seed=4)
+    preprocessor = TrafficLogPreprocessor()
+    stored = [
+        {**log, "src_ip_numeric": ip_to_numeric(log["src_ip"]), "dst_ip_numeric": ip_to_numeric(log["dst_ip"]),
+         "protocol_numeric": protocol_to_numeric(log["protocol"])}
+        for log in logs
+    ]
+    pd.testing.assert_frame_equal(
+        preprocessor.extract_features(stored), _per_row_features(preprocessor, logs)
+    )
@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from app.models.traffic_log import TrafficLog
+from app.services.ingest_buffer import IngestBuffer
+from app.services.ingest_service import IngestService
+from tests.conftest import make_logs
+
+
+def _buffer(session_factory, **kwargs) -> IngestBuffer:
+    options = {"max_size": 100, "flush_size": 10, "flush_interval_ms": 20, "flush_retries": 2, "retry_backoff_ms": 1}
+    options.update(kwargs)
+    return IngestBuffer(session_factory, **options)
+
+
+def test_group_commit_resolves_ids_in_submit_order(session_factory, db):
+    buffer = _buffer(session_factory)
+    buffer.start()
+    futures = [buffer.submit(row) for row in make_logs(25)]
+    ids = [future.result(timeout=5) for future in futures]
+    buffer.stop(timeout=5)
+
+    assert ids == sorted(ids) and len(set(ids)) == 25
+    assert db.execute(select(func.count()).select_from(TrafficLog)).scalar() == 25
+    metrics = buffer.get_metrics()
+    assert metrics["flushed"] == 25 and metrics["failed"] == 0 and not metrics["running"]
+
+
+def test_transient_failure_is_retried(session_factory, monkeypatch):
+    insert_rows = IngestService.insert_rows
+    calls = []
+
+    def flaky(db, rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return insert_rows(db, rows)
+
+    monkeypatch.setattr(IngestService, "insert_rows", staticmethod(flaky))
+    buffer = _buffer(session_factory)
+    buffer.start()
+    future = buffer.submit(make_logs(1)[0])
+    assert future.result(timeout=5) > 0
+    buffer.stop(timeout=5)
+
+    metrics = buffer.get_metrics()
+    assert metrics == {**metrics, "flushed": 1, "failed": 0, "retried": 1}
+
+
+def test_rows_fail_only_after_retries_run_out(session_factory, monkeypatch):
+    def locked(db, rows):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(IngestService, "insert_rows", staticmethod(locked))
+    buffer = _buffer(session_factory, flush_retries=3)
+    buffer.start()
+    future = buffer.submit(make_logs(1)[0])
+    with pytest.raises(OperationalError):
+        future.result(timeout=5)
+    buffer.stop(timeout=5)
+
+    metrics = buffer.get_metrics()
+    assert metrics["failed"] == 1 and metrics["retried"] == 3
+
+
+def test_stop_keeps_writer_referenced_until_it_exits(session_factory, monkeypatch):
+    release = threading.Event()
+    insert_rows = IngestService.insert_rows
+
+    def slow(db, rows):
+        release.wait(5)
+        return insert_rows(db, rows)
+
+    monkeypatch.setattr(IngestService, "insert_rows", staticmethod(slow))
+    buffer = _buffer(session_factory)
+    buffer.start()
+    future = buffer.submit(make_logs(1)[0])
+
+    buffer.stop(timeout=0.05)
+    assert buffer.running
+    buffer.start()  # 이전 writer가 살아 있으면 새로 만들지 않음
+
+    release.set()
+    assert future.result(timeout=5) > 0
+    buffer.stop(timeout=5)
+    assert not buffer.running
+
+
+def test_full_buffer_rejects(session_factory):
+    buffer = _buffer(session_factory, max_size=2)
+    rows = make_logs(3)
+    buffer.submit(rows[0])
+    buffer.submit(rows[1])
+    with pytest.raises(queue.Full):
+        buffer.submit(rows[2])
+    assert buffer.get_metrics()["rejected"] == 1
+
+
+def test_post_log_returns_record_by_default(client):
+    row = make_logs(1)[0]
+    response = client.post("/api/logs", json={**row, "timestamp": row["timestamp"].isoformat()})
+    assert response.status_code == 201
+    assert response.json()["id"] > 0 and response.json()["src_ip"] == row["src_ip"]
+
+
+def test_durable_post_does_not_wait_for_flush_interval(client, session_factory, monkeypatch):
+    # 단건 요청은 flush_interval만큼 모으지 않고 바로 커밋되어야 함
+    from app.routers import traffic_logs
+
+    buffer = _buffer(session_factory, flush_interval_ms=2000)
+    monkeypatch.setattr(traffic_logs, "ingest_buffer", buffer)
+    buffer.start()
+    try:
+        row = make_logs(1)[0]
+        client.post("/api/logs", json={**row, "timestamp": row["timestamp"].isoformat()})  # 워밍업
+        started = time.perf_counter()
+        response = client.post("/api/logs", json={**row, "timestamp": row["timestamp"].isoformat()})
+        elapsed = time.perf_counter() - started
+    finally:
+        buffer.stop(timeout=5)
+
+    assert response.status_code == 201 and response.json()["id"] > 0
+    assert buffer.get_metrics()["flushed"] == 2
+    assert elapsed < 0.5
@@ -0,0 +1,76 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.ml_model import MLModel
+from app.routers import jobs, ml_analysis
+from app.services.job_queue import JobQueue
+from app.services.ml_service import MLService
+from tests.conftest import make_logs
+
+TRAIN_REQUEST = {
+    "name": "queued",
+    "start_date": "2026-01-01T00:00:00",
+    "end_date": "2026-01-02T00:00:00",
+    "params": {"n_estimators": 10}
+}
+
+
+@pytest.fixture
+def queue(session_factory, monkeypatch):
+    job_queue = JobQueue(session_factory, workers=1)
+    for module in (jobs, ml_analysis):
+        monkeypatch.setattr(module, "job_queue", job_queue)
+    job_queue.start()
+    yield job_queue
+    job_queue.stop(timeout=5)
+
+
+def _wait_for(client, job_id: int) -> dict:
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_train_returns_job_before_model_is_built(client, db, insert_logs, queue, model_dir, monkeypatch):
+    insert_logs(make_logs(200, step=timedelta(minutes=5)))
+    release = threading.Event()
+    train_model = MLService.train_model
+
+    def blocked(*args, **kwargs):
+        release.wait(10)
+        return train_model(*args, **kwargs)
+
+    monkeypatch.setattr(MLService, "train_model", staticmethod(blocked))
+
+    response = client.post("/api/ml/train", json=TRAIN_REQUEST)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["job_type"] == "train" and job["status"] in ("queued", "running")
+    assert db.execute(select(func.count()).select_from(MLModel)).scalar() == 0
+
+    release.set()
+    job = _wait_for(client, job["id"])
+    assert job["status"] == "succeeded", job["error"]
+    assert job["result"]["training_samples"] == 200
+    assert db.get(MLModel, job["result"]["model_id"]) is not None
+
+
+def test_train_rejects_invalid_params_before_queueing(client, queue):
+    response = client.post("/api/ml/train", json={**TRAIN_REQUEST, "params": {"n_jobs": 4}})
+    assert response.status_code == 400
+    assert client.get("/api/jobs").json() == []
+
+
+def test_train_runs_inline_without_job_queue(client, insert_logs, model_dir):
+    insert_logs(make_logs(200, step=timedelta(minutes=5)))
+    response = client.post("/api/ml/train", json=TRAIN_REQUEST)
+    assert response.status_code == 201
+    assert response.json()["training_samples"] == 200
@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import inspect
+
+from app.migrations import migrate_traffic_log_numeric_columns
+from app.models.traffic_log import TrafficLog
+from app.routers.traffic_logs import _log_filters
+from app.services.cold_tier import ColdTierService
+from tests.conftest import make_logs
+
+
+@pytest.fixture
+def mixed_logs(insert_logs):
+    rows = make_logs(6)
+    rows[1]["protocol"] = "tcp"
+    rows[2]["src_ip"] = "2001:db8::1"
+    rows[3]["src_ip"] = "010.0.0.1"
+    rows[4]["src_ip"] = "10.0.0.1"
+    return dict(zip(("tcp", "upper", "ipv6", "padded", "plain"), insert_logs([rows[1], rows[0], rows[2], rows[3], rows[4]])))
+
+
+def _ids(client, **params):
+    response = client.get("/api/logs", params=params)
+    assert response.status_code == 200
+    return {log["id"] for log in response.json()}
+
+
+def test_protocol_filter_matches_the_stored_string_exactly(client, mixed_logs):
+    assert mixed_logs["tcp"] in _ids(client, protocol="tcp")
+    assert mixed_logs["tcp"] not in _ids(client, protocol="TCP")
+    assert mixed_logs["upper"] in _ids(client, protocol="TCP")
+    assert _ids(client, protocol="GRE") == set()
+
+
+def test_ip_filter_matches_the_stored_string_exactly(client, mixed_logs):
+    assert _ids(client, src_ip="2001:db8::1") == {mixed_logs["ipv6"]}
+    assert mixed_logs["plain"] in _ids(client, src_ip="10.0.0.1")
+    # 같은 숫자로 인코딩되어도 문자열이 다르면 제외
+    assert mixed_logs["padded"] not in _ids(client, src_ip="10.0.0.1")
+    assert _ids(client, src_ip="010.0.0.1") == {mixed_logs["padded"]}
+
+
+@pytest.mark.parametrize("ip", ["10.0.0.1", "2001:db8::1"])
+def test_ip_filters_use_an_index(db, ip):
+    query = db.query(TrafficLog).filter(*_log_filters(ip, None, None, None, None, None, None))
+    sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    plan = " ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    # 정수/문자열 인덱스 중 무엇을 쓰든 전체 스캔만 아니면 됨
+    assert plan.startswith("SEARCH") and "USING INDEX" in plan, plan
+
+
+def test_migration_keeps_string_ip_indexes(engine):
+    migrate_traffic_log_numeric_columns(engine)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("traffic_logs")}
+    assert {"ix_traffic_logs_src_ip", "ix_traffic_logs_dst_ip", "idx_src_ip_numeric_timestamp"} <= indexes
+
+
+def test_cold_rows_use_the_same_exact_matching(client, db, mixed_logs):
+    pytest.importorskip("pyarrow")
+    ColdTierService.tier_closed_days(db, before=date(2026, 1, 2))
+    assert db.query(TrafficLog).count() == 0
+    assert _ids(client, protocol="tcp") == {mixed_logs["tcp"]}
+    assert _ids(client, src_ip="10.0.0.1") == {mixed_logs["plain"]}
+    assert _ids(client, src_ip="2001:db8::1") == {mixed_logs["ipv6"]}
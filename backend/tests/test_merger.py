@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.ml.merger import ModelMerger
+from app.ml.predictor import ModelPredictor
+from app.ml.trainer import ModelTrainer
+from tests.conftest import random_logs
+
+DAY_1 = random_logs(3000, seed=1, start=datetime(2026, 1, 1))
+DAY_2 = random_logs(2000, seed=2, start=datetime(2026, 1, 2))
+
+
+def _train(logs, name):
+    trainer = ModelTrainer()
+    return trainer.train(logs, "isolation_forest", {"n_estimators": 50}, name)["model_path"], trainer
+
+
+def _merge(paths):
+    merger = ModelMerger()
+    merger.merge(paths, "merged")
+    return ModelPredictor(merger.model_path)
+
+
+def test_merging_a_model_with_itself_keeps_its_scores(model_dir):
+    path, _ = _train(DAY_1, "self")
+    source, merged = ModelPredictor(path), _merge([path, path])
+
+    X_source, _ = source.preprocessor.transform(DAY_1)
+    X_merged, _ = merged.preprocessor.transform(DAY_1)
+    assert merged.detector.model.n_estimators == 2 * source.detector.model.n_estimators
+    np.testing.assert_allclose(
+        merged.detector.get_decision_scores(X_merged), source.detector.get_decision_scores(X_source), atol=1e-9
+    )
+    np.testing.assert_allclose(merged.score(DAY_1)[1], source.score(DAY_1)[1], atol=1e-6)
+
+
+def test_merged_model_scores_each_day_like_its_source(model_dir):
+    path_1, _ = _train(DAY_1, "day-1")
+    path_2, _ = _train(DAY_2, "day-2")
+    merged = _merge([path_1, path_2])
+
+    # 같은 트래픽 분포의 서로 다른 날: 병합 모델은 각 날짜를 원래 모델과 거의 같게 평가
+    for path, logs in ((path_1, DAY_1), (path_2, DAY_2)):
+        source_predictions, source_scores = ModelPredictor(path).score(logs)
+        merged_predictions, merged_scores = merged.score(logs)
+        assert np.abs(merged_scores - source_scores).mean() < 0.05
+        assert np.corrcoef(merged_scores, source_scores)[0, 1] > 0.98
+        assert (merged_predictions == source_predictions).mean() > 0.95
+
+
+def test_merged_training_stats_match_pooled_data(model_dir):
+    path_1, _ = _train(DAY_1, "day-1")
+    path_2, _ = _train(DAY_2, "day-2")
+    merged = _merge([path_1, path_2])
+    _, pooled = _train(DAY_1 + DAY_2, "pooled")
+
+    stats, expected = merged.preprocessor.get_training_stats(), pooled.preprocessor.get_training_stats()
+    features = pooled.preprocessor.extract_features(DAY_1 + DAY_2)
+    for column, values in expected.items():
+        for key in ("mean", "std", "min", "max"):
+            assert stats[column][key] == pytest.approx(values[key], rel=1e-9), (column, key)
+        # 사분위수는 KLL 요약을 병합한 근사값: 합친 데이터에서의 순위 오차로 확인
+        pooled_values = features[column].to_numpy()
+        for key, q in (("q1", 0.25), ("q3", 0.75)):
+            value = stats[column][key]
+            assert (pooled_values < value).mean() - 0.02 <= q <= (pooled_values <= value).mean() + 0.02, (column, key)
+
+    np.testing.assert_allclose(merged.preprocessor.scaler.mean_, pooled.preprocessor.scaler.mean_, rtol=1e-9)
+    np.testing.assert_allclose(merged.preprocessor.scaler.var_, pooled.preprocessor.scaler.var_, rtol=1e-9)
+    assert merged.preprocessor.scaler.n_samples_seen_ == len(DAY_1) + len(DAY_2)
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.traffic_log import TrafficLog
+from app.services.pagination import decode_cursor, encode_cursor, merge_pages, paginate
+from tests.conftest import make_logs
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2026, 3, 4, 5, 6, 7, 890123)
+    assert decode_cursor(encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WyJ4Il0"])
+def test_malformed_cursor_raises(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_cursor_pages_walk_every_row_once(db, insert_logs):
+    # 같은 timestamp가 여러 행에 걸쳐도 id로 순서가 정해짐
+    rows = make_logs(23, step=timedelta(0))[:10] + make_logs(13, start=datetime(2026, 1, 2))
+    insert_logs(rows)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = paginate(db.query(TrafficLog), TrafficLog.timestamp, TrafficLog.id, 4, cursor=cursor)
+        seen += [(log.timestamp, log.id) for log in page]
+        if cursor is None:
+            break
+
+    assert len(seen) == 23
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_offset_and_cursor_pages_match(db, insert_logs):
+    insert_logs(make_logs(12))
+    query = db.query(TrafficLog)
+
+    first, cursor = paginate(query, TrafficLog.timestamp, TrafficLog.id, 5)
+    by_cursor, _ = paginate(query, TrafficLog.timestamp, TrafficLog.id, 5, cursor=cursor)
+    by_offset, _ = paginate(query, TrafficLog.timestamp, TrafficLog.id, 5, skip=5)
+    assert [log.id for log in by_cursor] == [log.id for log in by_offset]
+
+
+def test_last_page_has_no_cursor(db, insert_logs):
+    insert_logs(make_logs(5))
+    page, cursor = paginate(db.query(TrafficLog), TrafficLog.timestamp, TrafficLog.id, 5)
+    assert len(page) == 5 and cursor is None
+
+
+def test_merge_pages_interleaves_sources():
+    start = datetime(2026, 1, 1)
+    rows = [SimpleNamespace(timestamp=start + timedelta(minutes=i // 2), id=i) for i in range(10)]
+    hot = sorted(rows[::2], key=lambda row: (row.timestamp, row.id), reverse=True)
+    cold = sorted(rows[1::2], key=lambda row: (row.timestamp, row.id), reverse=True)
+
+    page, cursor = merge_pages([hot, cold], "timestamp", "id", 3, skip=2)
+    assert [row.id for row in page] == [7, 6, 5]
+    assert decode_cursor(cursor) == (rows[5].timestamp, 5)
+
+    page, cursor = merge_pages([hot, cold], "timestamp", "id", 5, skip=5)
+    assert [row.id for row in page] == [4, 3, 2, 1, 0] and cursor is None
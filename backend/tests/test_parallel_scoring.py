@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from app.ml import predictor as predictor_module
+from app.ml.parallel import ShardedScorer
+from app.ml.predictor import ModelPredictor
+from app.ml.trainer import ModelTrainer
+from app.ml.utils import validate_params
+from tests.conftest import make_logs
+
+
+@pytest.fixture
+def model_path(model_dir):
+    result = ModelTrainer().train(make_logs(2000), "isolation_forest", {"n_estimators": 30}, "sharded")
+    return result["model_path"]
+
+
+def test_sharded_scoring_matches_in_process(model_path, monkeypatch):
+    logs = make_logs(3001, step=timedelta(minutes=3))
+    in_process = ModelPredictor(model_path).score(logs)
+
+    # SCORING_SHARD_MIN_ROWS를 낮춰 이 배치가 프로세스 풀로 가도록 함
+    scorer = ShardedScorer(processes=2, min_rows=100)
+    monkeypatch.setattr(predictor_module, "sharded_scorer", scorer)
+    try:
+        sharded = ModelPredictor(model_path).score(logs)
+        metrics = scorer.get_metrics()
+    finally:
+        scorer.shutdown()
+
+    assert metrics["sharded_batches"] == 1 and metrics["sharded_rows"] == len(logs)
+    assert all(np.array_equal(a, b) for a, b in zip(sharded, in_process))
+
+
+def test_validate_params_rejects_n_jobs():
+    with pytest.raises(ValueError, match="ML_N_JOBS"):
+        validate_params("isolation_forest", {"n_jobs": 4})
+    assert "n_jobs" not in validate_params("isolation_forest", {"n_estimators": 10})
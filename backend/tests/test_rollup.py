@@ -0,0 +1,73 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.rollup import RollupService
+from tests.conftest import make_logs
+
+
+@pytest.mark.parametrize("start, end", [
+    (datetime(2026, 1, 1, 0, 0, 30), datetime(2026, 1, 3, 5, 7, 10, 5)),
+    (datetime(2026, 1, 1), datetime(2026, 1, 2)),
+    (datetime(2026, 1, 1, 10, 15), datetime(2026, 1, 1, 10, 15, 59)),
+])
+def test_plan_covers_range_without_gaps(start, end):
+    segments = RollupService.plan(start, end)
+
+    assert segments[0][1] == start and segments[-1][2] == end
+    for (_, _, previous_end), (_, next_start, _) in zip(segments, segments[1:]):
+        assert previous_end == next_start
+
+
+def test_plan_uses_coarsest_aligned_buckets():
+    segments = RollupService.plan(datetime(2026, 1, 1, 23, 58, 30), datetime(2026, 1, 3, 1, 1, 15))
+    assert [level for level, _, _ in segments] == [None, "minute", "day", "hour", "minute", None]
+    assert segments[2][1:] == (datetime(2026, 1, 2), datetime(2026, 1, 3))
+
+
+def test_plan_aligned_day_is_one_bucket():
+    assert RollupService.plan(datetime(2026, 1, 1), datetime(2026, 1, 2)) == [
+        ("day", datetime(2026, 1, 1), datetime(2026, 1, 2))
+    ]
+
+
+def test_statistics_match_raw_rows(db, insert_logs):
+    rows = make_logs(600)
+    # 한 건씩 넣은 행도 같은 버킷에 합산되어야 함
+    insert_logs(rows[:400])
+    for row in rows[400:]:
+        insert_logs([row])
+
+    start, end = datetime(2026, 1, 1, 3, 2, 10), datetime(2026, 1, 3, 17, 45, 30)
+    expected = [row for row in rows if start <= row["timestamp"] <= end]
+    stats = RollupService.get_statistics(db, start, end)
+
+    packets = np.array([row["packets"] for row in expected], dtype=np.float64)
+    assert stats["total_logs"] == len(expected)
+    assert stats["packets"]["mean"] == pytest.approx(packets.mean())
+    assert stats["packets"]["std"] == pytest.approx(packets.std(ddof=1))
+    assert (stats["packets"]["min"], stats["packets"]["max"]) == (packets.min(), packets.max())
+    assert stats["protocol_distribution"] == dict(Counter(row["protocol"] for row in expected))
+    # 서로 다른 값이 용량보다 적으면 heavy hitter 건수도 정확함 (동률 순서는 무관)
+    src_counts = Counter(row["src_ip"] for row in expected)
+    assert all(src_counts[ip] == count for ip, count in stats["top_src_ips"].items())
+    assert sorted(stats["top_src_ips"].values()) == sorted(count for _, count in src_counts.most_common(10))
+    assert stats["rollup"]["raw_rows"] < len(expected)
+
+
+def test_statistics_of_empty_range(db, insert_logs):
+    insert_logs(make_logs(10))
+    assert RollupService.get_statistics(db, datetime(2030, 1, 1), datetime(2030, 1, 2)) == {}
+
+
+def test_top_talkers_bounds_hold(db, insert_logs):
+    rows = make_logs(300, step=timedelta(seconds=40))
+    insert_logs(rows)
+
+    result = RollupService.get_top_talkers(db, datetime(2026, 1, 1), datetime(2026, 1, 2), "dst_ip", limit=3)
+    counts = Counter(row["dst_ip"] for row in rows)
+    assert result["total"] == len(rows)
+    for item in result["items"]:
+        assert item["min_count"] <= counts[item["value"]] <= item["count"]
@@ -0,0 +1,75 @@
+import json
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.ml.sketches import KLLSketch, SpaceSaving
+
+
+def _zipf_items(count: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    return [f"item-{value}" for value in rng.zipf(1.3, count) % 500]
+
+
+def _assert_space_saving_bounds(summary: SpaceSaving, counts: Counter) -> None:
+    assert summary.total == sum(counts.values())
+    assert len(summary.counters) <= summary.capacity
+    for item, (count, error) in summary.counters.items():
+        assert count - error <= counts[item] <= count
+    kept = set(summary.counters)
+    assert all(count <= summary.floor for item, count in counts.items() if item not in kept)
+
+
+def test_space_saving_exact_below_capacity():
+    counts = Counter({"a": 5, "b": 3, "c": 1})
+    summary = SpaceSaving.from_counts(8, counts)
+    assert summary.floor == 0
+    assert summary.top(2) == [("a", 5, 0), ("b", 3, 0)]
+
+
+def test_space_saving_merge_keeps_bounds():
+    parts = [_zipf_items(2000, seed) for seed in range(6)]
+    summaries = [SpaceSaving.from_counts(32, Counter(items)) for items in parts]
+    counts = Counter(item for items in parts for item in items)
+
+    merged = SpaceSaving.merge_all(32, summaries)
+    _assert_space_saving_bounds(merged, counts)
+
+    pairwise = SpaceSaving.from_dict(json.loads(json.dumps(summaries[0].to_dict())))
+    for summary in summaries[1:]:
+        pairwise.merge(summary)
+    _assert_space_saving_bounds(pairwise, counts)
+
+    # 가장 많은 항목은 요약에서도 1위
+    assert merged.top(1)[0][0] == counts.most_common(1)[0][0]
+
+
+def test_kll_exact_while_uncompacted():
+    values = np.arange(1, 101, dtype=np.float64)
+    sketch = KLLSketch.from_values(200, values)
+    assert sketch.exact
+    assert sketch.quantiles([0.25, 0.5, 0.99]) == list(np.quantile(values, [0.25, 0.5, 0.99]))
+
+
+@pytest.mark.parametrize("chunks", [1, 25])
+def test_kll_rank_error_is_bounded(chunks):
+    rng = np.random.default_rng(7)
+    values = rng.lognormal(3, 1, 50000)
+    sketch = KLLSketch.merge_all(200, [KLLSketch.from_values(200, part) for part in np.array_split(values, chunks)])
+
+    assert not sketch.exact and sketch.count == len(values)
+    assert (sketch.min, sketch.max) == (values.min(), values.max())
+    ordered = np.sort(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.95, 0.99):
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.02
+    # 값 수와 상관없이 메모리는 약 3k 이내
+    assert sum(len(items) for items in sketch.compactors) <= 3 * 200
+
+
+def test_kll_round_trip_and_empty():
+    sketch = KLLSketch.from_values(50, np.arange(1000))
+    restored = KLLSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.quantiles([0.1, 0.9]) == sketch.quantiles([0.1, 0.9])
+    assert KLLSketch(50).quantile(0.5) is None
@@ -0,0 +1,78 @@
+from collections import Counter
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from app.ml.utils import protocol_to_numeric
+from app.services.training_data import TrainingDataLoader
+from tests.conftest import random_logs
+
+START, END = datetime(2026, 1, 1), datetime(2026, 1, 3)
+LOGS = random_logs(3000, seed=8, start=START) + random_logs(3000, seed=9, start=datetime(2026, 1, 2))
+
+
+def _sample(db, **kwargs):
+    options = {"size": 500, "method": "sql", "seed": 7}
+    options.update(kwargs)
+    return TrainingDataLoader.sample_columns(db, START, END, **options)
+
+
+def _rows(arrays):
+    return sorted(zip(*(arrays[name].tolist() for name in sorted(arrays))))
+
+
+@pytest.mark.parametrize("method", ["sql", "reservoir"])
+def test_seeded_sample_is_reproducible(db, session_factory, insert_logs, method):
+    insert_logs(LOGS)
+    first, info = _sample(db, method=method, stratify_by=["protocol"])
+
+    # 새 세션에서 같은 시드로 다시 뽑아도 같은 행
+    other = session_factory()
+    try:
+        again, _ = _sample(other, method=method, stratify_by=["protocol"], chunk_size=257)
+    finally:
+        other.close()
+    assert {name: values.tolist() for name, values in first.items()} == {
+        name: values.tolist() for name, values in again.items()
+    }
+    assert info["size"] == 500 and info["population"] == len(LOGS)
+
+    different, _ = _sample(db, method=method, stratify_by=["protocol"], seed=8)
+    assert _rows(different) != _rows(first)
+
+
+@pytest.mark.parametrize("method", ["sql", "reservoir"])
+def test_stratified_sample_follows_population_shares(db, insert_logs, method):
+    insert_logs(LOGS)
+    arrays, info = _sample(db, method=method, stratify_by=["protocol"])
+
+    population = Counter(protocol_to_numeric(log["protocol"]) for log in LOGS)
+    sampled = Counter(arrays["protocol_numeric"].tolist())
+    for code, count in population.items():
+        assert abs(sampled[code] - 500 * count / len(LOGS)) <= 1
+    assert sum(stratum["sampled"] for stratum in info["strata"].values()) == 500
+
+
+def test_sample_larger_than_population_takes_every_row(db, insert_logs):
+    insert_logs(LOGS[:100])
+    arrays, info = _sample(db, size=1000)
+    assert info["size"] == 100 and len(arrays["packets"]) == 100
+
+
+def test_sql_sample_is_unchanged_by_cold_tiering(db, insert_logs, cold_dir):
+    pytest.importorskip("pyarrow")
+    from app.services.cold_tier import ColdTierService
+
+    insert_logs(LOGS)
+    before, _ = _sample(db, stratify_by=["hour"])
+    ColdTierService.tier_closed_days(db, before=date(2026, 1, 2))
+    after, _ = _sample(db, stratify_by=["hour"])
+    assert _rows(after) == _rows(before)
+
+
+def test_unknown_method_or_key_is_rejected(db):
+    with pytest.raises(ValueError):
+        _sample(db, method="systematic")
+    with pytest.raises(ValueError):
+        _sample(db, stratify_by=["dst_port"])
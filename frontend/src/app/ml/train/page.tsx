@@ -2,7 +2,7 @@
 
 import { useState } from 'react';
 import { useRouter } from 'next/navigation';
-import { TrainRequest, TrainResponse } from '@/types/ml';
+import { Job, TrainRequest, TrainResponse } from '@/types/ml';
 import { trainModel } from '@/lib/mlApi';
 import TrainingForm from '@/components/ml/TrainingForm';
 
@@ -11,6 +11,7 @@ export default function TrainModelPage() {
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState<TrainResponse | null>(null);
   const [error, setError] = useState<string | null>(null);
+  const [job, setJob] = useState<Job | null>(null);
 
   const handleSubmit = async (data: TrainRequest) => {
     setLoading(true);
@@ -18,12 +19,13 @@ export default function TrainModelPage() {
     setResult(null);
 
     try {
-      const response = await trainModel(data);
+      const response = await trainModel(data, setJob);
       setResult(response);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to train model');
     } finally {
       setLoading(false);
+      setJob(null);
     }
   };
 
@@ -41,6 +43,13 @@ export default function TrainModelPage() {
           <TrainingForm onSubmit={handleSubmit} isLoading={loading} />
         </div>
 
+        {loading && job && (
+          <div className="bg-blue-50 border border-blue-200 text-blue-800 px-4 py-3 rounded mb-6">
+            <strong>Job #{job.id}:</strong> {job.status}
+            {job.message && ` - ${job.message}`} ({Math.round(job.progress * 100)}%)
+          </div>
+        )}
+
         {error && (
           <div className="bg-red-50 border border-red-200 text-red-800 px-4 py-3 rounded mb-6">
             <strong>Error:</strong> {error}
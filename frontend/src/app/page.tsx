@@ -18,7 +18,7 @@ export default function Home() {
       fetch('/api/logs?limit=5').then((res) => res.json()),
       fetch('/api/alerts?limit=5').then((res) => res.json()),
       fetch('/api/logs?limit=1000').then((res) => res.json()),
-      fetch('/api/alerts?limit=1000').then((res) => res.json()),
+      fetch('/api/alerts?limit=1000&lean=true').then((res) => res.json()),
     ])
       .then(([logs, alerts, allLogs, allAlerts]) => {
         setRecentLogs(logs);
@@ -1,4 +1,5 @@
 import {
+  Job,
   MLModel,
   TrainRequest,
   TrainResponse,
@@ -20,8 +21,15 @@ function buildQueryString(params: Record<string, any>): string {
   return queryString ? `?${queryString}` : '';
 }
 
+const JOB_POLL_INTERVAL_MS = 1000;
+const FINISHED_JOB_STATUSES = ['succeeded', 'failed', 'cancelled'];
+
 // Train Model
-export async function trainModel(data: TrainRequest): Promise<TrainResponse> {
+// Training runs as a background job (202); poll it until it finishes
+export async function trainModel(
+  data: TrainRequest,
+  onProgress?: (job: Job) => void
+): Promise<TrainResponse> {
   const response = await fetch('/api/ml/train', {
     method: 'POST',
     headers: {
@@ -35,6 +43,32 @@ export async function trainModel(data: TrainRequest): Promise<TrainResponse> {
     throw new Error(error.detail || 'Failed to train model');
   }
 
+  // Without a job queue the model is trained inside the request (201)
+  if (response.status !== 202) {
+    return response.json();
+  }
+
+  let job: Job = await response.json();
+  while (!FINISHED_JOB_STATUSES.includes(job.status)) {
+    onProgress?.(job);
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    job = await getJob(job.id);
+  }
+
+  if (job.status !== 'succeeded') {
+    throw new Error(job.error || `Training ${job.status}`);
+  }
+  return job.result as TrainResponse;
+}
+
+// Get Job
+export async function getJob(jobId: number): Promise<Job> {
+  const response = await fetch(`/api/jobs/${jobId}`);
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch job ${jobId}: ${response.statusText}`);
+  }
+
   return response.json();
 }
 
@@ -35,6 +35,24 @@ export interface TrainResponse {
   created_at: string;
 }
 
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+
+export interface Job {
+  id: number;
+  job_type: string;
+  status: JobStatus;
+  params: Record<string, any>;
+  progress: number;
+  message: string | null;
+  result: Record<string, any> | null;
+  error: string | null;
+  cancel_requested: boolean;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  elapsed_sec: number | null;
+}
+
 export interface AnalyzeRequest {
   model_id: number;
   logs: TrafficLog[];